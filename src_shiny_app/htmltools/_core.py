@@ -332,7 +332,12 @@ class TagList(UserList[TagNode]):
         for i in reversed(range(len(cp))):
             child = cp[i]
 
-            if isinstance(child, Tagifiable):
+            # Most children are strings or Tags; check for those before the (much
+            # slower) runtime protocol check.
+            if isinstance(child, str):
+                continue
+
+            if isinstance(child, Tag) or isinstance(child, Tagifiable):
                 tagified_child = child.tagify()
                 if isinstance(tagified_child, TagList):
                     # If the Tagifiable object returned a TagList, flatten it into this
@@ -402,7 +407,28 @@ class TagList(UserList[TagNode]):
             added.
         """
 
-        html_ = ""
+        html_: list[str] = []
+        self._write_html(
+            html_,
+            indent,
+            eol,
+            add_ws=add_ws,
+            _escape_strings=_escape_strings,
+        )
+        return "".join(html_)
+
+    def _write_html(
+        self,
+        html_: list[str],
+        indent: int,
+        eol: str,
+        *,
+        add_ws: bool,
+        _escape_strings: bool,
+    ) -> None:
+        # Append the HTML for this tag list to `html_`. Writing the whole tree into a
+        # single buffer (and joining once) avoids copying the HTML of every subtree
+        # into its parent's string at each level of nesting.
         first_child = True
         prev_was_add_ws = add_ws
 
@@ -419,7 +445,7 @@ class TagList(UserList[TagNode]):
             if first_child:
                 first_child = False
             elif prev_or_current_add_ws:
-                html_ += eol
+                html_.append(eol)
 
             if isinstance(child, Tag):
                 # Note that we don't pass _escape_strings along, because that should
@@ -427,21 +453,23 @@ class TagList(UserList[TagNode]):
                 # self.children.get_html_string(), and those tags don't have children to
                 # recurse into.
                 if prev_or_current_add_ws:
-                    html_ += child.get_html_string(indent, eol)
+                    child._write_html(html_, indent, eol)
                 else:
-                    html_ += child.get_html_string(0, "")
+                    child._write_html(html_, 0, "")
 
                 prev_was_add_ws = child.add_ws
 
-            elif isinstance(child, ReprHtml):
+            # (Plain strings are by far the most common other children, and checking
+            # them against the ReprHtml and Tagifiable protocols is slow)
+            elif type(child) is not str and isinstance(child, ReprHtml):
                 if prev_was_add_ws:
-                    html_ += "  " * indent
+                    html_.append("  " * indent)
 
-                html_ += child._repr_html_()  # pyright: ignore[reportPrivateUsage]
+                html_.append(child._repr_html_())  # pyright: ignore[reportPrivateUsage]
 
                 prev_was_add_ws = False
 
-            elif isinstance(child, Tagifiable):
+            elif type(child) is not str and isinstance(child, Tagifiable):
                 raise RuntimeError(
                     "Encountered a non-tagified object. x.tagify() must be called before x.render()"
                 )
@@ -449,17 +477,15 @@ class TagList(UserList[TagNode]):
             else:
                 # If we get here, x must be a string.
                 if prev_was_add_ws:
-                    html_ += "  " * indent
+                    html_.append("  " * indent)
 
                 if _escape_strings:
-                    html_ += _normalize_text(child)
+                    html_.append(_normalize_text(child))
                 else:
-                    html_ += child
+                    html_.append(str(child))
 
                 prev_was_add_ws = False
 
-        return html_
-
     def get_dependencies(self, *, dedup: bool = True) -> list["HTMLDependency"]:
         """
         Get any dependencies needed to render the HTML.
@@ -471,19 +497,26 @@ class TagList(UserList[TagNode]):
         """
 
         deps: list[HTMLDependency] = []
-        for x in self:
-            if isinstance(x, HTMLDependency):
-                deps.append(x)
-            elif isinstance(x, Tag):
-                # When we recurse, don't deduplicate at every node. We only need to do
-                # that once, at the top level.
-                deps.extend(x.get_dependencies(dedup=False))
+        self._collect_dependencies(deps)
 
         if dedup:
             return _resolve_dependencies(deps)
         else:
             return deps
 
+    def _collect_dependencies(self, deps: list["HTMLDependency"]) -> None:
+        # Append the dependencies in this tag list (and its descendants) to `deps`.
+        # Collecting into a single list avoids building (and copying) a list per node.
+        # Deduplication is done once, at the top level.
+        for x in self:
+            if isinstance(x, HTMLDependency):
+                deps.append(x)
+            elif isinstance(x, Tag):
+                if type(x).get_dependencies is Tag.get_dependencies:
+                    x.children._collect_dependencies(deps)
+                else:
+                    deps.extend(x.get_dependencies(dedup=False))
+
     def show(self, renderer: Literal["auto", "ipython", "browser"] = "auto") -> object:
         """
         Preview as a complete HTML document.
@@ -862,50 +895,67 @@ class Tag:
             The end-of-line character(s).
         """
 
+        html_: list[str] = []
+        self._write_html_impl(html_, indent, eol)
+        return "".join(html_)
+
+    def _write_html(self, html_: list[str], indent: int, eol: str) -> None:
+        # Append the HTML for this tag to `html_` (see `TagList._write_html()`).
+        # Subclasses that customize get_html_string() are rendered with it.
+        if type(self).get_html_string is not Tag.get_html_string:
+            html_.append(self.get_html_string(indent, eol))
+        else:
+            self._write_html_impl(html_, indent, eol)
+
+    def _write_html_impl(self, html_: list[str], indent: int, eol: str) -> None:
         indent_str = "  " * indent
-        html_ = indent_str + "<" + self.name
+        html_.append(indent_str + "<" + self.name)
 
         # Write attributes
         for key, val in self.attrs.items():
             if not isinstance(val, HTML):
                 val = html_escape(val, attr=True)
-            html_ += f' {key}="{val}"'
+            html_.append(f' {key}="{val}"')
 
         # Dependencies are ignored in the HTML output
         children = [x for x in self.children if not isinstance(x, MetadataNode)]
 
         # Don't enclose JSX/void elements if there are no children
         if len(children) == 0 and self.name in _VOID_TAG_NAMES:
-            return html_ + "/>"
+            html_.append("/>")
+            return
 
         # Other empty tags are enclosed
-        html_ += ">"
+        html_.append(">")
         close = "</" + self.name + ">"
         if len(children) == 0:
-            return html_ + close
+            html_.append(close)
+            return
 
         # Inline a single/empty child text node
         if len(children) == 1 and isinstance(children[0], (str, HTML)):
             if self.name in _NO_ESCAPE_TAG_NAMES:
-                return html_ + str(children[0]) + close
+                html_.append(str(children[0]) + close)
             else:
-                return html_ + _normalize_text(children[0]) + close
+                html_.append(_normalize_text(children[0]) + close)
+            return
 
         # Write children
         if self.add_ws:
-            html_ += eol
+            html_.append(eol)
 
-        html_ += self.children.get_html_string(
-            indent=indent + 1,
-            eol=eol,
+        self.children._write_html(
+            html_,
+            indent + 1,
+            eol,
             add_ws=self.add_ws,
             _escape_strings=(self.name not in _NO_ESCAPE_TAG_NAMES),
         )
 
         if self.add_ws:
-            html_ += eol + indent_str
+            html_.append(eol + indent_str)
 
-        return html_ + close
+        html_.append(close)
 
     def render(self) -> RenderedHTML:
         """
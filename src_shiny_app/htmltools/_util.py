@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import importlib
 import os
@@ -122,9 +123,16 @@ HTML_ATTRS_ESCAPE_TABLE = {
 }
 
 
+_HTML_ESCAPE_RE = re.compile("|".join(HTML_ESCAPE_TABLE))
+_HTML_ATTRS_ESCAPE_RE = re.compile("|".join(HTML_ATTRS_ESCAPE_TABLE))
+
+
 def html_escape(text: str, attr: bool = False) -> str:
-    table = HTML_ATTRS_ESCAPE_TABLE if attr else HTML_ESCAPE_TABLE
-    if not re.search("|".join(table), text):
+    if attr:
+        table, pattern = HTML_ATTRS_ESCAPE_TABLE, _HTML_ATTRS_ESCAPE_RE
+    else:
+        table, pattern = HTML_ESCAPE_TABLE, _HTML_ESCAPE_RE
+    if not pattern.search(text):
         return text
     for key, value in table.items():
         text = text.replace(key, value)
@@ -136,6 +144,9 @@ _html_escape = html_escape
 
 
 # similar to base::system.file()
+# The location of a package doesn't change, and this is called for every dependency
+# that is rendered, so cache it.
+@functools.lru_cache(maxsize=None)
 def package_dir(package: str) -> str:
     with tempfile.TemporaryDirectory():
         pkg_file = importlib.import_module(".", package=package).__file__
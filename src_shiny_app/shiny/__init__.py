@@ -1,7 +1,10 @@
 """A package for building reactive web applications."""
 
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+
 from ._version import __version__
 
+from ._lazy import lazy_attrs as _lazy_attrs
 from ._shinyenv import is_pyodide as _is_pyodide
 
 # User-facing subpackages that should be available on `from shiny import *`
@@ -23,12 +26,23 @@ from ._deprecated import *
 
 from . import module
 
+if _TYPE_CHECKING:
+    from ._main import run_app
+    from ._upload_frame import read_upload_frame
+else:
+    # _main imports click and uvicorn, which take a while to import and aren't needed
+    # when the app is started by `shiny run` (which imports them anyway) or by another
+    # server. Import it when `run_app` is first used.
+    __getattr__, __dir__ = _lazy_attrs(
+        __name__,
+        globals(),
+        {"run_app": "._main", "read_upload_frame": "._upload_frame"},
+    )
+
 if _is_pyodide:
     # In pyodide, avoid importing _main because it imports packages that aren't
     # available.
     run_app = None
-else:
-    from ._main import run_app
 
 
 # N.B.: we intentionally don't import 'developer-facing' submodules (e.g.,
@@ -48,6 +62,8 @@ __all__ = (
     "App",
     # _main.py
     "run_app",
+    # _upload_frame.py
+    "read_upload_frame",
     # _modules.py
     "module",
     # _session.py
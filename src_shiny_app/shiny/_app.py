@@ -1,12 +1,23 @@
 from __future__ import annotations
 
 import copy
+import hashlib
 import os
 import secrets
+from collections import OrderedDict
 from contextlib import AsyncExitStack, asynccontextmanager
 from inspect import signature
 from pathlib import Path
-from typing import Any, Callable, Mapping, Optional, TypeVar, cast
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Literal,
+    Mapping,
+    Optional,
+    TypeVar,
+    cast,
+)
 
 import starlette.applications
 import starlette.exceptions
@@ -26,13 +37,28 @@ from starlette.responses import HTMLResponse, JSONResponse, Response
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ._autoreload import InjectAutoreloadMiddleware, autoreload_url
+from ._bundle import DependencyBundler
 from ._connection import Connection, StarletteConnection
 from ._error import ErrorMiddleware
 from ._shinyenv import is_pyodide
-from ._utils import guess_mime_type, is_async_callable, sort_keys_length
+from ._utils import (
+    etag_matches,
+    guess_mime_type,
+    is_async_callable,
+    sort_keys_length,
+)
 from .html_dependencies import jquery_deps, require_deps, shiny_deps
 from .http_staticfiles import FileResponse, StaticFiles
-from .session._session import AppSession, Inputs, Outputs, Session, session_context
+from .session._download import DownloadCache
+from .session._memory import SessionMemoryUsage
+from .session._session import (
+    AppSession,
+    Inputs,
+    MessageStats,
+    Outputs,
+    Session,
+    session_context,
+)
 
 T = TypeVar("T")
 
@@ -42,6 +68,14 @@ SANITIZE_ERRORS: bool = False
 SANITIZE_ERROR_MSG: str = (
     "An error has occurred. Check your logs or contact the app author for clarification."
 )
+MAX_OUTPUT_SIZE: Optional[int] = None
+SPLIT_OUTPUT_SIZE: Optional[int] = 256 * 1024
+SESSION_IDLE_TIMEOUT: Optional[float] = None
+SESSION_IDLE_ACTION: Literal["drop_caches", "close"] = "drop_caches"
+UI_CACHE_KEY: Optional[Callable[[Request], Optional[Hashable]]] = None
+UI_CACHE_SIZE: int = 32
+DOWNLOAD_CACHE_DIR: Optional[str | Path] = None
+DOWNLOAD_CACHE_SIZE: int = 512 * 1024 * 1024
 
 
 class App:
@@ -66,6 +100,12 @@ class App:
         that mount point.
     debug
         Whether to enable debug mode.
+    bundle_dependencies
+        Whether to combine the scripts and stylesheets of the page's HTML dependencies
+        (jQuery, Bootstrap, shiny.js, etc.) into as few files as possible, which reduces
+        the number of requests a browser makes to load the app. Dependencies whose
+        files can't be combined safely (e.g., module scripts, or stylesheets with
+        ``@import`` rules) are loaded as usual.
 
     Examples
     --------
@@ -103,6 +143,80 @@ class App:
     The message to show when an error occurs and ``SANITIZE_ERRORS=True``.
     """
 
+    max_output_size: int | None = None
+    """
+    The maximum size (in characters of serialized JSON) of a single output value. Output
+    values that are larger are not sent to the browser; an error is displayed for the
+    output instead. ``None`` (the default) means there is no limit.
+    """
+
+    split_output_size: int | None = 256 * 1024
+    """
+    Output values whose serialized JSON is larger than this many characters are sent to
+    the browser in their own message, after the message containing all of the smaller
+    output values of the same flush. This keeps small outputs responsive while a large
+    output is being sent. ``None`` sends all output values of a flush in one message.
+    """
+
+    message_stats: MessageStats
+    """
+    Counters of the messages sent to the browser by all sessions of the app.
+    """
+
+    session_idle_timeout: float | None = None
+    """
+    The number of seconds after which a session that has not received any message from
+    the browser is considered idle, and ``session_idle_action`` is applied to it.
+    ``None`` (the default) never considers sessions idle. Only sessions that start after
+    this is set are watched.
+    """
+
+    session_idle_action: Literal["drop_caches", "close"] = "drop_caches"
+    """
+    What to do with an idle session (see ``session_idle_timeout``). ``"drop_caches"``
+    drops the cached values of the session's reactive calculations; they are
+    recalculated when they are next needed, after the user interacts with the app again.
+    ``"close"`` closes the session (the browser shows the app as disconnected).
+    """
+
+    ui_cache_key: Callable[[Request], Hashable | None] | None = None
+    """
+    For apps with a UI function, a function that takes the
+    :class:`~starlette.requests.Request` for a page and returns a (hashable) key for
+    it. Requests with the same key are served the same rendered page, without calling
+    the UI function again. If the function returns ``None``, the page is rendered
+    without using the cache. ``None`` (the default) renders the page for every request.
+
+    For example, ``lambda request: request.query_params.get("lang")`` renders the page
+    once per value of the ``lang`` query parameter.
+    """
+
+    ui_cache_size: int = 32
+    """
+    The maximum number of rendered pages kept for ``ui_cache_key``. The least recently
+    used pages are dropped first.
+    """
+
+    download_cache_dir: str | Path | None = None
+    """
+    The directory in which the files of downloads with ``@render.download(cache=True)``
+    are stored. ``None`` (the default) uses a temporary directory. The files are deleted
+    when the app shuts down.
+    """
+
+    download_cache_size: int = 512 * 1024 * 1024
+    """
+    The maximum total size (in bytes) of the files of cached downloads. When it's
+    exceeded, the least recently used files are deleted.
+    """
+
+    bundle_dependencies: bool = False
+    """
+    Whether to combine the scripts and stylesheets of the page's HTML dependencies into
+    bundles (see the ``bundle_dependencies`` parameter). Changing this after the app is
+    created only affects UI functions.
+    """
+
     ui: RenderedHTML | Callable[[Request], Tag | TagList]
     server: Callable[[Inputs, Outputs, Session], None]
 
@@ -115,6 +229,7 @@ class App:
         *,
         static_assets: Optional[str | Path | Mapping[str, str | Path]] = None,
         debug: bool = False,
+        bundle_dependencies: bool = False,
     ) -> None:
         # Used to store callbacks to be called when the app is shutting down (according
         # to the ASGI lifespan protocol)
@@ -139,6 +254,18 @@ class App:
         self.lib_prefix: str = LIB_PREFIX
         self.sanitize_errors: bool = SANITIZE_ERRORS
         self.sanitize_error_msg: str = SANITIZE_ERROR_MSG
+        self.max_output_size: int | None = MAX_OUTPUT_SIZE
+        self.split_output_size: int | None = SPLIT_OUTPUT_SIZE
+        self.session_idle_timeout: float | None = SESSION_IDLE_TIMEOUT
+        self.session_idle_action: Literal["drop_caches", "close"] = SESSION_IDLE_ACTION
+        self.ui_cache_key: Callable[[Request], Hashable | None] | None = UI_CACHE_KEY
+        self.ui_cache_size: int = UI_CACHE_SIZE
+        self.download_cache_dir: str | Path | None = DOWNLOAD_CACHE_DIR
+        self.download_cache_size: int = DOWNLOAD_CACHE_SIZE
+        self.bundle_dependencies: bool = bundle_dependencies
+        self._dependency_bundler: DependencyBundler | None = None
+
+        self.message_stats = MessageStats()
 
         if static_assets is None:
             static_assets = {}
@@ -167,10 +294,26 @@ class App:
 
         self._sessions: dict[str, AppSession] = {}
 
+        # Rendered pages (and their ETags) of a UI function, by `ui_cache_key`
+        self._ui_cache: OrderedDict[Hashable, tuple[RenderedHTML, str]] = OrderedDict()
+        # ETag of the (static) rendered page
+        self._ui_etag: tuple[str, str] | None = None
+
         self._sessions_needing_flush: dict[int, AppSession] = {}
 
+        # Files of downloads with `@render.download(cache=True)`, shared by all sessions
+        self._download_cache: DownloadCache | None = None
+
         self._registered_dependencies: dict[str, HTMLDependency] = {}
-        self._dependency_handler = starlette.routing.Router()
+        # Dependencies as dicts (for sending to the browser), by (name-version,
+        # lib_prefix)
+        self._dependency_dicts: dict[
+            tuple[str, str], tuple[HTMLDependency, dict[str, Any]]
+        ] = {}
+        self._dependency_route = HTMLDependencyRoute()
+        self._dependency_handler = starlette.routing.Router(
+            routes=[self._dependency_route]
+        )
 
         for mount_point, static_asset_path in self._static_assets.items():
             self._dependency_handler.routes.append(
@@ -257,6 +400,17 @@ class App:
             print(f"remove_session: {session}", flush=True)
         del self._sessions[session]
 
+    def memory_usage(self) -> dict[str, SessionMemoryUsage]:
+        """
+        Approximate the memory retained by each session of the app.
+
+        Returns
+        -------
+        :
+            A dictionary mapping session IDs to their approximate memory usage.
+        """
+        return {id: session.memory_usage() for id, session in self._sessions.items()}
+
     def run(self, **kwargs: object) -> None:
         """
         Run the app.
@@ -295,6 +449,15 @@ class App:
         """
         return self._exit_stack.callback(callback)
 
+    def _get_download_cache(self) -> DownloadCache:
+        if self._download_cache is None:
+            self._download_cache = DownloadCache(
+                self.download_cache_dir, self.download_cache_size
+            )
+            self.on_shutdown(self._download_cache.close)
+        self._download_cache.max_size = self.download_cache_size
+        return self._download_cache
+
     async def call_pyodide(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Communicate with pyodide.
@@ -353,11 +516,43 @@ class App:
         request for / occurs.
         """
         ui: RenderedHTML
+        etag: str
         if callable(self.ui):
-            ui = self._render_page(self.ui(request), self.lib_prefix)
+            ui, etag = self._render_ui_func(request)
         else:
             ui = self.ui
-        return HTMLResponse(content=ui["html"])
+            if self._ui_etag is None or self._ui_etag[0] is not ui["html"]:
+                self._ui_etag = (ui["html"], _html_etag(ui["html"]))
+            etag = self._ui_etag[1]
+
+        # The page can be cached by the browser, but must be revalidated on every
+        # load; an unchanged page is then answered with an empty 304 response.
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(content=ui["html"], headers=headers)
+
+    def _render_ui_func(self, request: Request) -> tuple[RenderedHTML, str]:
+        ui_func = cast("Callable[[Request], Tag | TagList]", self.ui)
+
+        key: Hashable | None = None
+        if self.ui_cache_key is not None:
+            key = self.ui_cache_key(request)
+        if key is None:
+            ui = self._render_page(ui_func(request), self.lib_prefix)
+            return ui, _html_etag(ui["html"])
+
+        # lib_prefix can be changed after the app is created, and is part of the page
+        key = (key, self.lib_prefix)
+        if key in self._ui_cache:
+            self._ui_cache.move_to_end(key)
+            return self._ui_cache[key]
+
+        ui = self._render_page(ui_func(request), self.lib_prefix)
+        res = self._ui_cache[key] = (ui, _html_etag(ui["html"]))
+        while len(self._ui_cache) > max(self.ui_cache_size, 0):
+            self._ui_cache.popitem(last=False)
+        return res
 
     async def _on_connect_cb(self, ws: starlette.websockets.WebSocket) -> None:
         """
@@ -423,17 +618,24 @@ class App:
         if dep.source:
             paths = dep.source_path_map(lib_prefix=self.lib_prefix)
             if paths["source"] != "":
-                self._dependency_handler.routes.insert(
-                    0,
-                    starlette.routing.Mount(
-                        "/" + paths["href"],
-                        StaticFiles(directory=paths["source"]),
-                        name=dep_name,
-                    ),
-                )
+                self._dependency_route.add(paths["href"], paths["source"])
 
         self._registered_dependencies[dep_name] = dep
 
+    def _dependency_dict(self, dep: HTMLDependency) -> dict[str, Any]:
+        # Dynamic UI sends the same dependencies over and over, and `as_dict()` deep
+        # copies and resolves paths each time. Dependency objects are usually recreated
+        # for each render, so look them up by name and version, and check that they are
+        # the same.
+        key = (html_dep_name(dep), self.lib_prefix)
+        cached = self._dependency_dicts.get(key)
+        if cached is not None and (cached[0] is dep or cached[0] == dep):
+            return cached[1]
+
+        dep_dict = dep.as_dict(lib_prefix=self.lib_prefix)
+        self._dependency_dicts[key] = (dep, dep_dict)
+        return dep_dict
+
     def _render_page(self, ui: Tag | TagList, lib_prefix: str) -> RenderedHTML:
         ui_res = copy.copy(ui)
         # Use presence of the Bootstrap dependency as a signal that the UI uses a
@@ -447,6 +649,16 @@ class App:
             0,
             [require_deps(), jquery_deps(), *shiny_deps(include_css=not has_bootstrap)],
         )
+        if self.bundle_dependencies:
+            if self._dependency_bundler is None:
+                self._dependency_bundler = DependencyBundler()
+            # The resolved dependencies are replaced by bundles, and the original
+            # dependencies without their scripts and stylesheets. Since dependencies
+            # are deduplicated by name (keeping the first of the highest version),
+            # putting these first makes them take the place of the originals.
+            ui_res.insert(
+                0, self._dependency_bundler.bundle(ui_res.get_dependencies())
+            )
         rendered = HTMLDocument(ui_res).render(lib_prefix=lib_prefix)
         self._ensure_web_dependencies(rendered["dependencies"])
         return rendered
@@ -467,6 +679,10 @@ class App:
         return rendered
 
 
+def _html_etag(html: str) -> str:
+    return '"' + hashlib.sha1(html.encode("utf-8")).hexdigest() + '"'
+
+
 def is_uifunc(x: Path | Tag | TagList | Callable[[Request], Tag | TagList]) -> bool:
     if (
         isinstance(x, Path)
@@ -483,6 +699,70 @@ def html_dep_name(dep: HTMLDependency) -> str:
     return dep.name + "-" + str(dep.version)
 
 
+class HTMLDependencyRoute(starlette.routing.BaseRoute):
+    """
+    A route that serves the source directories of HTML dependencies.
+
+    Dependencies are served at `/<href>/...`, where `href` is the (versioned) path of
+    the dependency, e.g. `lib/bootstrap-5.3.1`. A request is resolved with a dictionary
+    lookup per path segment, so the cost doesn't grow with the number of registered
+    dependencies. Since the paths are versioned, files are served with immutable cache
+    headers (except when autoreload is on, as dependency files may be edited during
+    development), and with precompressed variants when available.
+    """
+
+    def __init__(self) -> None:
+        self._apps: dict[str, ASGIApp] = {}
+
+    def add(self, href: str, directory: str) -> None:
+        """
+        Serve `directory` at `/<href>/`.
+        """
+        self._apps[href.strip("/")] = StaticFiles(
+            directory=directory,
+            precompressed=True,
+            immutable=not autoreload_url(),
+        )
+
+    def _lookup(self, route_path: str) -> tuple[str, ASGIApp] | None:
+        # `route_path` looks like "/lib/bootstrap-5.3.1/css/bootstrap.min.css"; try
+        # each of its directory prefixes
+        start = 1
+        while (end := route_path.find("/", start)) != -1:
+            href = route_path[1:end]
+            if href in self._apps:
+                return href, self._apps[href]
+            start = end + 1
+        return None
+
+    def matches(self, scope: Scope) -> tuple[starlette.routing.Match, Scope]:
+        if scope["type"] != "http":
+            return starlette.routing.Match.NONE, {}
+
+        root_path: str = scope.get("root_path", "")
+        route_path: str = scope["path"]
+        if root_path and route_path.startswith(root_path + "/"):
+            route_path = route_path[len(root_path) :]
+
+        found = self._lookup(route_path)
+        if found is None:
+            return starlette.routing.Match.NONE, {}
+
+        href, app = found
+        child_scope: Scope = {
+            "app_root_path": scope.get("app_root_path", root_path),
+            "root_path": root_path + "/" + href,
+            "endpoint": app,
+        }
+        return starlette.routing.Match.FULL, child_scope
+
+    def url_path_for(self, name: str, /, **path_params: Any) -> starlette.routing.URLPath:
+        raise starlette.routing.NoMatchFound(name, path_params)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await scope["endpoint"](scope, receive, send)
+
+
 def create_static_asset_route(
     mount_point: str, static_asset_path: Path
 ) -> starlette.routing.BaseRoute:
@@ -499,7 +779,7 @@ def create_static_asset_route(
     if static_asset_path.is_dir():
         return starlette.routing.Mount(
             mount_point,
-            StaticFiles(directory=static_asset_path),
+            StaticFiles(directory=static_asset_path, precompressed=True),
             name="shiny-app-static-assets-" + mount_point,
         )
     else:
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+__all__ = ("DependencyBundler",)
+
+import copy
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+import urllib.parse
+from pathlib import Path
+from typing import Optional
+
+from htmltools import HTMLDependency
+
+from .http_staticfiles import precompress_directory
+
+# Matches `url(...)` references in CSS
+_CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+# Source map comments refer to files relative to the original script/stylesheet
+_JS_SOURCEMAP_RE = re.compile(r"^[ \t]*//[#@] sourceMappingURL=.*$", re.MULTILINE)
+_CSS_SOURCEMAP_RE = re.compile(r"/\*[#@] sourceMappingURL=.*?\*/")
+
+# Identifies the files of a dependency: (directory name, source directory, script
+# paths, stylesheet paths)
+DepFilesKey = tuple[str, str, tuple[str, ...], tuple[str, ...]]
+
+
+class DependencyBundler:
+    """
+    Combine the scripts and stylesheets of HTML dependencies into bundles.
+
+    Each run of consecutive dependencies whose files can be combined is replaced by one
+    bundle dependency, with one script and one stylesheet. The original dependencies are
+    kept, without their scripts and stylesheets, so that their other files (fonts,
+    images, ...) are still served, and so that shiny.js knows that they are already
+    loaded.
+
+    Bundles are named by the hash of their content and written to `cache_dir` (or a
+    temporary directory that is removed when the bundler is garbage collected).
+    """
+
+    def __init__(self, cache_dir: Optional[str | Path] = None) -> None:
+        self._tmp_dir: Optional[tempfile.TemporaryDirectory[str]] = None
+        if cache_dir is None:
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix="shiny-bundles-")
+            cache_dir = self._tmp_dir.name
+        self._cache_dir = Path(cache_dir)
+        self._bundles: dict[tuple[DepFilesKey, ...], HTMLDependency] = {}
+        self._bundleable: dict[DepFilesKey, bool] = {}
+
+    def bundle(self, deps: list[HTMLDependency]) -> list[HTMLDependency]:
+        """
+        Bundle a list of (resolved) dependencies.
+
+        Parameters
+        ----------
+        deps
+            The dependencies, in the order they're loaded in.
+
+        Returns
+        -------
+        :
+            The dependencies to load instead, in order.
+        """
+        res: list[HTMLDependency] = []
+        run: list[HTMLDependency] = []
+
+        def end_run() -> None:
+            if len(run) > 1:
+                res.append(self._get_bundle(run))
+                res.extend(_without_files(dep) for dep in run)
+            else:
+                res.extend(run)
+            run.clear()
+
+        for dep in deps:
+            key = _dep_files_key(dep)
+            if key not in self._bundleable:
+                self._bundleable[key] = _is_bundleable(dep)
+            if self._bundleable[key]:
+                run.append(dep)
+            else:
+                end_run()
+                res.append(dep)
+        end_run()
+
+        return res
+
+    def _get_bundle(self, deps: list[HTMLDependency]) -> HTMLDependency:
+        key = tuple(_dep_files_key(dep) for dep in deps)
+        if key in self._bundles:
+            return self._bundles[key]
+
+        js: list[str] = []
+        css: list[str] = []
+        for dep in deps:
+            source = dep.source_path_map(lib_prefix=None)["source"]
+            for script in dep.script:
+                code = _read_text(os.path.join(source, script["src"]))
+                js.append(_JS_SOURCEMAP_RE.sub("", code))
+            for stylesheet in dep.stylesheet:
+                code = _read_text(os.path.join(source, stylesheet["href"]))
+                code = _CSS_SOURCEMAP_RE.sub("", code)
+                css.append(_rebase_css_urls(code, dep, stylesheet["href"]))
+
+        # Separate scripts with `;` in case one of them doesn't end with one
+        js_bundle = "\n;\n".join(js)
+        css_bundle = "\n".join(css)
+        digest = hashlib.sha256(
+            (js_bundle + "\0" + css_bundle).encode("utf-8")
+        ).hexdigest()[:16]
+
+        bundle_dir = self._cache_dir / ("shiny-bundle-" + digest)
+        if not bundle_dir.exists():
+            tmp_dir = Path(tempfile.mkdtemp(dir=self._cache_dir))
+            (tmp_dir / "bundle.js").write_text(js_bundle, encoding="utf-8")
+            (tmp_dir / "bundle.css").write_text(css_bundle, encoding="utf-8")
+            precompress_directory(tmp_dir)
+            try:
+                tmp_dir.rename(bundle_dir)
+            except OSError:
+                # Written concurrently by another process; the content is the same
+                pass
+
+        bundle = HTMLDependency(
+            "shiny-bundle-" + digest,
+            "1.0",
+            source={"subdir": str(bundle_dir)},
+            script=[{"src": "bundle.js"}] if js else [],
+            stylesheet=[{"href": "bundle.css"}] if css else [],
+        )
+        self._bundles[key] = bundle
+        return bundle
+
+
+def _dep_dir(dep: HTMLDependency) -> str:
+    # The directory name of the dependency, relative to the lib prefix
+    return dep.source_path_map(lib_prefix=None)["href"]
+
+
+def _dep_files_key(dep: HTMLDependency) -> DepFilesKey:
+    return (
+        _dep_dir(dep),
+        dep.source_path_map(lib_prefix=None)["source"],
+        tuple(s["src"] for s in dep.script),
+        tuple(s["href"] for s in dep.stylesheet),
+    )
+
+
+def _is_bundleable(dep: HTMLDependency) -> bool:
+    # Only dependencies with files on disk, and plain <script src> / <link
+    # rel="stylesheet"> items (no module scripts, async, media queries, etc.) can be
+    # combined without changing how they load.
+    if len(dep.script) + len(dep.stylesheet) == 0:
+        return False
+    source = dep.source_path_map(lib_prefix=None)["source"]
+    if source == "":
+        return False
+
+    for script in dep.script:
+        if set(script) != {"src"} or _is_url(script["src"]):
+            return False
+        if not os.path.isfile(os.path.join(source, script["src"])):
+            return False
+
+    for stylesheet in dep.stylesheet:
+        extra = set(stylesheet) - {"href", "rel", "type"}
+        if extra or stylesheet.get("rel") != "stylesheet":
+            return False
+        if _is_url(stylesheet["href"]):
+            return False
+        path = os.path.join(source, stylesheet["href"])
+        # @import rules are only valid at the top of a stylesheet
+        if not os.path.isfile(path) or "@import" in _read_text(path):
+            return False
+
+    return True
+
+
+def _without_files(dep: HTMLDependency) -> HTMLDependency:
+    res = copy.copy(dep)
+    res.script = []
+    res.stylesheet = []
+    return res
+
+
+def _is_url(path: str) -> bool:
+    return path.startswith(("/", "#")) or urllib.parse.urlparse(path).scheme != ""
+
+
+def _rebase_css_urls(code: str, dep: HTMLDependency, href: str) -> str:
+    # Relative URLs in the stylesheet are relative to `<lib_prefix><dep_dir>/<href>`.
+    # The bundle is served from `<lib_prefix>shiny-bundle-<hash>/bundle.css`, so point
+    # them back at the dependency's directory.
+    base = posixpath.join(_dep_dir(dep), posixpath.dirname(href))
+
+    def rebase(m: re.Match[str]) -> str:
+        quote, url = m.group(1), m.group(2).strip()
+        if _is_url(url) or url.startswith("data:"):
+            return m.group(0)
+        return f"url({quote}../{posixpath.normpath(posixpath.join(base, url))}{quote})"
+
+    return _CSS_URL_RE.sub(rebase, code)
+
+
+def _read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import copy
 import os
 import pathlib
 import shutil
 import tempfile
-from typing import BinaryIO, List, Optional, cast
+from typing import AsyncIterable, AsyncIterator, BinaryIO, List, Optional, cast
 
 from . import _utils
+from ._shinyenv import is_pyodide
 from .types import FileInfo
 
 # File uploads happen through a series of requests. This requires a browser
@@ -31,6 +33,24 @@ from .types import FileInfo
 #    with the tag ID and a null message. The messages look like this:
 #    RECV {"method":"uploadEnd","args":["1651ddebfb643a26e6f18aa1","file1"],"tag":3}
 #    SEND {"response":{"tag":3,"value":null}}
+#
+# Clients can also upload files in pieces, and resume interrupted uploads:
+#
+# * "uploadInit" may have the input ID as a second argument. The app can then read
+#   the files while they're being uploaded (see `Session.upload_chunks()`).
+# * A POST request to `<uploadUrl>&file=<i>&offset=<n>` appends its data to the i-th
+#   file (0-based), which must have exactly n bytes so far. Otherwise, the response is
+#   a 409 error. A file is complete when it has as many bytes as its "size".
+# * A HEAD request to `<uploadUrl>&file=<i>` returns the number of bytes received for
+#   the i-th file so far, in the "Upload-Offset" header. So does every response to a
+#   POST request with an offset.
+
+# Uploaded data is buffered up to this size before it's written to disk
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+class UploadOffsetError(ValueError):
+    """The offset of a piece of an upload doesn't match the data received so far."""
 
 
 class FileUploadOperation:
@@ -44,16 +64,21 @@ class FileUploadOperation:
         self._file_infos: list[FileInfo] = [
             cast(FileInfo, {**fi, "datapath": ""}) for fi in copy.deepcopy(file_infos)
         ]
+        for i, file_info in enumerate(self._file_infos):
+            file_ext = pathlib.Path(file_info["name"]).suffix
+            file_info["datapath"] = os.path.join(self._dir, str(i) + file_ext)
         self._n_uploaded: int = 0
         self._current_file_obj: Optional[BinaryIO] = None
+        # Bytes written to disk, and whether the upload is complete, for each file
+        self._bytes_received: list[int] = [0] * len(self._file_infos)
+        self._complete: list[bool] = [False] * len(self._file_infos)
+        self._aborted: bool = False
+        # Set (and replaced) whenever data is written, to wake up readers
+        self._changed: asyncio.Event = asyncio.Event()
 
     # Start uploading one of the files.
     def file_begin(self) -> None:
         file_info: FileInfo = self._file_infos[self._n_uploaded]
-        file_ext = pathlib.Path(file_info["name"]).suffix
-        file_info["datapath"] = os.path.join(
-            self._dir, str(self._n_uploaded) + file_ext
-        )
         self._current_file_obj = open(file_info["datapath"], "ab")
 
     # Finish uploading one of the files.
@@ -61,17 +86,151 @@ class FileUploadOperation:
         if self._current_file_obj is not None:
             self._current_file_obj.close()
         self._current_file_obj = None
+        self._complete[self._n_uploaded] = True
         self._n_uploaded += 1
+        self._notify()
 
     # Write a chunk of data for the currently-open file.
     def write_chunk(self, chunk: bytes) -> None:
         if self._current_file_obj is None:
             raise RuntimeError(f"FileUploadOperation for {self._id} is not open.")
-        self._current_file_obj.write(chunk)
+        _write_and_flush(self._current_file_obj, chunk)
+        self._written(self._n_uploaded, len(chunk))
+
+    async def write_file(self, stream: AsyncIterable[bytes]) -> None:
+        """
+        Write the next file (in order) from a request body.
+
+        Data is written in the background, so the event loop isn't blocked by disk I/O.
+        """
+        self.file_begin()
+        try:
+            await self._write_stream(self._n_uploaded, stream)
+        finally:
+            self.file_end()
+
+    async def write_file_piece(
+        self, index: int, offset: int, stream: AsyncIterable[bytes]
+    ) -> int:
+        """
+        Append a piece of the `index`-th file, which must start at `offset`.
+
+        Returns
+        -------
+        :
+            The number of bytes of the file received so far.
+        """
+        if index < 0 or index >= len(self._file_infos):
+            raise IndexError(f"Upload {self._id} has no file number {index}.")
+        if self._current_file_obj is not None or self._complete[index]:
+            raise UploadOffsetError(f"File {index} of upload {self._id} isn't open.")
+        if offset != self._bytes_received[index]:
+            raise UploadOffsetError(
+                f"Expected offset {self._bytes_received[index]}, got {offset}."
+            )
+
+        self._current_file_obj = open(self._file_infos[index]["datapath"], "ab")
+        try:
+            await self._write_stream(index, stream)
+        finally:
+            self._current_file_obj.close()
+            self._current_file_obj = None
+            if self._bytes_received[index] >= self._file_infos[index]["size"]:
+                self._complete[index] = True
+            self._notify()
+
+        return self._bytes_received[index]
+
+    def bytes_received(self, index: int) -> int:
+        return self._bytes_received[index]
+
+    async def _write_stream(self, index: int, stream: AsyncIterable[bytes]) -> None:
+        file_obj = self._current_file_obj
+        assert file_obj is not None
+
+        # Collect chunks until there's enough to write, then write them in a thread,
+        # while the next ones are received. At most one write is in flight, so at most
+        # about 2 * WRITE_BUFFER_SIZE bytes are held in memory.
+        buffer: list[bytes] = []
+        buffer_size = 0
+        pending: Optional[asyncio.Future[None]] = None
+
+        async def flush() -> None:
+            nonlocal buffer, buffer_size, pending
+            data = b"".join(buffer)
+            buffer, buffer_size = [], 0
+            if pending is not None:
+                await pending
+                pending = None
+            if is_pyodide:
+                # No threads in Pyodide
+                _write_and_flush(file_obj, data)
+                self._written(index, len(data))
+            else:
+                pending = asyncio.ensure_future(self._write_async(index, file_obj, data))
+
+        try:
+            async for chunk in stream:
+                if not chunk:
+                    continue
+                buffer.append(chunk)
+                buffer_size += len(chunk)
+                if buffer_size >= WRITE_BUFFER_SIZE:
+                    await flush()
+            if buffer_size > 0:
+                await flush()
+        finally:
+            if pending is not None:
+                await pending
+
+    async def _write_async(self, index: int, file_obj: BinaryIO, data: bytes) -> None:
+        await asyncio.to_thread(_write_and_flush, file_obj, data)
+        self._written(index, len(data))
+
+    def _written(self, index: int, n: int) -> None:
+        self._bytes_received[index] += n
+        self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def iter_chunks(
+        self, index: int, chunk_size: int = 64 * 1024
+    ) -> AsyncIterator[bytes]:
+        """
+        Iterate over the contents of the `index`-th file, as it's being uploaded.
+        """
+        datapath = self._file_infos[index]["datapath"]
+        pos = 0
+        f: Optional[BinaryIO] = None
+        try:
+            while True:
+                changed = self._changed
+                available = self._bytes_received[index] - pos
+                if available > 0:
+                    if f is None:
+                        f = open(datapath, "rb")
+                    data = await _read(f, min(available, chunk_size))
+                    pos += len(data)
+                    yield data
+                    continue
+                if self._complete[index]:
+                    return
+                if self._aborted:
+                    raise RuntimeError(f"Upload {self._id} was aborted.")
+                await changed.wait()
+        finally:
+            if f is not None:
+                f.close()
+
+    def abort(self) -> None:
+        self._aborted = True
+        self._notify()
 
     # End the entire operation, which can consist of multiple files.
     def finish(self) -> List[FileInfo]:
-        if self._n_uploaded != len(self._file_infos):
+        if not all(self._complete):
             raise RuntimeError(
                 f"Not all files for FileUploadOperation {self._id} were uploaded."
             )
@@ -86,16 +245,53 @@ class FileUploadOperation:
         self.file_end()
 
 
+def _write_and_flush(file_obj: BinaryIO, data: bytes) -> None:
+    file_obj.write(data)
+    # Make the data visible to readers of the file (see `iter_chunks()`)
+    file_obj.flush()
+
+
+async def iter_file_chunks(
+    datapath: str, chunk_size: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Iterate over the contents of an uploaded file, reading it in a thread.
+    """
+    with open(datapath, "rb") as f:
+        while chunk := await _read(f, chunk_size):
+            yield chunk
+
+
+async def _read(file_obj: BinaryIO, n: int) -> bytes:
+    if is_pyodide:
+        # No threads in Pyodide
+        return file_obj.read(n)
+    return await asyncio.to_thread(file_obj.read, n)
+
+
 class FileUploadManager:
     def __init__(self) -> None:
         # TODO: Remove basedir when app exits.
         self._basedir: str = tempfile.mkdtemp(prefix="fileupload-")
         self._operations: dict[str, FileUploadOperation] = {}
+        # The most recent operation for each input, if the client said which input
+        # the files are for when the upload started
+        self._input_operations: dict[str, FileUploadOperation] = {}
 
-    def create_upload_operation(self, file_infos: List[FileInfo]) -> str:
+    def create_upload_operation(
+        self, file_infos: List[FileInfo], input_id: Optional[str] = None
+    ) -> str:
         job_id = _utils.rand_hex(12)
         dir = tempfile.mkdtemp(dir=self._basedir)
-        self._operations[job_id] = FileUploadOperation(self, job_id, dir, file_infos)
+        operation = FileUploadOperation(self, job_id, dir, file_infos)
+        self._operations[job_id] = operation
+        if input_id is not None:
+            prev = self._input_operations.get(input_id)
+            if prev is not None and prev._id in self._operations:
+                # A new upload replaces an unfinished one
+                prev.abort()
+                del self._operations[prev._id]
+            self._input_operations[input_id] = operation
         return job_id
 
     def get_upload_operation(self, id: str) -> Optional[FileUploadOperation]:
@@ -104,10 +300,21 @@ class FileUploadManager:
         else:
             return None
 
+    def get_input_operation(self, input_id: str) -> Optional[FileUploadOperation]:
+        return self._input_operations.get(input_id)
+
     def on_job_finished(self, job_id: str) -> None:
-        del self._operations[job_id]
+        operation = self._operations.pop(job_id)
+        # Once the upload is finished, the input's value has the files
+        for input_id, input_operation in list(self._input_operations.items()):
+            if input_operation is operation:
+                del self._input_operations[input_id]
 
     # Remove the directories containing file uploads; this is to be called when
     # a session ends.
     def rm_upload_dir(self) -> None:
+        for operation in self._operations.values():
+            operation.abort()
+        self._operations.clear()
+        self._input_operations.clear()
         shutil.rmtree(self._basedir)
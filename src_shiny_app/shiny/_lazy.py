@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+__all__ = ("lazy_attrs",)
+
+import importlib
+from typing import Any, Callable
+
+
+def lazy_attrs(
+    package: str, namespace: dict[str, Any], attrs: dict[str, str]
+) -> tuple[Callable[[str], object], Callable[[], list[str]]]:
+    """
+    Create a module-level `__getattr__()` and `__dir__()` that import attributes on
+    first access.
+
+    Parameters
+    ----------
+    package
+        The name of the module (i.e. `__name__`).
+    namespace
+        The module's namespace (i.e. `globals()`). Imported attributes are stored in it,
+        so `__getattr__()` is only called once per attribute.
+    attrs
+        A mapping from attribute names to the (relative) name of the module that defines
+        them. If the last component of the module name is the attribute name, the
+        attribute is the module itself.
+
+    Returns
+    -------
+    :
+        The `__getattr__()` and `__dir__()` functions for the module.
+
+    Note
+    ----
+    The attributes should also be imported in an `if TYPE_CHECKING:` block, so that type
+    checkers and editors know about them.
+    """
+
+    def __getattr__(name: str) -> object:
+        module_name = attrs.get(name)
+        if module_name is None:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+
+        module = importlib.import_module(module_name, package)
+        if module_name.rsplit(".", 1)[-1] == name:
+            value = module
+        else:
+            value = getattr(module, name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(attrs))
+
+    return __getattr__, __dir__
@@ -671,6 +671,34 @@ def get_shiny_deps() -> None:
     print(shiny.quarto.get_shiny_deps())
 
 
+@main.command(
+    help="""Write gzip (and, if the brotli package is installed, brotli) compressed
+copies of static assets, which are then served to browsers that accept them.
+
+With no DIRS, compresses the assets bundled with Shiny (Bootstrap, jQuery, shiny.js,
+etc.). Pass your app's static assets directories to compress those too. Compressed
+copies that are older than their file are ignored when serving, so rerun this after
+changing the files.
+"""
+)
+@click.argument("dirs", type=click.Path(exists=True, file_okay=False), nargs=-1)
+@click.option(
+    "--min-size",
+    type=int,
+    default=1024,
+    help="Files smaller than this many bytes aren't compressed.",
+    show_default=True,
+)
+def precompress_assets(dirs: tuple[str, ...], min_size: int) -> None:
+    from .http_staticfiles import precompress_directory
+
+    if len(dirs) == 0:
+        dirs = (os.path.join(os.path.dirname(__file__), "www"),)
+    for dir in dirs:
+        n = precompress_directory(dir, min_size=min_size)
+        print(f"{dir}: wrote {n} compressed files")
+
+
 class ReloadArgs(TypedDict):
     reload: NotRequired[bool]
     reload_includes: NotRequired[list[str]]
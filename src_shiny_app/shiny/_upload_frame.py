@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+__all__ = ("read_upload_frame",)
+
+import asyncio
+import importlib.util
+import os
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generator,
+    Literal,
+    Optional,
+    TypeVar,
+)
+
+import narwhals.stable.v1 as nw
+
+from ._shinyenv import is_pyodide
+from .session import get_current_session
+
+if TYPE_CHECKING:
+    from .session import Session
+    from .types import FileInfo
+
+T = TypeVar("T")
+
+UploadFormat = Literal["csv", "parquet", "arrow"]
+FrameEngine = Literal["pyarrow", "polars", "pandas"]
+
+# A reader is a generator that reads a file in pieces. After each piece, it yields the
+# fraction of the file that has been read (or None if that isn't known), and at the end
+# it returns the native data frame.
+_Reader = Generator[Optional[float], None, Any]
+
+# Size of the blocks that pyarrow parses CSV files in, and the number of rows that
+# pandas and polars parse at a time
+CSV_BLOCK_SIZE = 1024 * 1024
+CSV_BATCH_ROWS = 50_000
+
+_EXTENSION_FORMATS: dict[str, UploadFormat] = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+
+async def read_upload_frame(
+    file: FileInfo,
+    *,
+    format: Optional[UploadFormat] = None,
+    engine: Optional[FrameEngine] = None,
+    progress: bool = True,
+    session: Optional[Session] = None,
+) -> nw.DataFrame[Any]:
+    """
+    Read an uploaded CSV, Parquet, or Arrow file into a data frame.
+
+    The file is read in pieces in a background thread, so the app stays responsive
+    while a large file is parsed, and a progress bar is shown while it's read. Parquet
+    and Arrow files are memory-mapped instead of being copied into memory, when the
+    engine supports it.
+
+    Parameters
+    ----------
+    file
+        The uploaded file: one of the items of the value of an
+        :func:`~shiny.ui.input_file`.
+    format
+        The format of the file. If not provided, it's inferred from the extension of
+        the file name (`.csv`, `.parquet`/`.pq`, or `.arrow`/`.feather`/`.ipc`).
+    engine
+        The data frame library used to read the file, which is also the type of the
+        native data frame that's returned. If not provided, the first one of
+        `"pyarrow"`, `"polars"`, and `"pandas"` that's installed is used.
+    progress
+        Whether to show a progress bar while the file is read.
+    session
+        The :class:`~shiny.Session` to show the progress bar in. If not provided, the
+        current session is used (if any).
+
+    Returns
+    -------
+    :
+        A narwhals data frame; use its `.to_native()` method to get the underlying
+        data frame of the engine.
+
+    See Also
+    --------
+    * :func:`~shiny.ui.input_file`
+    * :class:`~shiny.ui.Progress`
+    """
+    path = file["datapath"]
+    if format is None:
+        format = _infer_format(file["name"])
+    if engine is None:
+        engine = _default_engine()
+    elif importlib.util.find_spec(engine) is None:
+        raise ImportError(
+            f"The '{engine}' package is required to read files with engine='{engine}'."
+        )
+
+    try:
+        reader_fn = _READERS[engine][format]
+    except KeyError:
+        raise ValueError(
+            f"Invalid format '{format}'. Expected one of: "
+            + ", ".join(f'"{x}"' for x in _READERS[engine])
+            + "."
+        ) from None
+
+    reader = reader_fn(path, os.path.getsize(path))
+
+    if progress and session is None:
+        session = get_current_session()
+    p = None
+    if progress and session is not None:
+        from .ui._progress import Progress
+
+        p = Progress(session=session)
+
+    message = f"Reading {file['name']}"
+    try:
+        if p is not None:
+            p.set(0, message=message)
+        while True:
+            done, value = await _run_in_thread(_step, reader)
+            if done:
+                break
+            if p is not None:
+                # If the reader doesn't know how far it is, the bar is left where it
+                # is (a value of None would hide it)
+                p.set(p.value if value is None else value, message=message)
+    finally:
+        if p is not None:
+            p.close()
+
+    return nw.from_native(value, eager_only=True)
+
+
+def _infer_format(name: str) -> UploadFormat:
+    ext = os.path.splitext(name)[1].lower()
+    if ext not in _EXTENSION_FORMATS:
+        raise ValueError(
+            f"Can't infer the format of '{name}' from its extension; please specify "
+            "`format=`."
+        )
+    return _EXTENSION_FORMATS[ext]
+
+
+def _default_engine() -> FrameEngine:
+    for engine in ("pyarrow", "polars", "pandas"):
+        if importlib.util.find_spec(engine) is not None:
+            return engine
+    raise ImportError(
+        "Reading uploaded files requires one of the 'pyarrow', 'polars', or 'pandas' "
+        "packages. Please install one of them with e.g. `pip install pyarrow`."
+    )
+
+
+def _step(reader: _Reader) -> tuple[bool, Any]:
+    # Advance the reader; returns (False, progress) or, at the end, (True, frame).
+    # (StopIteration can't be passed through a Future, so it's caught here.)
+    try:
+        return False, next(reader)
+    except StopIteration as e:
+        return True, e.value
+
+
+async def _run_in_thread(fn: Callable[..., T], *args: Any) -> T:
+    if is_pyodide:
+        # No threads in Pyodide
+        return fn(*args)
+    return await asyncio.to_thread(fn, *args)
+
+
+# ======================================================================================
+# pyarrow
+# ======================================================================================
+def _read_csv_pyarrow(path: str, size: int) -> _Reader:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    with open(path, "rb") as f:
+        reader = pacsv.open_csv(
+            f, read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE)
+        )
+        batches: list[pa.RecordBatch] = []
+        for batch in reader:
+            batches.append(batch)
+            yield f.tell() / size if size else None
+        return pa.Table.from_batches(batches, schema=reader.schema)
+
+
+def _read_parquet_pyarrow(path: str, size: int) -> _Reader:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path, memory_map=True)
+    n_groups = parquet_file.metadata.num_row_groups
+    tables: list[pa.Table] = []
+    for i in range(n_groups):
+        tables.append(parquet_file.read_row_group(i))
+        yield (i + 1) / n_groups
+    if not tables:
+        return parquet_file.schema_arrow.empty_table()
+    return pa.concat_tables(tables)
+
+
+def _read_arrow_pyarrow(path: str, size: int) -> _Reader:
+    import pyarrow as pa
+
+    # The record batches reference the memory-mapped file; nothing is copied
+    source = pa.memory_map(path)
+    try:
+        reader = pa.ipc.open_file(source)
+    except pa.ArrowInvalid:
+        # The IPC stream format, instead of the file (i.e. Feather v2) format
+        source.seek(0)
+        return pa.ipc.open_stream(source).read_all()
+
+    n_batches = reader.num_record_batches
+    batches: list[pa.RecordBatch] = []
+    for i in range(n_batches):
+        batches.append(reader.get_batch(i))
+        yield (i + 1) / n_batches
+    return pa.Table.from_batches(batches, schema=reader.schema)
+
+
+# ======================================================================================
+# polars
+# ======================================================================================
+def _read_csv_polars(path: str, size: int) -> _Reader:
+    import polars as pl
+
+    reader = pl.read_csv_batched(path, batch_size=CSV_BATCH_ROWS)
+    frames: list[pl.DataFrame] = []
+    while batches := reader.next_batches(1):
+        frames.extend(batches)
+        # The batched reader doesn't tell how far into the file it is
+        yield None
+    if not frames:
+        return pl.read_csv(path)
+    return pl.concat(frames, rechunk=False)
+
+
+def _read_parquet_polars(path: str, size: int) -> _Reader:
+    import polars as pl
+
+    return pl.read_parquet(path, memory_map=True)
+    yield
+
+
+def _read_arrow_polars(path: str, size: int) -> _Reader:
+    import polars as pl
+
+    try:
+        return pl.read_ipc(path, memory_map=True)
+    except pl.exceptions.ComputeError:
+        # The IPC stream format, instead of the file (i.e. Feather v2) format
+        return pl.read_ipc_stream(path)
+    yield
+
+
+# ======================================================================================
+# pandas
+# ======================================================================================
+def _read_csv_pandas(path: str, size: int) -> _Reader:
+    import pandas as pd
+
+    with open(path, "rb") as f:
+        frames: list[pd.DataFrame] = []
+        for chunk in pd.read_csv(f, chunksize=CSV_BATCH_ROWS):
+            frames.append(chunk)
+            yield f.tell() / size if size else None
+    if not frames:
+        return pd.read_csv(path)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _read_parquet_pandas(path: str, size: int) -> _Reader:
+    import pandas as pd
+
+    return pd.read_parquet(path, memory_map=True)
+    yield
+
+
+def _read_arrow_pandas(path: str, size: int) -> _Reader:
+    import pandas as pd
+
+    return pd.read_feather(path)
+    yield
+
+
+_READERS: dict[FrameEngine, dict[UploadFormat, Callable[[str, int], _Reader]]] = {
+    "pyarrow": {
+        "csv": _read_csv_pyarrow,
+        "parquet": _read_parquet_pyarrow,
+        "arrow": _read_arrow_pyarrow,
+    },
+    "polars": {
+        "csv": _read_csv_polars,
+        "parquet": _read_parquet_polars,
+        "arrow": _read_arrow_polars,
+    },
+    "pandas": {
+        "csv": _read_csv_pandas,
+        "parquet": _read_parquet_pandas,
+        "arrow": _read_arrow_pandas,
+    },
+}
@@ -91,6 +91,21 @@ def guess_mime_type(
     return mimetypes.guess_type(url, strict)[0] or default
 
 
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an `If-None-Match` request header matches an ETag, i.e. the client already
+    has the content, and a 304 (Not Modified) response can be sent.
+    """
+    if if_none_match is None:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        # Weak comparison, as for GET requests
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
 def random_port(
     min: int = 1024, max: int = 49151, host: str = "127.0.0.1", n: int = 20
 ) -> int:
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+__all__ = ("CompiledExpressApp", "compile_express_file")
+
+import ast
+import importlib.util
+import marshal
+import os
+import sys
+import tempfile
+import types
+from pathlib import Path
+from typing import Literal, NamedTuple, Optional
+
+from .._version import __version__
+from ._is_express import find_magic_comment_mode
+from .expressify_decorator._node_transformers import DisplayFuncsTransformer
+
+
+class CompiledExpressApp(NamedTuple):
+    # One code object per top-level statement of the app file, in order. Function
+    # definitions are compiled in "exec" mode, and other statements in "single" mode, so
+    # that the values of expressions are passed to sys.displayhook.
+    code: tuple[types.CodeType, ...]
+    # For each statement, whether it may only create UI (see _may_be_ui_only())
+    may_be_ui_only: tuple[bool, ...]
+    # The magic comment mode of the file (see find_magic_comment_mode())
+    magic_comment_mode: Literal["core", "express"] | None
+
+
+# (absolute path) -> (source key, compiled app)
+_cache: dict[str, tuple[tuple[int, int], CompiledExpressApp]] = {}
+
+
+def compile_express_file(file_path: str) -> CompiledExpressApp:
+    """
+    Parse, transform, and compile a Shiny Express app file.
+
+    Express apps are run once to create the UI, and again for every session, so the
+    result is cached in memory, and on disk in the `__pycache__` directory next to the
+    file (like the bytecode of regular modules). Cached results are invalidated when the
+    file's modification time or size change, and by upgrades of Shiny or Python.
+
+    Parameters
+    ----------
+    file_path
+        The absolute path of the app file. This is the file name used for tracebacks.
+    """
+    st = os.stat(file_path)
+    source_key = (st.st_mtime_ns, st.st_size)
+
+    cached = _cache.get(file_path)
+    if cached is not None and cached[0] == source_key:
+        return cached[1]
+
+    cache_path = _cache_path(file_path)
+    compiled = _read_cache(cache_path, file_path, source_key)
+    if compiled is None:
+        compiled = _compile(file_path)
+        _write_cache(cache_path, file_path, source_key, compiled)
+
+    _cache[file_path] = (source_key, compiled)
+    return compiled
+
+
+def _compile(file_path: str) -> CompiledExpressApp:
+    with open(file_path, encoding="utf-8") as f:
+        content = f.read()
+
+    tree = ast.parse(content, file_path)
+    tree = DisplayFuncsTransformer().visit(tree)
+    tree = ast.fix_missing_locations(tree)
+
+    code: list[types.CodeType] = []
+    may_be_ui_only: list[bool] = []
+    for node in tree.body:
+        may_be_ui_only.append(_may_be_ui_only(node))
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            code.append(
+                compile(ast.Module([node], type_ignores=[]), file_path, "exec")
+            )
+        else:
+            code.append(compile(ast.Interactive([node]), file_path, "single"))
+
+    return CompiledExpressApp(
+        tuple(code),
+        tuple(may_be_ui_only),
+        find_magic_comment_mode(content[:1000]),
+    )
+
+
+def _may_be_ui_only(node: ast.stmt) -> bool:
+    # Whether a top-level statement may only create UI: an expression (like
+    # `ui.input_text(...)`), or a `with` block of them (like `with ui.card(): ...`), that
+    # doesn't define or assign anything. Whether it actually only creates UI (and
+    # doesn't e.g. create a renderer) is only known when it runs.
+    if isinstance(node, ast.Pass):
+        return True
+    if isinstance(node, ast.Expr):
+        return not any(isinstance(n, ast.NamedExpr) for n in ast.walk(node))
+    if isinstance(node, ast.With):
+        return (
+            all(
+                item.optional_vars is None
+                and not any(
+                    isinstance(n, ast.NamedExpr) for n in ast.walk(item.context_expr)
+                )
+                for item in node.items
+            )
+            and all(_may_be_ui_only(child) for child in node.body)
+        )
+    return False
+
+
+# ======================================================================================
+# On-disk cache
+# ======================================================================================
+def _cache_path(file_path: str) -> Optional[Path]:
+    if sys.dont_write_bytecode or sys.implementation.cache_tag is None:
+        return None
+    path = Path(file_path)
+    return (
+        path.parent
+        / "__pycache__"
+        / f"{path.stem}.shiny-express.{sys.implementation.cache_tag}.pyc"
+    )
+
+
+def _cache_header(file_path: str, source_key: tuple[int, int]) -> tuple[object, ...]:
+    # Everything that the compiled code depends on, besides the source itself
+    return (importlib.util.MAGIC_NUMBER, __version__, file_path, *source_key)
+
+
+def _read_cache(
+    cache_path: Optional[Path], file_path: str, source_key: tuple[int, int]
+) -> CompiledExpressApp | None:
+    if cache_path is None:
+        return None
+    try:
+        header, *compiled = marshal.loads(cache_path.read_bytes())
+        res = CompiledExpressApp(*compiled)
+    except Exception:
+        # Missing, unreadable, or written by an incompatible version
+        return None
+    if header != _cache_header(file_path, source_key):
+        return None
+    return res
+
+
+def _write_cache(
+    cache_path: Optional[Path],
+    file_path: str,
+    source_key: tuple[int, int],
+    compiled: CompiledExpressApp,
+) -> None:
+    if cache_path is None:
+        return
+    data = marshal.dumps(
+        (_cache_header(file_path, source_key), *compiled),
+    )
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        # The app directory may be read-only; the cache is only an optimization
+        pass
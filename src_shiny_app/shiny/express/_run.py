@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import ast
 import importlib.abc
 import importlib.util
 import sys
@@ -17,14 +16,11 @@ from .._typing_extensions import NotRequired, TypedDict
 from .._utils import import_module_from_path
 from ..session import Inputs, Outputs, Session, get_current_session, session_context
 from ..types import MISSING, MISSING_TYPE
-from ._is_express import find_magic_comment_mode
+from ._code_cache import compile_express_file
 from ._recall_context import RecallContextManager
 from ._stub_session import ExpressStubSession
 from .expressify_decorator._func_displayhook import _expressify_decorator_function_def
-from .expressify_decorator._node_transformers import (
-    DisplayFuncsTransformer,
-    expressify_decorator_func_name,
-)
+from .expressify_decorator._node_transformers import expressify_decorator_func_name
 
 __all__ = (
     "app_opts",
@@ -122,6 +118,7 @@ def create_express_app(file: Path, package_name: str) -> App:
                 import_module_from_path("globals", globals_file)
 
         stub_session = ExpressStubSession()
+        ui_only = UiOnlyStatements()
         with session_context(stub_session):
             # We tagify here, instead of waiting for the App object to do it when it wraps
             # the UI in a HTMLDocument and calls render() on it. This is because
@@ -129,14 +126,26 @@ def create_express_app(file: Path, package_name: str) -> App:
             # catch them here and convert them to a different type of error, because uvicorn
             # specifically catches AttributeErrors and prints an error message that is
             # misleading for Shiny Express. https://github.com/posit-dev/py-shiny/issues/937
-            app_ui = run_express(file, package_name).tagify()
+            app_ui = run_express(file, package_name, ui_only=ui_only).tagify()
 
     except AttributeError as e:
         raise RuntimeError(e) from e
 
+    app_opts: AppOpts = {}
+
+    www_dir = file.parent / "www"
+    if www_dir.is_dir():
+        app_opts["static_assets"] = {"/": www_dir}
+
+    app_opts = _merge_app_opts(app_opts, stub_session.app_opts)
+    app_opts = _normalize_app_opts(app_opts, file.parent)
+
+    if app_opts.pop("rerun_ui", True):
+        ui_only = None
+
     def express_server(input: Inputs, output: Outputs, session: Session):
         try:
-            run_express(file, package_name)
+            run_express(file, package_name, ui_only=ui_only)
 
         except Exception:
             import traceback
@@ -145,15 +154,6 @@ def create_express_app(file: Path, package_name: str) -> App:
             traceback.print_exception(*sys.exc_info())
             raise
 
-    app_opts: AppOpts = {}
-
-    www_dir = file.parent / "www"
-    if www_dir.is_dir():
-        app_opts["static_assets"] = {"/": www_dir}
-
-    app_opts = _merge_app_opts(app_opts, stub_session.app_opts)
-    app_opts = _normalize_app_opts(app_opts, file.parent)
-
     app = App(
         app_ui,
         express_server,
@@ -163,7 +163,25 @@ def create_express_app(file: Path, package_name: str) -> App:
     return app
 
 
-def run_express(file: Path, package_name: str | None = None) -> Tag | TagList:
+class UiOnlyStatements:
+    """
+    The top-level statements of a Shiny Express app file that only create UI.
+
+    These are found when the app is run in the UI-rendering phase, and can be skipped in
+    the server-rendering phase, since the UI they create is ignored.
+    """
+
+    def __init__(self) -> None:
+        # The code that `indices` refers to
+        self.code: tuple[types.CodeType, ...] | None = None
+        self.indices: frozenset[int] = frozenset()
+
+
+def run_express(
+    file: Path,
+    package_name: str | None = None,
+    ui_only: UiOnlyStatements | None = None,
+) -> Tag | TagList:
     """
     Run the code in a Shiny Express app file and return the UI. This is to be run in
     both the UI-rendering phase and the server-rendering phase of a Shiny Express app.
@@ -177,13 +195,27 @@ def run_express(file: Path, package_name: str | None = None) -> Tag | TagList:
         The name of the package for the app. This is generated by `wrap_express_app()`
         and should be something like "shiny_express_app_0". The purpose of this is to
         allow relative imports in the app code.
+    ui_only
+        If this hasn't been filled in yet, the statements that only create UI are
+        recorded in it (this requires an `ExpressStubSession`). Otherwise, those
+        statements are skipped, as long as the file hasn't changed.
     """
-    with open(file, encoding="utf-8") as f:
-        content = f.read()
-
-    tree = ast.parse(content, file)
-    tree = DisplayFuncsTransformer().visit(tree)
-    tree = ast.fix_missing_locations(tree)
+    file_path = str(file.resolve())
+    compiled = compile_express_file(file_path)
+
+    # Which statements to skip, or, if recording, the stub session to watch
+    skip: frozenset[int] = frozenset()
+    stub_session: ExpressStubSession | None = None
+    recorded: set[int] = set()
+    if ui_only is not None:
+        if ui_only.code is None:
+            session = get_current_session()
+            if session is not None:
+                session = session.root_scope()
+            if isinstance(session, ExpressStubSession):
+                stub_session = session
+        elif ui_only.code is compiled.code:
+            skip = ui_only.indices
 
     ui_result: Tag | TagList = TagList()
 
@@ -198,8 +230,6 @@ def run_express(file: Path, package_name: str | None = None) -> Tag | TagList:
         reset_top_level_recall_context_manager()
         get_top_level_recall_context_manager().__enter__()
 
-        file_path = str(file.resolve())
-
         var_context: dict[str, object] = {
             "__file__": file_path,
             "__name__": "app",
@@ -208,20 +238,18 @@ def run_express(file: Path, package_name: str | None = None) -> Tag | TagList:
             "input": InputNotImportedShim(),
         }
 
-        # Execute each top-level node in the AST
-        for node in tree.body:
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                exec(
-                    compile(ast.Module([node], type_ignores=[]), file_path, "exec"),
-                    var_context,
-                    var_context,
-                )
-            else:
-                exec(
-                    compile(ast.Interactive([node]), file_path, "single"),
-                    var_context,
-                    var_context,
-                )
+        # Execute each top-level statement
+        for i, code in enumerate(compiled.code):
+            if i in skip:
+                continue
+            if stub_session is None:
+                exec(code, var_context, var_context)
+                continue
+
+            server_calls = stub_session._server_calls
+            exec(code, var_context, var_context)
+            if compiled.may_be_ui_only[i] and stub_session._server_calls == server_calls:
+                recorded.add(i)
 
         # When we called the function to get the top level recall context manager, we didn't
         # store the result in a variable and re-use that variable here. That is intentional,
@@ -237,7 +265,7 @@ def run_express(file: Path, package_name: str | None = None) -> Tag | TagList:
         if (
             "app" in var_context
             and isinstance(var_context["app"], App)
-            and find_magic_comment_mode(content[:1000]) is None
+            and compiled.magic_comment_mode is None
         ):
             raise RuntimeError(
                 "This looks like a Shiny Express app because it imports shiny.express, "
@@ -246,6 +274,10 @@ def run_express(file: Path, package_name: str | None = None) -> Tag | TagList:
                 "or the app=App()."
             )
 
+        if ui_only is not None and stub_session is not None:
+            ui_only.code = compiled.code
+            ui_only.indices = frozenset(recorded)
+
         return ui_result
 
     except AttributeError as e:
@@ -291,12 +323,16 @@ class InputNotImportedShim:
 class AppOpts(TypedDict):
     static_assets: NotRequired[dict[str, Path]]
     debug: NotRequired[bool]
+    bundle_dependencies: NotRequired[bool]
+    rerun_ui: NotRequired[bool]
 
 
 @no_example()
 def app_opts(
     static_assets: str | Path | Mapping[str, str | Path] | MISSING_TYPE = MISSING,
     debug: bool | MISSING_TYPE = MISSING,
+    bundle_dependencies: bool | MISSING_TYPE = MISSING,
+    rerun_ui: bool | MISSING_TYPE = MISSING,
 ):
     """
     Set App-level options in Shiny Express
@@ -315,6 +351,16 @@ def app_opts(
         without needing to set the option here.
     debug
         Whether to enable debug mode.
+    bundle_dependencies
+        Whether to combine the scripts and stylesheets of the page's HTML dependencies
+        into as few files as possible.
+    rerun_ui
+        Whether each session re-runs all of the app's top-level code. If `False`,
+        top-level statements that only create UI (expressions like
+        `ui.input_text(...)`, and `with` blocks of them, that don't create outputs or
+        effects, or otherwise use the session) are only run once, to create the page,
+        and are skipped when a session starts. Only set this to `False` if those
+        statements have no side effects that each session needs.
     """
 
     stub_session = get_current_session()
@@ -342,6 +388,12 @@ def app_opts(
     if not isinstance(debug, MISSING_TYPE):
         stub_session.app_opts["debug"] = debug
 
+    if not isinstance(bundle_dependencies, MISSING_TYPE):
+        stub_session.app_opts["bundle_dependencies"] = bundle_dependencies
+
+    if not isinstance(rerun_ui, MISSING_TYPE):
+        stub_session.app_opts["rerun_ui"] = rerun_ui
+
 
 def _merge_app_opts(app_opts: AppOpts, app_opts_new: AppOpts) -> AppOpts:
     """
@@ -360,6 +412,12 @@ def _merge_app_opts(app_opts: AppOpts, app_opts_new: AppOpts) -> AppOpts:
     if "debug" in app_opts_new:
         app_opts["debug"] = app_opts_new["debug"]
 
+    if "bundle_dependencies" in app_opts_new:
+        app_opts["bundle_dependencies"] = app_opts_new["bundle_dependencies"]
+
+    if "rerun_ui" in app_opts_new:
+        app_opts["rerun_ui"] = app_opts_new["rerun_ui"]
+
     return app_opts
 
 
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Awaitable, Callable, Literal, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Literal,
+    Optional,
+)
 
 from htmltools import TagChild
 
@@ -9,6 +17,7 @@ from ..session import Inputs, Outputs, Session
 from ..session._session import SessionProxy
 
 if TYPE_CHECKING:
+    from ..reactive import Calc_
     from ..session._session import DownloadHandler, DynamicRouteHandler, RenderedDeps
     from ..types import Jsonifiable
     from ._run import AppOpts
@@ -44,7 +53,14 @@ class ExpressStubSession(Session):
         # Application-level (not session-level) options that may be set via app_opts().
         self.app_opts: AppOpts = {}
 
+        # The number of calls of methods that only make sense with a real session (e.g.
+        # registering outputs, effects, or message handlers, or sending messages). This
+        # is used to find the top-level statements of an app that only create UI.
+        self._server_calls: int = 0
+
     def is_stub_session(self) -> Literal[True]:
+        # Objects that need a real session (e.g. outputs and effects) check this
+        self._server_calls += 1
         return True
 
     async def close(self, code: int = 1001) -> None:
@@ -58,6 +74,7 @@ class ExpressStubSession(Session):
         self,
         fn: Callable[[], None] | Callable[[], Awaitable[None]],
     ) -> Callable[[], None]:
+        self._server_calls += 1
         return lambda: None
 
     def make_scope(self, id: Id) -> Session:
@@ -71,20 +88,25 @@ class ExpressStubSession(Session):
         return {"deps": [], "html": ""}
 
     def send_input_message(self, id: str, message: dict[str, object]) -> None:
+        self._server_calls += 1
         return
 
     def _send_insert_ui(
         self, selector: str, multiple: bool, where: str, content: RenderedDeps
     ) -> None:
+        self._server_calls += 1
         return
 
     def _send_remove_ui(self, selector: str, multiple: bool) -> None:
+        self._server_calls += 1
         return
 
     def _send_progress(self, type: str, message: object) -> None:
+        self._server_calls += 1
         return
 
     async def send_custom_message(self, type: str, message: dict[str, object]) -> None:
+        self._server_calls += 1
         return
 
     def set_message_handler(
@@ -96,12 +118,15 @@ class ExpressStubSession(Session):
         *,
         _handler_session: Optional[Session] = None,
     ) -> str:
+        self._server_calls += 1
         return ""
 
     async def _send_message(self, message: dict[str, object]) -> None:
+        self._server_calls += 1
         return
 
     def _send_message_sync(self, message: dict[str, object]) -> None:
+        self._server_calls += 1
         return
 
     def _increment_busy_count(self) -> None:
@@ -110,11 +135,16 @@ class ExpressStubSession(Session):
     def _decrement_busy_count(self) -> None:
         return
 
+    def _register_calc(self, calc: Calc_[Any]) -> None:
+        self._server_calls += 1
+        return
+
     def on_flush(
         self,
         fn: Callable[[], None] | Callable[[], Awaitable[None]],
         once: bool = True,
     ) -> Callable[[], None]:
+        self._server_calls += 1
         return lambda: None
 
     def on_flushed(
@@ -122,11 +152,18 @@ class ExpressStubSession(Session):
         fn: Callable[[], None] | Callable[[], Awaitable[None]],
         once: bool = True,
     ) -> Callable[[], None]:
+        self._server_calls += 1
         return lambda: None
 
     def dynamic_route(self, name: str, handler: DynamicRouteHandler) -> str:
+        self._server_calls += 1
         return ""
 
+    async def upload_chunks(self, id: str, index: int = 0) -> AsyncIterator[bytes]:
+        self._server_calls += 1
+        return
+        yield
+
     async def _unhandled_error(self, e: Exception) -> None:
         return
 
@@ -137,4 +174,5 @@ class ExpressStubSession(Session):
         media_type: None | str | Callable[[], str] = None,
         encoding: str = "utf-8",
     ) -> Callable[[DownloadHandler], None]:
+        self._server_calls += 1
         return lambda x: None
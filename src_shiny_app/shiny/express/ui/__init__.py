@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING as _TYPE_CHECKING
 
 from htmltools import (
     TagList,
@@ -29,6 +30,7 @@ from htmltools import (
     strong,
 )
 
+from ..._lazy import lazy_attrs as _lazy_attrs
 from ...ui import (
     fill,
 )
@@ -41,12 +43,9 @@ from ...ui import (
     AccordionPanel,
     AnimationOptions,
     CardItem,
-    Chat,
-    ShowcaseLayout,
     Sidebar,
     SliderStepArg,
     SliderValueArg,
-    ValueBoxTheme,
     brush_opts,
     click_opts,
     dblclick_opts,
@@ -60,17 +59,13 @@ from ...ui import (
     input_checkbox_group,
     input_switch,
     input_radio_buttons,
-    input_dark_mode,
     input_date,
     input_date_range,
-    input_file,
     input_numeric,
     input_password,
     input_select,
     input_selectize,
     input_slider,
-    bind_task_button,
-    input_task_button,
     input_text,
     input_text_area,
     panel_title,
@@ -85,7 +80,6 @@ from ...ui import (
     update_switch,
     update_checkbox_group,
     update_radio_buttons,
-    update_dark_mode,
     update_date,
     update_date_range,
     update_numeric,
@@ -98,19 +92,8 @@ from ...ui import (
     update_navs,
     update_tooltip,
     update_popover,
-    insert_ui,
-    remove_ui,
-    markdown,
-    modal_button,
-    modal,
-    modal_show,
-    modal_remove,
-    notification_show,
-    notification_remove,
     nav_spacer,
-    Progress,
     Theme,
-    value_box_theme,
     js_eval,
 )
 
@@ -154,6 +137,56 @@ from ._hold import (
     hold,
 )
 
+if _TYPE_CHECKING:
+    from ...ui import (
+        Chat,
+        ShowcaseLayout,
+        ValueBoxTheme,
+        input_dark_mode,
+        input_file,
+        bind_task_button,
+        input_task_button,
+        update_dark_mode,
+        insert_ui,
+        remove_ui,
+        markdown,
+        modal_button,
+        modal,
+        modal_show,
+        modal_remove,
+        notification_show,
+        notification_remove,
+        Progress,
+        value_box_theme,
+    )
+else:
+    # Imported from `shiny.ui` when first accessed (see the note there)
+    __getattr__, __dir__ = _lazy_attrs(
+        __name__,
+        globals(),
+        {
+            "Chat": "...ui",
+            "ShowcaseLayout": "...ui",
+            "ValueBoxTheme": "...ui",
+            "input_dark_mode": "...ui",
+            "input_file": "...ui",
+            "bind_task_button": "...ui",
+            "input_task_button": "...ui",
+            "update_dark_mode": "...ui",
+            "insert_ui": "...ui",
+            "remove_ui": "...ui",
+            "markdown": "...ui",
+            "modal_button": "...ui",
+            "modal": "...ui",
+            "modal_show": "...ui",
+            "modal_remove": "...ui",
+            "notification_show": "...ui",
+            "notification_remove": "...ui",
+            "Progress": "...ui",
+            "value_box_theme": "...ui",
+        },
+    )
+
 __all__ = (
     # Imports from htmltools
     "TagList",
@@ -11,7 +11,9 @@ not true when running in native Python, we want to be as safe as possible.
 
 from __future__ import annotations
 
+import gzip
 import re
+from pathlib import Path
 from typing import Any
 
 from . import _utils
@@ -19,40 +21,153 @@ from . import _utils
 __all__ = (
     "StaticFiles",
     "FileResponse",
+    "precompress_directory",
 )
 
 import sys
 
 from starlette.background import BackgroundTask
 
+# Cache-Control header for files whose URL changes whenever their content does
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Precompressed siblings of a file, in order of preference
+_PRECOMPRESSED_EXTENSIONS = (("br", ".br"), ("gzip", ".gz"))
+
 if "pyodide" not in sys.modules:
     # Running in native mode; use starlette StaticFiles
     import os
 
+    import starlette.datastructures
     import starlette.responses
     import starlette.staticfiles
+    from starlette.types import Receive, Scope, Send
 
     FileResponse = starlette.responses.FileResponse  # type: ignore
 
-    # Wrapper for StaticFiles to fix .js content-type issues on Windows 10 (see #1601)
+    # Wrapper for StaticFiles to fix .js content-type issues on Windows 10 (see #1601),
+    # and to serve precompressed files and immutable cache headers.
     class StaticFiles(starlette.staticfiles.StaticFiles):  # type: ignore
-        def file_response(
+        def __init__(
             self,
-            full_path: str | os.PathLike[str],
             *args: Any,
+            precompressed: bool = False,
+            immutable: bool = False,
             **kwargs: Any,
+        ):
+            """
+            Parameters
+            ----------
+            precompressed
+                If `True` and the request accepts it, serve a `.br` (brotli) or `.gz`
+                (gzip) sibling of the requested file, if one exists, with the matching
+                `Content-Encoding`.
+            immutable
+                If `True`, tell browsers to cache files for a year without revalidating
+                them. Only use this when the URLs change whenever the files do (e.g.,
+                the URL includes a version).
+            """
+            super().__init__(*args, **kwargs)
+            self.precompressed = precompressed
+            self.immutable = immutable
+
+        def file_response(
+            self,
+            full_path: str | os.PathLike[str],
+            stat_result: os.stat_result,
+            scope: Scope,
+            status_code: int = 200,
         ) -> starlette.responses.Response:
-            resp = super().file_response(full_path, *args, **kwargs)
-            if resp.headers.get("content-type", "").startswith("text/plain"):
-                correct_type = _utils.guess_mime_type(full_path)
+            orig_path = full_path
+            encoding: str | None = None
+            if self.precompressed:
+                encoded = _precompressed_file(full_path, stat_result, scope)
+                if encoded is not None:
+                    encoding, full_path, stat_result = encoded
+
+            # Same as the super method, but with a response that can use the
+            # server's zero-copy file sending
+            request_headers = starlette.datastructures.Headers(scope=scope)
+            resp: starlette.responses.Response = PathSendFileResponse(
+                full_path, status_code=status_code, stat_result=stat_result
+            )
+            if self.is_not_modified(resp.headers, request_headers):
+                resp = starlette.staticfiles.NotModifiedResponse(resp.headers)
+
+            content_type = resp.headers.get("content-type")
+            # The content type of a precompressed file is that of the original file
+            if content_type is not None and (
+                encoding is not None or content_type.startswith("text/plain")
+            ):
+                correct_type = _utils.guess_mime_type(orig_path)
                 resp.headers["content-type"] = (
                     f"{correct_type}; charset={resp.charset}"
                     if correct_type.startswith("text/")
                     else correct_type
                 )
                 resp.media_type = correct_type
+            if self.precompressed:
+                resp.headers["vary"] = "Accept-Encoding"
+                if encoding is not None:
+                    resp.headers["content-encoding"] = encoding
+            if self.immutable:
+                resp.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
             return resp
 
+    class PathSendFileResponse(starlette.responses.FileResponse):
+        """
+        A FileResponse that lets the server send the file (e.g., with `sendfile()`) if
+        it supports the ASGI `http.response.pathsend` extension.
+        """
+
+        async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+            if (
+                "http.response.pathsend" not in scope.get("extensions", {})
+                or self.stat_result is None
+                or scope["method"].upper() != "GET"
+                or "range" in starlette.datastructures.Headers(scope=scope)
+            ):
+                return await super().__call__(scope, receive, send)
+
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            await send(
+                {
+                    "type": "http.response.pathsend",
+                    "path": os.path.abspath(self.path),
+                }
+            )
+            if self.background is not None:
+                await self.background()
+
+    def _precompressed_file(
+        full_path: str | os.PathLike[str], stat_result: os.stat_result, scope: Scope
+    ) -> tuple[str, str, os.stat_result] | None:
+        # Find a precompressed sibling of `full_path` that the client accepts, and that
+        # isn't older than the file itself
+        accept_encoding = starlette.datastructures.Headers(scope=scope).get(
+            "accept-encoding", ""
+        )
+        accepted = {
+            enc.split(";")[0].strip().lower() for enc in accept_encoding.split(",")
+        }
+        for encoding, ext in _PRECOMPRESSED_EXTENSIONS:
+            if encoding not in accepted:
+                continue
+            encoded_path = os.fspath(full_path) + ext
+            try:
+                encoded_stat = os.stat(encoded_path)
+            except OSError:
+                continue
+            if encoded_stat.st_mtime >= stat_result.st_mtime:
+                return encoding, encoded_path, encoded_stat
+        return None
+
 else:
     # Running in wasm mode; must use our own simple StaticFiles
 
@@ -69,8 +184,18 @@ else:
         dir: pathlib.Path
         root_path: str
 
-        def __init__(self, *, directory: str | os.PathLike[str]):
+        def __init__(
+            self,
+            *,
+            directory: str | os.PathLike[str],
+            precompressed: bool = False,
+            immutable: bool = False,
+        ):
             self.dir = pathlib.Path(os.path.realpath(os.path.normpath(directory)))
+            # Files are read from the in-browser filesystem, so there's no point in
+            # serving precompressed files.
+            self.precompressed = precompressed
+            self.immutable = immutable
 
         async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
             if scope["type"] != "http":
@@ -103,7 +228,14 @@ else:
                     # We could redirect with an added "/" if we wanted
                     return await Error404()(scope, receive, send)
             else:
-                return await FileResponse(final_path)(scope, receive, send)
+                headers = (
+                    {"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+                    if self.immutable
+                    else None
+                )
+                return await FileResponse(final_path, headers=headers)(
+                    scope, receive, send
+                )
 
     def _traverse_url_path(
         dir: pathlib.Path, path_segments: list[str]
@@ -202,3 +334,92 @@ else:
                 )
             ]
         return header_list
+
+
+# Files with these extensions are worth compressing
+_COMPRESSIBLE_EXTENSIONS = {
+    ".css",
+    ".csv",
+    ".html",
+    ".js",
+    ".json",
+    ".map",
+    ".mjs",
+    ".svg",
+    ".ttf",
+    ".txt",
+    ".wasm",
+    ".xml",
+}
+
+
+def precompress_directory(
+    directory: str | Path,
+    *,
+    min_size: int = 1024,
+) -> int:
+    """
+    Write compressed copies of the files in a directory, for serving with
+    `StaticFiles(precompressed=True)`.
+
+    For each text-like file (JavaScript, CSS, HTML, JSON, SVG, etc.) in `directory` and
+    its subdirectories, a gzip-compressed `.gz` sibling is written, as well as a
+    brotli-compressed `.br` sibling if the `brotli` package is installed. Siblings that
+    are newer than their file are left alone, so this is cheap to run repeatedly.
+
+    Parameters
+    ----------
+    directory
+        The directory to compress files in.
+    min_size
+        Files smaller than this many bytes aren't compressed.
+
+    Returns
+    -------
+    :
+        The number of compressed files written.
+    """
+    try:
+        import brotli  # pyright: ignore[reportMissingImports]
+    except ImportError:
+        brotli = None
+
+    n_written = 0
+    for path in Path(directory).rglob("*"):
+        if path.suffix not in _COMPRESSIBLE_EXTENSIONS or not path.is_file():
+            continue
+        stat_result = path.stat()
+        if stat_result.st_size < min_size:
+            continue
+
+        data: bytes | None = None
+        for ext in (".gz", ".br"):
+            if ext == ".br" and brotli is None:
+                continue
+            target = path.with_name(path.name + ext)
+            if target.exists() and target.stat().st_mtime >= stat_result.st_mtime:
+                continue
+
+            if data is None:
+                data = path.read_bytes()
+            if ext == ".gz":
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            else:
+                compressed = brotli.compress(data)  # pyright: ignore
+            # Not worth serving if it isn't meaningfully smaller
+            if len(compressed) > len(data) * 0.9:
+                continue
+
+            # Write to a temporary file and rename, so that a concurrent request never
+            # sees a partially written file
+            tmp = target.with_name(target.name + ".tmp")
+            try:
+                tmp.write_bytes(compressed)
+                tmp.replace(target)
+            except OSError:
+                # E.g., the directory isn't writable; the file is then served as-is
+                tmp.unlink(missing_ok=True)
+                continue
+            n_written += 1
+
+    return n_written
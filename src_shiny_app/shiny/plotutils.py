@@ -2,18 +2,31 @@
 
 from __future__ import annotations
 
-__all__ = ("brushed_points", "near_points")
+__all__ = (
+    "brushed_points",
+    "near_points",
+    "brushed_points_index",
+    "near_points_index",
+)
 
 
-from typing import TYPE_CHECKING, Literal, Optional, Union, cast
+import math
+import weakref
+from typing import TYPE_CHECKING, Any, Literal, Optional, Tuple, Union, cast
 
 from ._typing_extensions import TypedDict
 from .types import BrushInfo, CoordInfo, CoordXY
 
 if TYPE_CHECKING:
+    import numpy as np
     import numpy.typing as npt
     import pandas as pd
 
+    IntoDataFrame = Any
+    IndexArray = npt.NDArray[np.intp]
+    FloatArray = npt.NDArray[np.float64]
+    BoolArray = npt.NDArray[np.bool_]
+
 DataFrameColumn = Union[
     "pd.Series[int]",
     "pd.Series[float]",
@@ -29,7 +42,7 @@ class SeriesFloatXY(TypedDict):
 
 
 def brushed_points(
-    df: pd.DataFrame,
+    df: IntoDataFrame,
     brush: BrushInfo | None,
     xvar: Optional[str] = None,
     yvar: Optional[str] = None,
@@ -37,7 +50,8 @@ def brushed_points(
     panelvar2: Optional[str] = None,
     *,
     all_rows: bool = False,
-) -> pd.DataFrame:
+    spatial_index: bool = False,
+) -> IntoDataFrame:
     """Find rows of data selected on an interactive plot.
 
     This function is used with interactive plots. It returns the rows of a data frame
@@ -50,7 +64,9 @@ def brushed_points(
     Parameters
     ----------
     df
-        A pandas DataFrame from which to select rows.
+        A pandas, polars, or other eager
+        [`narwhals`](https://narwhals-dev.github.io/narwhals/) compatible DataFrame from
+        which to select rows.
     brush
         The data from a brush, like `input.myplot_brush()`.
     xvar
@@ -70,42 +86,106 @@ def brushed_points(
         selected. If `True`, then all rows from the data frame will be returned, along
         with an additional column named `selected_`, which indicates whether or not each
         row was selected.
+    spatial_index
+        If `True`, look up the brushed points with a spatial index of the `xvar`/`yvar`
+        values. See :func:`~shiny.plotutils.brushed_points_index` for details.
 
     Returns
     -------
     :
-        A pandas DataFrame containing the rows selected by the brush. If `all_rows` is
-        `True`, then all rows from the original data will be returned, along with an
-        additional column named `selected_`, which indicates whether or not each row was
-        selected.
+        A data frame (of the same type as `df`) containing the rows selected by the
+        brush. If `all_rows` is `True`, then all rows from the original data will be
+        returned, along with an additional column named `selected_`, which indicates
+        whether or not each row was selected.
+
+    See Also
+    --------
+    * :func:`~shiny.plotutils.brushed_points_index` to retrieve the selected row
+      positions without subsetting `df`.
     """
-    import pandas as pd
+    import numpy as np
 
-    new_df = df.copy()
+    keep_idx = brushed_points_index(
+        df,
+        brush,
+        xvar,
+        yvar,
+        panelvar1,
+        panelvar2,
+        spatial_index=spatial_index,
+    )
 
-    if brush is None:
-        if all_rows:
-            new_df["selected_"] = False
-        else:
-            new_df = new_df.loc[[]]
+    if all_rows:
+        selected = np.zeros(_frame_len(df), dtype=bool)
+        selected[keep_idx] = True
+        return _with_columns(df, {"selected_": selected})
 
-        return new_df
+    return _take_rows(df, keep_idx)
+
+
+def brushed_points_index(
+    df: IntoDataFrame,
+    brush: BrushInfo | None,
+    xvar: Optional[str] = None,
+    yvar: Optional[str] = None,
+    panelvar1: Optional[str] = None,
+    panelvar2: Optional[str] = None,
+    *,
+    spatial_index: bool = False,
+) -> IndexArray:
+    """Find the row positions of data selected by a brush on an interactive plot.
+
+    This is the same as :func:`~shiny.plotutils.brushed_points`, but returns the
+    (ascending) row positions of the selected rows instead of a data frame. The data
+    frame is never copied.
+
+    Parameters
+    ----------
+    df
+        A pandas, polars, or other eager
+        [`narwhals`](https://narwhals-dev.github.io/narwhals/) compatible DataFrame.
+    brush
+        The data from a brush, like `input.myplot_brush()`.
+    xvar
+        The name of the column in `df` that contains the x values.
+    yvar
+        The name of the column in `df` that contains the y values.
+    panelvar1
+        The name of the column in `df` that contains the first variable used for
+        subpanels (if subpanels are used).
+    panelvar2
+        The name of the column in `df` that contains the second variable used for
+        subpanels.
+    spatial_index
+        If `True` and the brush selects over both x and y, candidate points are looked
+        up in a grid index of the `xvar`/`yvar` values rather than comparing every row.
+        The index is built on first use and cached for as long as `df` is alive, so it
+        is only worthwhile when the same (unmodified) data frame is brushed repeatedly.
+        Modifying `df` in place without changing its length is **not** detected.
+
+    Returns
+    -------
+    :
+        A numpy array of the row positions (not the pandas index values) selected by
+        the brush.
+    """
+    import numpy as np
+
+    if brush is None:
+        return np.array([], dtype=np.intp)
 
     if "xmin" not in brush:
         raise ValueError(
             "brushed_points requires a brush object with xmin, xmax, ymin, and ymax."
         )
 
+    columns = _frame_columns(df)
+
     # Which direction(s) the brush is selecting over. Direction can be 'x', 'y',
     # or 'xy'.
     use_x = "x" in brush["direction"]
     use_y = "y" in brush["direction"]
 
-    # Filter out x and y values
-    keep_rows: pd.Series[bool] = pd.Series(
-        True,
-        index=new_df.index,  # pyright: ignore[reportUnknownMemberType]
-    )
     if use_x:
         if xvar is None and "x" in brush["mapping"]:
             xvar = brush["mapping"]["x"]
@@ -113,9 +193,8 @@ def brushed_points(
             raise ValueError(
                 "brushed_points: not able to automatically infer `xvar` from brush. You must supply `xvar` to brushed_points()"
             )
-        if xvar not in new_df:
+        if xvar not in columns:
             raise ValueError(f"brushed_points: `xvar` ({xvar}) not in dataframe")
-        keep_rows &= within_brush(new_df[xvar], brush, "x")
 
     if use_y:
         if yvar is None and "y" in brush["mapping"]:
@@ -124,38 +203,52 @@ def brushed_points(
             raise ValueError(
                 "brushed_points: not able to automatically infer `yvar` from brush. You must supply `yvar` to brushed_points()"
             )
-        if yvar not in new_df:
+        if yvar not in columns:
             raise ValueError(f"brushed_points: `yvar` ({yvar}) not in dataframe")
-        keep_rows &= within_brush(new_df[yvar], brush, "y")
+
+    # Candidate row positions. `None` represents all rows
+    candidates: IndexArray | None = None
+    if spatial_index and use_x and use_y:
+        assert xvar is not None and yvar is not None
+        grid = _get_point_grid(df, xvar, yvar)
+        candidates = grid.query(brush["xmin"], brush["xmax"], brush["ymin"], brush["ymax"])
+
+    # Filter out x and y values
+    keep_rows: BoolArray = np.ones(
+        _frame_len(df) if candidates is None else len(candidates), dtype=bool
+    )
+    if use_x:
+        assert xvar is not None
+        keep_rows &= within_brush(_float_values(df, xvar, candidates), brush, "x")
+    if use_y:
+        assert yvar is not None
+        keep_rows &= within_brush(_float_values(df, yvar, candidates), brush, "y")
 
     # Find which rows are matches for the panel vars (if present)
     if panelvar1 is None and "panelvar1" in brush["mapping"]:
         panelvar1 = brush["mapping"]["panelvar1"]
-        if panelvar1 not in new_df:
+        if panelvar1 not in columns:
             raise ValueError(
                 f"brushed_points: `panelvar1` ({panelvar1}) not in dataframe"
             )
-        keep_rows &= new_df[panelvar1] == brush["panelvar1"]  # pyright: ignore
+        keep_rows &= _equal_values(df, panelvar1, brush["panelvar1"], candidates)
 
     if panelvar2 is None and "panelvar2" in brush["mapping"]:
         panelvar2 = brush["mapping"]["panelvar2"]
-        if panelvar2 not in new_df:
+        if panelvar2 not in columns:
             raise ValueError(
                 f"brushed_points: `panelvar2` ({panelvar2}) not in dataframe"
             )
-        keep_rows &= new_df[panelvar2] == brush["panelvar2"]  # pyright: ignore
-
-    if all_rows:
-        new_df["selected_"] = False
-        new_df.loc[keep_rows, "selected_"] = True
-    else:
-        new_df = new_df.loc[keep_rows]
+        keep_rows &= _equal_values(df, panelvar2, brush["panelvar2"], candidates)
 
-    return new_df
+    keep_idx: IndexArray = np.nonzero(keep_rows)[0]
+    if candidates is not None:
+        keep_idx = candidates[keep_idx]
+    return keep_idx
 
 
 def near_points(
-    df: pd.DataFrame,
+    df: IntoDataFrame,
     coordinfo: CoordInfo | None,
     xvar: Optional[str] = None,
     yvar: Optional[str] = None,
@@ -166,7 +259,8 @@ def near_points(
     max_points: Optional[int] = None,
     add_dist: bool = False,
     all_rows: bool = False,
-) -> pd.DataFrame:
+    spatial_index: bool = False,
+) -> IntoDataFrame:
     """Find rows of data selected on an interactive plot.
 
     This function is used with interactive plots. It returns the rows of a data frame
@@ -179,7 +273,9 @@ def near_points(
     Parameters
     ----------
     df
-        A pandas DataFrame from which to select rows.
+        A pandas, polars, or other eager
+        [`narwhals`](https://narwhals-dev.github.io/narwhals/) compatible DataFrame from
+        which to select rows.
     coordinfo
         The data from a click/dblclick/hover event, like `input.myplot_click()`.
     xvar
@@ -209,31 +305,173 @@ def near_points(
         selected. If `True`, then all rows from the data frame will be returned, along
         with an additional column named `selected_`, which indicates whether or not each
         row was selected.
+    spatial_index
+        If `True`, look up the nearby points with a spatial index of the `xvar`/`yvar`
+        values. See :func:`~shiny.plotutils.near_points_index` for details. (Ignored
+        when `add_dist=True`, as distances are computed for every row.)
 
     Returns
     -------
     :
-        A pandas DataFrame containing the rows selected by the brush. If `all_rows` is
-        `True`, then all rows from the original data will be returned, along with an
-        additional column named `selected_`, which indicates whether or not each row was
-        selected.
+        A data frame (of the same type as `df`) containing the rows selected by the
+        brush. If `all_rows` is `True`, then all rows from the original data will be
+        returned, along with an additional column named `selected_`, which indicates
+        whether or not each row was selected.
+
+    See Also
+    --------
+    * :func:`~shiny.plotutils.near_points_index` to retrieve the selected row
+      positions without subsetting `df`.
     """
     import numpy as np
 
-    new_df = df.copy()
-
     # For no current coordinfo
     if coordinfo is None:
+        new_columns: dict[str, Any] = {}
         if add_dist:
-            new_df["dist"] = np.nan
-
+            new_columns["dist"] = np.full(_frame_len(df), np.nan)
         if all_rows:
-            new_df["selected_"] = False
-        else:
-            new_df = new_df.loc[[]]
+            new_columns["selected_"] = np.zeros(_frame_len(df), dtype=bool)
+            return _with_columns(df, new_columns)
 
+        new_df = _take_rows(df, np.array([], dtype=np.intp))
+        if add_dist:
+            new_df = _with_columns(new_df, {"dist": np.array([], dtype=float)})
         return new_df
 
+    dists: FloatArray | None = None
+    if add_dist:
+        keep_idx, dists = _near_points_index_impl(
+            df,
+            coordinfo,
+            xvar,
+            yvar,
+            panelvar1,
+            panelvar2,
+            threshold=threshold,
+            max_points=max_points,
+            spatial_index=False,
+            return_dists=True,
+        )
+    else:
+        keep_idx = near_points_index(
+            df,
+            coordinfo,
+            xvar,
+            yvar,
+            panelvar1,
+            panelvar2,
+            threshold=threshold,
+            max_points=max_points,
+            spatial_index=spatial_index,
+        )
+
+    if all_rows:
+        new_columns = {}
+        if dists is not None:
+            new_columns["dist"] = dists
+        selected = np.zeros(_frame_len(df), dtype=bool)
+        selected[keep_idx] = True
+        new_columns["selected_"] = selected
+        return _with_columns(df, new_columns)
+
+    new_df = _take_rows(df, keep_idx)
+    if dists is not None:
+        new_df = _with_columns(new_df, {"dist": dists[keep_idx]})
+    return new_df
+
+
+def near_points_index(
+    df: IntoDataFrame,
+    coordinfo: CoordInfo | None,
+    xvar: Optional[str] = None,
+    yvar: Optional[str] = None,
+    panelvar1: Optional[str] = None,
+    panelvar2: Optional[str] = None,
+    *,
+    threshold: float = 5,
+    max_points: Optional[int] = None,
+    spatial_index: bool = False,
+) -> IndexArray:
+    """Find the row positions of data near a pointer event on an interactive plot.
+
+    This is the same as :func:`~shiny.plotutils.near_points`, but returns the row
+    positions of the selected rows (ordered by distance) instead of a data frame. The
+    data frame is never copied.
+
+    Parameters
+    ----------
+    df
+        A pandas, polars, or other eager
+        [`narwhals`](https://narwhals-dev.github.io/narwhals/) compatible DataFrame.
+    coordinfo
+        The data from a click/dblclick/hover event, like `input.myplot_click()`.
+    xvar
+        The name of the column in `df` that contains the x values.
+    yvar
+        The name of the column in `df` that contains the y values.
+    panelvar1
+        The name of the column in `df` that contains the first variable used for
+        subpanels (if subpanels are used).
+    panelvar2
+        The name of the column in `df` that contains the second variable used for
+        subpanels.
+    threshold
+        A maximum distance (in pixels) to the pointer location.
+    max_points
+        Maximum number of row positions to return. If `None` (the default), will return
+        all rows within the threshold distance.
+    spatial_index
+        If `True`, only the points within `threshold` pixels of the pointer (in each
+        direction) are looked up in a grid index of the `xvar`/`yvar` values, and
+        distances are only computed for those points. The index is built on first use
+        and cached for as long as `df` is alive, which makes repeated hover/click events
+        on large data sets much cheaper. Modifying `df` in place without changing its
+        length is **not** detected.
+
+    Returns
+    -------
+    :
+        A numpy array of the row positions (not the pandas index values) near the
+        pointer, ordered by distance.
+    """
+    import numpy as np
+
+    if coordinfo is None:
+        return np.array([], dtype=np.intp)
+
+    keep_idx, _ = _near_points_index_impl(
+        df,
+        coordinfo,
+        xvar,
+        yvar,
+        panelvar1,
+        panelvar2,
+        threshold=threshold,
+        max_points=max_points,
+        spatial_index=spatial_index,
+        return_dists=False,
+    )
+    return keep_idx
+
+
+def _near_points_index_impl(
+    df: IntoDataFrame,
+    coordinfo: CoordInfo,
+    xvar: Optional[str],
+    yvar: Optional[str],
+    panelvar1: Optional[str],
+    panelvar2: Optional[str],
+    *,
+    threshold: float,
+    max_points: Optional[int],
+    spatial_index: bool,
+    return_dists: bool,
+) -> tuple[IndexArray, FloatArray | None]:
+    import numpy as np
+
+    columns = _frame_columns(df)
+
     # Try to extract vars from coordinfo object
     coordinfo_mapping = coordinfo["mapping"]
     if xvar is None and "x" in coordinfo_mapping:
@@ -242,84 +480,394 @@ def near_points(
         yvar = coordinfo_mapping["y"]
 
     if xvar is None:
-        if xvar is None and "x" in coordinfo["mapping"]:
-            xvar = coordinfo["mapping"]["x"]
         raise ValueError(
             "near_points: not able to automatically infer `xvar` from coordinfo. You must supply `xvar` to near_points()"
         )
     if yvar is None:
-        if yvar is None and "y" in coordinfo["mapping"]:
-            yvar = coordinfo["mapping"]["y"]
         raise ValueError(
             "near_points: not able to automatically infer `yvar` from coordinfo. You must supply `yvar` to near_points()"
         )
 
-    if xvar not in new_df.columns:
+    if xvar not in columns:
         raise ValueError(f"near_points: `xvar` ('{xvar}')  not in names of input.")
-    if yvar not in new_df.columns:
+    if yvar not in columns:
         raise ValueError(f"near_points: `yvar` ('{yvar}')  not in names of input.")
 
-    x: pd.Series[float] = to_float(new_df[xvar])
-    y: pd.Series[float] = to_float(new_df[yvar])
-
     # Get the coordinates of the point (in img pixel coordinates)
     point_img: CoordXY = coordinfo["coords_img"]
 
+    # Candidate row positions. `None` represents all rows
+    candidates: IndexArray | None = None
+    if spatial_index and not return_dists:
+        grid = _get_point_grid(
+            df, xvar, yvar, logx=coordinfo["log"]["x"], logy=coordinfo["log"]["y"]
+        )
+        candidates = grid.query(
+            *_near_points_domain_bounds(coordinfo, point_img, threshold, "x"),
+            *_near_points_domain_bounds(coordinfo, point_img, threshold, "y"),
+        )
+
+    x = _float_values(df, xvar, candidates)
+    y = _float_values(df, yvar, candidates)
+
     # Get coordinates of data points (in img pixel coordinates)
-    data_img: SeriesFloatXY = scale_coords(x, y, coordinfo)
+    data_img = scale_coords(x, y, coordinfo)
 
     # Get x/y distances (in css coordinates)
-    dist_css: SeriesFloatXY = {
-        "x": (data_img["x"] - point_img["x"]) / coordinfo["img_css_ratio"]["x"],
-        "y": (data_img["y"] - point_img["y"]) / coordinfo["img_css_ratio"]["y"],
-    }
+    dist_css_x = (data_img["x"] - point_img["x"]) / coordinfo["img_css_ratio"]["x"]
+    dist_css_y = (data_img["y"] - point_img["y"]) / coordinfo["img_css_ratio"]["y"]
 
     # Distances of data points to the target point, in css pixels.
-    dists: pd.Series[float] = (dist_css["x"] ** 2 + dist_css["y"] ** 2) ** 0.5
-
-    if add_dist:
-        new_df["dist"] = dists
+    dists: FloatArray = np.sqrt(dist_css_x**2 + dist_css_y**2)
 
-    keep_rows = dists <= threshold
+    keep_rows: BoolArray = dists <= threshold
 
     # Find which rows are matches for the panel vars (if present)
     if panelvar1 is None and "panelvar1" in coordinfo["mapping"]:
         panelvar1 = coordinfo["mapping"]["panelvar1"]
-        if panelvar1 not in new_df:
+        if panelvar1 not in columns:
             raise ValueError(f"near_points: `panelvar1` ({panelvar1}) not in dataframe")
-        keep_rows &= new_df[panelvar1] == coordinfo["panelvar1"]  # pyright: ignore
+        keep_rows &= _equal_values(df, panelvar1, coordinfo["panelvar1"], candidates)
 
     if panelvar2 is None and "panelvar2" in coordinfo["mapping"]:
         panelvar2 = coordinfo["mapping"]["panelvar2"]
-        if panelvar2 not in new_df:
+        if panelvar2 not in columns:
             raise ValueError(f"near_points: `panelvar2` ({panelvar2}) not in dataframe")
-        keep_rows &= new_df[panelvar2] == coordinfo["panelvar2"]  # pyright: ignore
+        keep_rows &= _equal_values(df, panelvar2, coordinfo["panelvar2"], candidates)
 
     # Track the row indices to keep (note this is the row position, 0, 1, 2, not the
     # pandas index column, which can have arbitrary values).
-    keep_idx = np.where(keep_rows)[0]
+    keep_idx: IndexArray = np.nonzero(keep_rows)[0]
 
     # Order by distance
-    dists = dists.iloc[keep_idx]
-    keep_idx: npt.NDArray[np.intp] = keep_idx[dists.argsort()]
+    keep_idx = keep_idx[np.argsort(dists[keep_idx], kind="stable")]
 
     # Keep max number of rows
     if max_points is not None and len(keep_idx) > max_points:
         keep_idx = keep_idx[:max_points]
 
-    if all_rows:
-        # Add selected_ column if needed
-        new_df["selected_"] = False
-        new_df.iloc[  # pyright: ignore[reportArgumentType]
-            keep_idx,
-            new_df.columns.get_loc(  # pyright: ignore[reportUnknownMemberType]
-                "selected_"
-            ),
-        ] = True
+    if candidates is not None:
+        keep_idx = candidates[keep_idx]
+
+    return keep_idx, (dists if return_dists else None)
+
+
+def _near_points_domain_bounds(
+    coordinfo: CoordInfo,
+    point_img: CoordXY,
+    threshold: float,
+    var: Literal["x", "y"],
+) -> tuple[float, float]:
+    """
+    Convert the `threshold` pixel box around the pointer to (possibly log scaled)
+    domain values.
+
+    Data values outside of the domain are clipped to the edge of the range when
+    scaled. So if the box reaches the edge of the range, it is extended to infinity in
+    that direction to include all clipped points.
+    """
+    if var == "x":
+        domain_min, domain_max = coordinfo["domain"]["left"], coordinfo["domain"]["right"]
+        range_min, range_max = coordinfo["range"]["left"], coordinfo["range"]["right"]
     else:
-        new_df = new_df.iloc[keep_idx]
+        domain_min, domain_max = coordinfo["domain"]["bottom"], coordinfo["domain"]["top"]
+        range_min, range_max = coordinfo["range"]["bottom"], coordinfo["range"]["top"]
+
+    radius = threshold * coordinfo["img_css_ratio"][var]
+    img_lo = point_img[var] - radius
+    img_hi = point_img[var] + radius
+
+    factor = (domain_max - domain_min) / (range_max - range_min)
+    vals = [domain_min + (img_lo - range_min) * factor]
+    vals.append(domain_min + (img_hi - range_min) * factor)
+    lo, hi = min(vals), max(vals)
+
+    # Extend the box in the domain direction(s) that reach the edge of the range
+    img_range_lo, img_range_hi = min(range_min, range_max), max(range_min, range_max)
+    domain_at_range_lo = domain_min if range_min <= range_max else domain_max
+    if img_lo <= img_range_lo:
+        if domain_at_range_lo == min(domain_min, domain_max):
+            lo = -math.inf
+        else:
+            hi = math.inf
+    if img_hi >= img_range_hi:
+        if domain_at_range_lo == min(domain_min, domain_max):
+            hi = math.inf
+        else:
+            lo = -math.inf
 
-    return new_df
+    return lo, hi
+
+
+# ===============================================================================
+# Data frame helpers
+# ===============================================================================
+# These helpers work with pandas data frames directly (to retain the exact pandas
+# behaviors, e.g. index values) and with all other data frames through narwhals.
+def _is_pandas(df: IntoDataFrame) -> bool:
+    from narwhals.dependencies import is_pandas_dataframe
+
+    return is_pandas_dataframe(df)
+
+
+def _as_nw(df: IntoDataFrame) -> Any:
+    import narwhals.stable.v1 as nw
+
+    return nw.from_native(df, eager_only=True)
+
+
+def _frame_columns(df: IntoDataFrame) -> list[Any]:
+    if _is_pandas(df):
+        return list(df.columns)
+    return _as_nw(df).columns
+
+
+def _frame_len(df: IntoDataFrame) -> int:
+    if _is_pandas(df):
+        return len(df)
+    return len(_as_nw(df))
+
+
+def _take_rows(df: IntoDataFrame, idx: IndexArray) -> IntoDataFrame:
+    import narwhals.stable.v1 as nw
+
+    if _is_pandas(df):
+        return df.iloc[idx]
+    return nw.to_native(_as_nw(df)[idx.tolist()])
+
+
+def _with_columns(df: IntoDataFrame, columns: dict[str, Any]) -> IntoDataFrame:
+    import narwhals.stable.v1 as nw
+
+    if _is_pandas(df):
+        # `.assign()` returns a new data frame; The original is not modified
+        return df.assign(**columns)
+
+    nw_df = _as_nw(df)
+    native_namespace = nw.get_native_namespace(nw_df)
+    return nw.to_native(
+        nw_df.with_columns(
+            *[
+                nw.new_series(name, values, native_namespace=native_namespace)
+                for name, values in columns.items()
+            ]
+        )
+    )
+
+
+def _float_values(
+    df: IntoDataFrame,
+    col_name: str,
+    rows: IndexArray | None = None,
+) -> FloatArray:
+    """
+    Retrieve a column as a numpy float array (optionally only at row positions `rows`).
+
+    The whole column is converted before subsetting so that string and categorical
+    codes are consistent with the complete column.
+    """
+    import numpy as np
+
+    if _is_pandas(df):
+        vals = np.asarray(to_float(df[col_name]), dtype=float)
+    else:
+        vals = _nw_series_to_float(_as_nw(df)[col_name])
+
+    if rows is not None:
+        vals = vals[rows]
+    return vals
+
+
+def _nw_series_to_float(ser: Any) -> FloatArray:
+    import narwhals.stable.v1 as nw
+    import numpy as np
+
+    dtype = ser.dtype
+    if dtype.is_numeric():
+        return np.asarray(ser.to_numpy(), dtype=float)
+    if isinstance(dtype, (nw.Categorical, nw.Enum)):
+        categories = ser.cat.get_categories().to_list()
+        codes = {category: i + 1 for i, category in enumerate(categories)}
+        return np.array([codes.get(val, np.nan) for val in ser.to_list()], dtype=float)
+    if isinstance(dtype, nw.String):
+        vals = ser.to_numpy()
+        is_null = ser.is_null().to_numpy()
+        ret = np.full(len(vals), np.nan)
+        if not is_null.all():
+            ret[~is_null] = np.unique(vals[~is_null], return_inverse=True)[1] + 1
+        return ret
+    if isinstance(dtype, nw.Datetime):
+        # Convert to matplotlib datetimes, which are in days since epoch
+        vals = ser.to_numpy().astype("datetime64[ns]").astype("int64")
+        return vals / (24 * 60 * 60) / 1e9
+
+    raise ValueError("to_float: unsupported dtype for x")
+
+
+def _equal_values(
+    df: IntoDataFrame,
+    col_name: str,
+    value: Any,
+    rows: IndexArray | None = None,
+) -> BoolArray:
+    import numpy as np
+
+    if _is_pandas(df):
+        col = df[col_name]
+        if rows is not None:
+            col = col.iloc[rows]
+        return np.asarray(col == value, dtype=bool)
+
+    ser = _as_nw(df)[col_name]
+    if rows is not None:
+        ser = ser[rows.tolist()]
+    return np.asarray((ser == value).to_numpy(), dtype=bool)
+
+
+# ===============================================================================
+# Spatial index
+# ===============================================================================
+class _PointGrid:
+    """
+    A uniform grid of (finite) points, used to find the points within a box without
+    comparing every point.
+
+    Points are sorted by their cell number (`cell_x * ny + cell_y`), so the points of
+    one grid column between two rows are stored contiguously.
+    """
+
+    def __init__(self, x: FloatArray, y: FloatArray):
+        import numpy as np
+
+        finite_idx: IndexArray = np.nonzero(np.isfinite(x) & np.isfinite(y))[0]
+        x = x[finite_idx]
+        y = y[finite_idx]
+
+        n = len(finite_idx)
+        # Aim for a handful of points per cell
+        self.nx = self.ny = max(1, int(math.sqrt(n / 4)))
+
+        self.xmin = float(x.min()) if n > 0 else 0.0
+        self.ymin = float(y.min()) if n > 0 else 0.0
+        xmax = float(x.max()) if n > 0 else 0.0
+        ymax = float(y.max()) if n > 0 else 0.0
+        self.cell_w = ((xmax - self.xmin) / self.nx) or 1.0
+        self.cell_h = ((ymax - self.ymin) / self.ny) or 1.0
+
+        cells = self._cell_x(x) * self.ny + self._cell_y(y)
+        order = np.argsort(cells, kind="stable")
+        self.sorted_idx: IndexArray = finite_idx[order]
+        self.starts: IndexArray = np.searchsorted(
+            cells[order], np.arange(self.nx * self.ny + 1)
+        )
+
+    def _cell_x(self, x: Any) -> Any:
+        import numpy as np
+
+        cell = np.floor((x - self.xmin) / self.cell_w)
+        return np.clip(cell, 0, self.nx - 1).astype(np.intp)
+
+    def _cell_y(self, y: Any) -> Any:
+        import numpy as np
+
+        cell = np.floor((y - self.ymin) / self.cell_h)
+        return np.clip(cell, 0, self.ny - 1).astype(np.intp)
+
+    def query(self, xmin: float, xmax: float, ymin: float, ymax: float) -> IndexArray:
+        """
+        Return the (ascending) row positions of the points in the cells that overlap
+        the box. This is a superset of the points within the box.
+        """
+        import numpy as np
+
+        x_lo, x_hi, y_lo, y_hi = (
+            self._cell_bound(xmin, self.xmin, self.cell_w, self.nx),
+            self._cell_bound(xmax, self.xmin, self.cell_w, self.nx),
+            self._cell_bound(ymin, self.ymin, self.cell_h, self.ny),
+            self._cell_bound(ymax, self.ymin, self.cell_h, self.ny),
+        )
+        slices = [
+            self.sorted_idx[
+                self.starts[cell_x * self.ny + y_lo] : self.starts[
+                    cell_x * self.ny + y_hi + 1
+                ]
+            ]
+            for cell_x in range(x_lo, x_hi + 1)
+        ]
+        if len(slices) == 0:
+            return np.array([], dtype=np.intp)
+        return np.sort(np.concatenate(slices))
+
+    @staticmethod
+    def _cell_bound(val: float, val_min: float, size: float, n: int) -> int:
+        # Same as _cell_x()/_cell_y(), so that a point on a cell edge is looked up
+        # in the cell it's stored in (`1.0 // 0.2` is 4.0, but `1.0 / 0.2` is 5.0).
+        # Clamp before flooring to support infinite values
+        cell = (val - val_min) / size
+        if cell <= 0:
+            return 0
+        if cell >= n - 1:
+            return n - 1
+        return math.floor(cell)
+
+
+_point_grid_cache: dict[
+    int,
+    tuple[
+        weakref.ref[Any],
+        dict[Tuple[str, str, Optional[float], Optional[float], int], _PointGrid],
+    ],
+] = {}
+
+
+def _get_point_grid(
+    df: IntoDataFrame,
+    xvar: str,
+    yvar: str,
+    *,
+    logx: Optional[float] = None,
+    logy: Optional[float] = None,
+) -> _PointGrid:
+    """
+    Retrieve the (cached) grid index for the `xvar`/`yvar` values of `df`.
+
+    Grids are cached on the identity of `df` (held weakly) and removed once `df` is
+    garbage collected.
+    """
+    import numpy as np
+
+    df_id = id(df)
+    entry = _point_grid_cache.get(df_id)
+    if entry is None or entry[0]() is not df:
+
+        def on_collect(ref: weakref.ref[Any]) -> None:
+            cur_entry = _point_grid_cache.get(df_id)
+            if cur_entry is not None and cur_entry[0] is ref:
+                del _point_grid_cache[df_id]
+
+        try:
+            entry = (weakref.ref(df, on_collect), {})
+            _point_grid_cache[df_id] = entry
+        except TypeError:
+            # Object can not be weakly referenced; Do not cache
+            entry = None
+
+    key = (xvar, yvar, logx, logy, _frame_len(df))
+    if entry is not None and key in entry[1]:
+        return entry[1][key]
+
+    x = _float_values(df, xvar)
+    y = _float_values(df, yvar)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if logx is not None:
+            x = np.log(x) / np.log(logx)
+        if logy is not None:
+            y = np.log(y) / np.log(logy)
+    grid = _PointGrid(x, y)
+
+    if entry is not None:
+        entry[1][key] = grid
+    return grid
 
 
 # ===============================================================================
@@ -275,6 +275,9 @@ class Calc_(Generic[T]):
             # could be None if outside of a session).
             session = get_current_session()
         self._session = session
+        if session is not None:
+            # Let the session account for (and, if idle, drop) this calc's cached value
+            session._register_calc(self)
 
         # Use lists to hold (optional) value and error, instead of Optional[T],
         # because it makes typing more straightforward. For example if
@@ -329,6 +332,21 @@ class Calc_(Generic[T]):
         self._dependents.invalidate()
         self._ctx = None  # Allow context to be GC'd
 
+    def _drop_cached_value(self) -> bool:
+        """
+        Drop the cached value (to free memory) without invalidating dependents. The
+        value is recalculated the next time it is read.
+
+        Returns `True` if a cached value was dropped.
+        """
+        if self._invalidated or self._running or not self._value:
+            return False
+        # The current context stays registered with this calc's dependencies, so a
+        # later change to them still invalidates this calc's dependents.
+        self._invalidated = True
+        self._value.clear()
+        return True
+
     async def _run_func(self) -> None:
         self._error.clear()
         try:
@@ -35,11 +35,14 @@ from ._data_frame_utils._selection import (
 from ._data_frame_utils._styles import as_browser_style_infos
 from ._data_frame_utils._tbl_data import (
     apply_frame_patches,
-    as_data_frame,
+    as_nw_frame,
     assert_data_is_not_none,
     data_frame_to_native,
+    frame_column_names,
+    frame_nrow,
     serialize_frame,
     subset_frame,
+    subset_lazy_frame,
 )
 from ._data_frame_utils._types import (
     CellPatchProcessed,
@@ -48,6 +51,7 @@ from ._data_frame_utils._types import (
     DataFrame,
     FrameRender,
     IntoDataFrameT,
+    LazyFrame,
     cell_patch_processed_to_jsonifiable,
     frame_render_to_jsonifiable,
 )
@@ -82,6 +86,9 @@ class data_frame(
            [`narwhals`](https://narwhals-dev.github.io/narwhals/) compatible `DataFrame`
            object. This object will be internally upgraded to a default
            `shiny.render.DataGrid(df)`.
+        3. A polars `LazyFrame` or dask `DataFrame` (or any lazy
+           [`narwhals`](https://narwhals-dev.github.io/narwhals/) compatible frame). See
+           the _Lazy frames_ section below.
 
     Row selection
     -------------
@@ -151,6 +158,15 @@ class data_frame(
     place, it **will modify** the underlying data object and possibly alter other data
     objects.
 
+    Lazy frames
+    -----------
+    The render function may also return a lazy frame (e.g. a polars `LazyFrame` or a
+    dask `DataFrame`). The frame is collected once to send its rows to the browser, but
+    all data methods keep the frame lazy and return the same lazy type. Cell patches,
+    the browser's row filtering and selection, and the browser's column sorting are
+    added to the query plan of `.data_patched()` and `.data_view()`. Only the rows you
+    `.collect()` (or `.compute()`) from these frames are materialized.
+
     Narwhals
     -------------------
 
@@ -242,24 +258,47 @@ class data_frame(
         return self._req_value().data
 
     @reactive_calc_method
-    def _nw_data(self) -> DataFrame[IntoDataFrameT]:
+    def _nw_data(self) -> DataFrame[IntoDataFrameT] | LazyFrame[IntoDataFrameT]:
         """
         Reactive calculation of the data frame's data wrapped by narwhals.
 
         This is a quick reference to the original data frame that was returned from the
         app's render function. If it is mutated in place, it **will** modify the original
-        data.
+        data. Lazy frames are wrapped as narwhals `LazyFrame` objects.
 
         Returns
         -------
         :
-            Narwhals data frame object wrapping the original data.
+            Narwhals data frame (or lazy frame) object wrapping the original data.
+        """
+        return cast(
+            "DataFrame[IntoDataFrameT] | LazyFrame[IntoDataFrameT]",
+            as_nw_frame(self.data()),
+        )
+
+    @reactive_calc_method
+    def _nw_data_column_names(self) -> list[str]:
+        """
+        Reactive calculation of the column names of the data.
+
+        For lazy frames, finding the column names requires resolving the schema, so
+        this is done once per data value.
+        """
+        return frame_column_names(self._nw_data())
+
+    @reactive_calc_method
+    def _nw_data_shape(self) -> tuple[int, int]:
         """
-        return as_data_frame(self.data())
+        Reactive calculation of the `(nrow, ncol)` shape of the data.
+
+        For lazy frames, the rows are counted once per data value. (Cell patches don't
+        change the shape.)
+        """
+        return (frame_nrow(self._nw_data()), len(self._nw_data_column_names()))
 
     def _nw_data_to_original_type(
         self,
-        nw_data: DataFrame[IntoDataFrameT],
+        nw_data: DataFrame[IntoDataFrameT] | LazyFrame[IntoDataFrameT],
     ) -> IntoDataFrameT:
         """
         Convert the narwhals data frame back to the original data type.
@@ -279,7 +318,7 @@ class data_frame(
             The original data frame type. Ex: pandas, polars, or narwhals
         """
 
-        if isinstance(self.data(), DataFrame):
+        if isinstance(self.data(), (DataFrame, LazyFrame)):
             # At this point, `IntoDataFrameT` represents `DataFrame[IntoDataFrameT]`
             return cast(IntoDataFrameT, nw_data)
 
@@ -330,7 +369,9 @@ class data_frame(
         return list(self._cell_patch_map().values())
 
     @reactive_calc_method
-    def _nw_data_patched(self) -> DataFrame[IntoDataFrameT]:
+    def _nw_data_patched(
+        self,
+    ) -> DataFrame[IntoDataFrameT] | LazyFrame[IntoDataFrameT]:
         """
         Reactive calculation of the data frame's patched data.
 
@@ -398,7 +439,11 @@ class data_frame(
         else:
             rows = self.data_view_rows()
 
-        nw_data = subset_frame(self._nw_data_patched(), rows=rows)
+        nw_data = self._nw_data_patched()
+        if isinstance(nw_data, LazyFrame):
+            nw_data = subset_lazy_frame(nw_data, rows=rows, sort=self.sort())
+        else:
+            nw_data = subset_frame(nw_data, rows=rows)
 
         patched_subsetted_into_data = self._nw_data_to_original_type(nw_data)
 
@@ -504,9 +549,9 @@ class data_frame(
         cell_selection = as_cell_selection(
             browser_cell_selection,
             selection_modes=self.selection_modes(),
-            nw_data=self._nw_data(),
+            data_shape=self._nw_data_shape(),
             data_view_rows=self.data_view_rows(),
-            data_view_cols=tuple(range(self._nw_data().shape[1])),
+            data_view_cols=tuple(range(self._nw_data_shape()[1])),
         )
 
         return cell_selection
@@ -827,7 +872,12 @@ class data_frame(
             return
 
         patched_into_data = self._nw_data_to_original_type(self._nw_data_patched())
-        new_styles = as_browser_style_infos(styles_fn, into_data=patched_into_data)
+        new_styles = as_browser_style_infos(
+            styles_fn,
+            into_data=patched_into_data,
+            column_names=self._nw_data_column_names(),
+            nrow=self._nw_data_shape()[0],
+        )
 
         await self._send_message_to_browser(
             "updateStyles",
@@ -860,10 +910,10 @@ class data_frame(
         # Convert column name to index if necessary
         if isinstance(col, str):
             with reactive.isolate():
-                column_names = self._nw_data().columns
+                column_names = self._nw_data_column_names()
                 if col not in column_names:
                     raise ValueError(f"Column '{col}' not found in data frame.")
-                column_index = self._nw_data().columns.index(col)
+                column_index = column_names.index(col)
         else:
             column_index = col
             if (not isinstance(col, int)) or isinstance(col, bool):
@@ -874,7 +924,8 @@ class data_frame(
                 raise ValueError(
                     f"Expected `col` to be greater than or equal to 0, received {column_index}"
                 )
-            column_length = self._nw_data().shape[1]
+            with reactive.isolate():
+                column_length = len(self._nw_data_column_names())
             if column_index >= column_length:
                 raise ValueError(
                     f"Expected `col` to be less than {column_length}, received {column_index}"
@@ -921,10 +972,29 @@ class data_frame(
         """
         assert_data_is_not_none(data)
 
+        # Reuse the rendered value's declared type hints for the columns that remain
+        with reactive.isolate():
+            value = self._value()
+        type_hints = None
+        type_hints_sample = None
+        if isinstance(value, (DataGrid, DataTable)):
+            type_hints_sample = value.type_hints_sample
+            if value.type_hints:
+                columns = frame_column_names(as_nw_frame(data))
+                type_hints = {
+                    col_name: type_hint
+                    for col_name, type_hint in value.type_hints.items()
+                    if col_name in columns
+                }
+
         # Serialize the data within the session context,
         # similar to `.to_payload()` on the `._value()`
         with session_context(self._get_session()):
-            info = serialize_frame(data)
+            info = serialize_frame(
+                data,
+                type_hints=type_hints,
+                type_hints_sample=type_hints_sample,
+            )
 
         # Reset patches & set new data
         # Perform only after serializing the frame
@@ -1052,9 +1122,9 @@ class data_frame(
         """
         with reactive.isolate():
             selection_modes = self.selection_modes()
-            nw_data = self._nw_data()
+            data_shape = self._nw_data_shape()
             data_view_rows = self.data_view_rows()
-            data_view_cols = tuple(range(nw_data.shape[1]))
+            data_view_cols = tuple(range(data_shape[1]))
 
         if selection_modes._is_none():
             warnings.warn(
@@ -1070,7 +1140,7 @@ class data_frame(
         cell_selection = as_cell_selection(
             selection,
             selection_modes=selection_modes,
-            nw_data=nw_data,
+            data_shape=data_shape,
             data_view_rows=data_view_rows,
             data_view_cols=data_view_cols,
         )
@@ -1129,12 +1199,13 @@ class data_frame(
         if len(sort) > 0:
             with reactive.isolate():
                 nw_data = self._nw_data()
-            ncol = nw_data.shape[1]
+                column_names = self._nw_data_column_names()
+            ncol = len(column_names)
 
             for val in sort:
                 val_dict: ColumnSort
                 if isinstance(val, int):
-                    desc = nw_data[:, val].dtype.is_numeric()
+                    desc = nw_data.collect_schema()[column_names[val]].is_numeric()
                     val_dict = {"col": val, "desc": desc}
                 val_dict: ColumnSort = (
                     val if isinstance(val, dict) else {"col": val, "desc": True}
@@ -1170,7 +1241,7 @@ class data_frame(
             filter = []
         else:
             with reactive.isolate():
-                ncol = self._nw_data().shape[1]
+                ncol = len(self._nw_data_column_names())
 
             for column_filter, i in zip(filter, range(len(filter))):
                 assert isinstance(column_filter, dict)
@@ -15,7 +15,7 @@ from ._selection import (
 )
 from ._styles import StyleFn, StyleInfo, as_browser_style_infos, as_style_infos
 from ._tbl_data import assert_data_is_not_none, serialize_frame
-from ._types import FrameJson, IntoDataFrameT
+from ._types import FrameJson, IntoDataFrameT, TypeHintsInput
 
 
 class AbstractTabularData(abc.ABC):
@@ -102,6 +102,17 @@ class DataGrid(AbstractTabularData, Generic[IntoDataFrameT]):
         If both `style` and `class` are missing or `None`, nothing will be applied. If
         both `rows` and `cols` are missing or `None`, the style will be applied to the
         complete data frame.
+    type_hints
+        A dictionary of column names to column types (e.g. `{"link": "html"}` or
+        `{"grade": {"type": "categorical", "categories": ["A", "B"]}}`). Declared
+        columns are sent to the browser as is and skip all type inference. This is most
+        useful for large `object` columns, whose type can only be inferred by inspecting
+        their values.
+    type_hints_sample
+        If provided, the number of values (spread evenly across the column) inspected
+        when inferring the type of `object` or unknown columns. By default, the leading
+        1000 values are inspected. Inferred types are cached for as long as the data
+        frame object is alive.
     row_selection_mode
         Deprecated. Please use `selection_mode=` instead.
 
@@ -126,6 +137,8 @@ class DataGrid(AbstractTabularData, Generic[IntoDataFrameT]):
     editable: bool
     selection_modes: SelectionModes
     styles: list[StyleInfo] | StyleFn[IntoDataFrameT]
+    type_hints: TypeHintsInput
+    type_hints_sample: int | None
 
     def __init__(
         self,
@@ -138,6 +151,8 @@ class DataGrid(AbstractTabularData, Generic[IntoDataFrameT]):
         editable: bool = False,
         selection_mode: SelectionModeInput = "none",
         styles: StyleInfo | list[StyleInfo] | StyleFn[IntoDataFrameT] | None = None,
+        type_hints: TypeHintsInput = None,
+        type_hints_sample: int | None = None,
         row_selection_mode: RowSelectionModeDeprecated = "deprecated",
     ):
         assert_data_is_not_none(data)
@@ -154,6 +169,8 @@ class DataGrid(AbstractTabularData, Generic[IntoDataFrameT]):
             row_selection_mode=row_selection_mode,
         )
         self.styles = as_style_infos(styles)
+        self.type_hints = type_hints
+        self.type_hints_sample = type_hints_sample
 
     def to_payload(self) -> FrameJson:
         """
@@ -165,7 +182,11 @@ class DataGrid(AbstractTabularData, Generic[IntoDataFrameT]):
             The payload dictionary representing the `DataGrid` object.
         """
         res: FrameJson = {
-            **serialize_frame(self.data),
+            **serialize_frame(
+                self.data,
+                type_hints=self.type_hints,
+                type_hints_sample=self.type_hints_sample,
+            ),
             "options": {
                 "width": self.width,
                 "height": self.height,
@@ -262,6 +283,17 @@ class DataTable(AbstractTabularData, Generic[IntoDataFrameT]):
         If both `style` and `class` are missing or `None`, nothing will be applied. If
         both `rows` and `cols` are missing or `None`, the style will be applied to the
         complete data frame.
+    type_hints
+        A dictionary of column names to column types (e.g. `{"link": "html"}` or
+        `{"grade": {"type": "categorical", "categories": ["A", "B"]}}`). Declared
+        columns are sent to the browser as is and skip all type inference. This is most
+        useful for large `object` columns, whose type can only be inferred by inspecting
+        their values.
+    type_hints_sample
+        If provided, the number of values (spread evenly across the column) inspected
+        when inferring the type of `object` or unknown columns. By default, the leading
+        1000 values are inspected. Inferred types are cached for as long as the data
+        frame object is alive.
     row_selection_mode
         Deprecated. Please use `mode={row_selection_mode}_row` instead.
 
@@ -286,6 +318,8 @@ class DataTable(AbstractTabularData, Generic[IntoDataFrameT]):
     editable: bool
     selection_modes: SelectionModes
     styles: list[StyleInfo] | StyleFn[IntoDataFrameT]
+    type_hints: TypeHintsInput
+    type_hints_sample: int | None
 
     def __init__(
         self,
@@ -298,6 +332,8 @@ class DataTable(AbstractTabularData, Generic[IntoDataFrameT]):
         editable: bool = False,
         selection_mode: SelectionModeInput = "none",
         styles: StyleInfo | list[StyleInfo] | StyleFn[IntoDataFrameT] | None = None,
+        type_hints: TypeHintsInput = None,
+        type_hints_sample: int | None = None,
         row_selection_mode: Literal["deprecated"] = "deprecated",
     ):
         assert_data_is_not_none(data)
@@ -315,6 +351,8 @@ class DataTable(AbstractTabularData, Generic[IntoDataFrameT]):
             row_selection_mode=row_selection_mode,
         )
         self.styles = as_style_infos(styles)
+        self.type_hints = type_hints
+        self.type_hints_sample = type_hints_sample
 
     def to_payload(self) -> FrameJson:
         """
@@ -326,7 +364,11 @@ class DataTable(AbstractTabularData, Generic[IntoDataFrameT]):
             The payload dictionary representing the `DataTable` object.
         """
         res: FrameJson = {
-            **serialize_frame(self.data),
+            **serialize_frame(
+                self.data,
+                type_hints=self.type_hints,
+                type_hints_sample=self.type_hints_sample,
+            ),
             "options": {
                 "width": self.width,
                 "height": self.height,
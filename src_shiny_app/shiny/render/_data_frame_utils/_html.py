@@ -35,14 +35,37 @@ def maybe_as_cell_html(
     return cast(Jsonifiable, x)
 
 
-def series_contains_htmltoolslike(ser: Series) -> bool:
+def series_contains_htmltoolslike(ser: Series, *, sample: int | None = None) -> bool:
+    """
+    Determine if a series contains any htmltools-like values.
+
+    Parameters
+    ----------
+    ser
+        The series to inspect.
+    sample
+        If provided, only inspect (roughly) `sample` values spread evenly across the
+        whole series rather than the leading values of the series.
+    """
+
+    limit = 1000
+    if sample is not None:
+        if sample < 1:
+            raise ValueError(f"`sample` must be a positive integer, received {sample}")
+        limit = sample
+        n = len(ser)
+        if n > sample:
+            # Round the step up, so the sampled values span the whole series (at most
+            # `sample` of them)
+            ser = ser.gather_every(-(-n // sample))
 
     for idx, val in enumerate(ser):
-        # Only check the first 1k elements in the series
+        # Only check the first 1k (or `sample`) elements in the series
         # This could lead to false negatives, but it's a reasonable tradeoff of speed.
         # If the user has _that_ much missing data and wants HTML support,
         #   they can preprocess their data to turn `None` values into `htmltools.HTML("")`
-        if idx > 1000:
+        #   or declare the column type via `type_hints=`
+        if idx >= limit:
             return False
 
         if val is None:
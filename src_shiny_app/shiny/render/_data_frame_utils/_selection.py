@@ -3,12 +3,12 @@ from __future__ import annotations
 # TODO-barret-render.data_frame; Docs
 # TODO-barret-render.data_frame; Add examples of selection!
 import warnings
-from typing import Any, Literal, Set, Union, cast
+from typing import Literal, Set, Union, cast
 
 from ..._deprecated import warn_deprecated
 from ..._typing_extensions import TypedDict
 from ...types import ListOrTuple
-from ._types import DataFrame, FrameRenderSelectionModes
+from ._types import FrameRenderSelectionModes
 
 NoneSelectionMode = Literal["none"]
 RowSelectionMode = Literal["row", "rows"]
@@ -232,14 +232,14 @@ def as_browser_cell_selection(
     x: BrowserCellSelection | CellSelection | Literal["all"] | None,
     *,
     selection_modes: SelectionModes,
-    nw_data: DataFrame[Any],
+    data_shape: tuple[int, int],
 ) -> BrowserCellSelection:
 
     if x is None or selection_modes._is_none():
         return {"type": "none"}
 
     if x == "all":
-        row_len, col_len = nw_data.shape
+        row_len, col_len = data_shape
         # Look at the selection modes to determine what to do
         if selection_modes._has_rect():
             if selection_modes.rect == "cell":
@@ -333,7 +333,7 @@ def as_cell_selection(
     x: CellSelection | Literal["all"] | None | BrowserCellSelection,
     *,
     selection_modes: SelectionModes,
-    nw_data: DataFrame[Any],
+    data_shape: tuple[int, int],
     data_view_rows: ListOrTuple[int],
     data_view_cols: ListOrTuple[int],
 ) -> CellSelection:
@@ -344,7 +344,7 @@ def as_cell_selection(
     browser_cell_selection = as_browser_cell_selection(
         x,
         selection_modes=selection_modes,
-        nw_data=nw_data,
+        data_shape=data_shape,
     )
     ret: CellSelection | None = None
     if browser_cell_selection["type"] == "none":
@@ -378,7 +378,7 @@ def as_cell_selection(
         )
 
     # Make sure the rows are within the data
-    nrow, ncol = nw_data.shape
+    nrow, ncol = data_shape
     ret["rows"] = tuple(row for row in ret["rows"] if row < nrow)
     ret["cols"] = tuple(col for col in ret["cols"] if col < ncol)
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import Callable, List
 
 from ...types import ListOrTuple
-from ._tbl_data import as_data_frame
+from ._tbl_data import as_nw_frame, frame_column_names, frame_nrow
 from ._types import BrowserStyleInfo, IntoDataFrameT, StyleInfo
 
 StyleFn = Callable[[IntoDataFrameT], List["StyleInfo"]]
@@ -182,7 +182,11 @@ def as_browser_style_infos(
     infos: list[StyleInfo] | StyleFn[IntoDataFrameT],
     *,
     into_data: IntoDataFrameT,
+    column_names: list[str] | None = None,
+    nrow: int | None = None,
 ) -> list[BrowserStyleInfo]:
+    # `column_names` and `nrow` can be given if they're already known, which saves
+    # resolving the schema and counting the rows of lazy frames
 
     if callable(infos):
         style_infos = infos(into_data)
@@ -195,15 +199,18 @@ def as_browser_style_infos(
     if not isinstance(style_infos, list):
         style_infos = [style_infos]
 
-    nw_data = as_data_frame(into_data)
-    browser_column_names = nw_data.columns
-    nrow = nw_data.shape[0]
+    if column_names is None or nrow is None:
+        nw_data = as_nw_frame(into_data)
+        if column_names is None:
+            column_names = frame_column_names(nw_data)
+        if nrow is None:
+            nrow = frame_nrow(nw_data)
 
     browser_infos = [
         style_info_to_browser_style_info(
             info,
             nrow=nrow,
-            browser_column_names=browser_column_names,
+            browser_column_names=column_names,
         )
         for info in style_infos
     ]
@@ -1,36 +1,55 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, List, TypedDict, cast
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+    cast,
+    get_args,
+)
 
 import narwhals.stable.v1 as nw
 import orjson
 
 from ...session import Session, require_active_session
-from ...types import Jsonifiable, JsonifiableDict
+from ...types import Jsonifiable, JsonifiableDict, ListOrTuple
 from ._html import as_cell_html, ui_must_be_processed
 from ._types import (
     CellHtml,
     CellPatch,
     CellValue,
     ColsList,
+    ColumnSort,
     DataFrame,
     DataFrameT,
     DType,
     FrameDtype,
+    FrameDtypeSubsetType,
     FrameJson,
     IntoDataFrame,
     IntoDataFrameT,
+    LazyFrame,
     PandasCompatible,
     RowsList,
+    TypeHintsInput,
 )
 
 __all__ = (
     "as_data_frame",
+    "as_nw_frame",
+    "collect_frame",
+    "frame_shape",
     "data_frame_to_native",
     "apply_frame_patches",
     "serialize_dtype",
+    "serialize_type_hints",
     "serialize_frame",
     "subset_frame",
+    "subset_lazy_frame",
 )
 
 if TYPE_CHECKING:
@@ -68,7 +87,9 @@ def assert_data_is_not_none(data: IntoDataFrame) -> None:
         raise TypeError("`data` cannot be `None`")
 
 
-def data_frame_to_native(data: DataFrame[IntoDataFrameT]) -> IntoDataFrameT:
+def data_frame_to_native(
+    data: DataFrame[IntoDataFrameT] | LazyFrame[IntoDataFrameT],
+) -> IntoDataFrameT:
     return nw.to_native(data)
 
 
@@ -95,6 +116,72 @@ def as_data_frame(
             raise e
 
 
+def as_nw_frame(
+    data: Any,
+) -> DataFrame[Any] | LazyFrame[Any]:
+    """
+    Wrap data as a narwhals frame, keeping lazy frames (e.g. polars `LazyFrame` or
+    dask `DataFrame`) lazy.
+
+    All eager data is handled by `as_data_frame()`.
+    """
+    assert_data_is_not_none(data)
+
+    if isinstance(data, (DataFrame, LazyFrame)):
+        return data  # pyright: ignore[reportUnknownVariableType]
+    try:
+        nw_data = nw.from_native(data)
+    except TypeError:
+        nw_data = None
+    if isinstance(nw_data, LazyFrame):
+        return nw_data  # pyright: ignore[reportUnknownVariableType]
+
+    return as_data_frame(data)
+
+
+def collect_frame(nw_data: DataFrame[Any] | LazyFrame[Any]) -> DataFrame[Any]:
+    """
+    Collect a lazy frame into an eager data frame. Eager data frames are returned as is.
+    """
+    if isinstance(nw_data, LazyFrame):
+        return nw_data.collect()
+    return nw_data
+
+
+def frame_shape(nw_data: DataFrame[Any] | LazyFrame[Any]) -> tuple[int, int]:
+    """
+    Retrieve the `(nrow, ncol)` shape of a frame.
+
+    For lazy frames, only the row count is computed; the data is not collected.
+    """
+    if isinstance(nw_data, LazyFrame):
+        return (frame_nrow(nw_data), len(frame_column_names(nw_data)))
+    return nw_data.shape
+
+
+def frame_nrow(nw_data: DataFrame[Any] | LazyFrame[Any]) -> int:
+    """
+    Retrieve the number of rows of a frame.
+
+    For lazy frames, this runs a count query; the data is not collected.
+    """
+    if isinstance(nw_data, LazyFrame):
+        return int(nw_data.select(nw.len()).collect().item())
+    return len(nw_data)
+
+
+def frame_column_names(nw_data: DataFrame[Any] | LazyFrame[Any]) -> list[str]:
+    """
+    Retrieve the column names of a frame.
+
+    For lazy frames, the schema is resolved (which may be expensive, so callers should
+    reuse the result); the data is not collected.
+    """
+    if isinstance(nw_data, LazyFrame):
+        return nw_data.collect_schema().names()
+    return nw_data.columns
+
+
 def compatible_to_pandas(
     data: IntoDataFrame,
 ) -> pd.DataFrame:
@@ -123,15 +210,19 @@ def compatible_to_pandas(
 
 # apply_frame_patches --------------------------------------------------------------------
 def apply_frame_patches(
-    nw_data: DataFrame[IntoDataFrameT],
+    nw_data: DataFrame[IntoDataFrameT] | LazyFrame[IntoDataFrameT],
     patches: List[CellPatch],
-) -> DataFrame[IntoDataFrameT]:
+) -> DataFrame[IntoDataFrameT] | LazyFrame[IntoDataFrameT]:
 
     if len(patches) == 0:
         return nw_data
 
     # Apply the patches
 
+    if isinstance(nw_data, LazyFrame):
+        # Lazy frames are never modified in place; Patches are added to the query plan
+        return _apply_lazy_frame_patches(nw_data, patches)
+
     # Copy the data to make sure the original data is not modified in place.
     # If https://github.com/narwhals-dev/narwhals/issues/1154 is resolved, this
     # should be able to be removed.
@@ -146,6 +237,23 @@ def apply_frame_patches(
     #         df['b'].scatter([0, 1], [777, 555]),
     #     )
 
+    cell_patches_by_column = _group_patches_by_column(nw_data.columns, patches)
+
+    # Upgrade the Scatter info to new column Series objects
+    scatter_columns = [
+        nw_data[column_name].scatter(
+            scatter_values["row_indexes"], scatter_values["values"]
+        )
+        for column_name, scatter_values in cell_patches_by_column.items()
+    ]
+    # Apply patches to the nw data
+    return nw_data.with_columns(*scatter_columns)
+
+
+def _group_patches_by_column(
+    columns: list[str],
+    patches: List[CellPatch],
+) -> dict[str, ScatterValues]:
     # Group patches by column
     # This allows for a single column to be updated in a single operation (rather than multiple updates to the same column)
     #
@@ -154,7 +262,7 @@ def apply_frame_patches(
     #
     cell_patches_by_column: dict[str, ScatterValues] = {}
     for cell_patch in patches:
-        column_name = nw_data.columns[cell_patch["column_index"]]
+        column_name = columns[cell_patch["column_index"]]
         if column_name not in cell_patches_by_column:
             cell_patches_by_column[column_name] = {
                 "row_indexes": [],
@@ -167,19 +275,49 @@ def apply_frame_patches(
         )
         cell_patches_by_column[column_name]["values"].append(cell_patch["value"])
 
-    # Upgrade the Scatter info to new column Series objects
-    scatter_columns = [
-        nw_data[column_name].scatter(
+    return cell_patches_by_column
+
+
+def _apply_lazy_frame_patches(
+    nw_data: LazyFrame[Any],
+    patches: List[CellPatch],
+) -> LazyFrame[Any]:
+    columns = frame_column_names(nw_data)
+    cell_patches_by_column = _group_patches_by_column(columns, patches)
+
+    # Lazy frames have no positional `scatter()`. Instead, add a temporary row index and
+    # replace each patched cell with a `when/then` expression.
+    row_index_name = _unused_column_name(columns, "__shiny_row_index__")
+    row_index = nw.col(row_index_name)
+
+    patched_columns: list[nw.Expr] = []
+    for column_name, scatter_values in cell_patches_by_column.items():
+        expr = nw.col(column_name)
+        for patch_row_index, value in zip(
             scatter_values["row_indexes"], scatter_values["values"]
-        )
-        for column_name, scatter_values in cell_patches_by_column.items()
-    ]
-    # Apply patches to the nw data
-    return nw_data.with_columns(*scatter_columns)
+        ):
+            expr = (
+                nw.when(row_index == patch_row_index)
+                .then(nw.lit(value))
+                .otherwise(expr)
+            )
+        patched_columns.append(expr.alias(column_name))
+
+    return (
+        nw_data.with_row_index(row_index_name)
+        .with_columns(*patched_columns)
+        .drop(row_index_name)
+    )
+
+
+def _unused_column_name(columns: list[str], name: str) -> str:
+    while name in columns:
+        name = f"_{name}"
+    return name
 
 
 # serialize_dtype ----------------------------------------------------------------------
-def serialize_dtype(col: nw.Series) -> FrameDtype:
+def serialize_dtype(col: nw.Series, *, sample: int | None = None) -> FrameDtype:
 
     from ._html import series_contains_htmltoolslike
 
@@ -204,28 +342,159 @@ def serialize_dtype(col: nw.Series) -> FrameDtype:
         type_ = "duration"
     elif isinstance(dtype, nw.Object):
         type_ = "object"
-        if series_contains_htmltoolslike(col):
+        if series_contains_htmltoolslike(col, sample=sample):
             type_ = "html"
     elif isinstance(dtype, (nw.Struct, nw.List, nw.Array)):
         type_ = "object"
     else:
         type_ = "unknown"
-        if series_contains_htmltoolslike(col):
+        if series_contains_htmltoolslike(col, sample=sample):
             type_ = "html"
 
     return {"type": type_}
 
 
+# serialize_type_hints -----------------------------------------------------------------
+
+# Inferring the type hint of an `object` (or unknown) column requires inspecting the
+# values of the column in Python. Type hints are cached per native data frame so that
+# re-rendering an unchanged data frame (e.g. `.update_data()` or a re-executed render
+# function returning the same object) does not re-inspect every column.
+#
+# The cache is keyed on the identity of the native data frame object (held weakly, as
+# pandas data frames are not hashable). The column name, dtype, length, and sample size
+# are part of the column key so that structural changes to a data frame mutated in
+# place will trigger a new inference. In-place changes of cell values that keep the
+# column's dtype and length are **not** detected.
+TypeHintKey = Tuple[str, str, int, Optional[int]]
+_type_hints_cache: dict[int, tuple[weakref.ref[Any], dict[TypeHintKey, FrameDtype]]] = (
+    {}
+)
+
+_type_hint_types: tuple[str, ...] = get_args(FrameDtypeSubsetType)
+
+
+def _get_type_hints_cache(native_data: object) -> dict[TypeHintKey, FrameDtype]:
+    key = id(native_data)
+    entry = _type_hints_cache.get(key)
+    if entry is not None and entry[0]() is native_data:
+        return entry[1]
+
+    def on_collect(ref: weakref.ref[Any]) -> None:
+        cur_entry = _type_hints_cache.get(key)
+        if cur_entry is not None and cur_entry[0] is ref:
+            del _type_hints_cache[key]
+
+    try:
+        ref = weakref.ref(native_data, on_collect)
+    except TypeError:
+        # Object can not be weakly referenced; Do not cache
+        return {}
+
+    cache: dict[TypeHintKey, FrameDtype] = {}
+    _type_hints_cache[key] = (ref, cache)
+    return cache
+
+
+def as_type_hint(type_hint: str | FrameDtype, *, col_name: str) -> FrameDtype:
+    if isinstance(type_hint, str):
+        if type_hint == "categorical":
+            raise ValueError(
+                f"Column `{col_name}` type hint `'categorical'` must be supplied as "
+                '`{"type": "categorical", "categories": [...]}`.'
+            )
+        type_hint = {"type": type_hint}  # pyright: ignore[reportAssignmentType]
+
+    if not isinstance(  # pyright: ignore[reportUnnecessaryIsInstance]
+        type_hint, dict
+    ) or not isinstance(type_hint.get("type"), str):
+        raise TypeError(
+            f"Column `{col_name}` type hint must be a `str` or a dictionary with a "
+            f"`type` key. Received `{type_hint!r}`"
+        )
+    if type_hint["type"] == "categorical":
+        if not isinstance(type_hint.get("categories"), (list, tuple)):
+            raise ValueError(
+                f"Column `{col_name}` categorical type hint requires a list of `categories`."
+            )
+    elif type_hint["type"] not in _type_hint_types:
+        raise ValueError(
+            f"Unknown type hint `{type_hint['type']!r}` for column `{col_name}`. "
+            f"Expected one of: {', '.join(_type_hint_types + ('categorical',))}"
+        )
+
+    return type_hint
+
+
+def serialize_type_hints(
+    data: DataFrame[Any],
+    *,
+    type_hints: TypeHintsInput = None,
+    sample: int | None = None,
+) -> list[FrameDtype]:
+    """
+    Retrieve the type hints for each column of a data frame.
+
+    User declared `type_hints` are used as is. All other columns are inferred via
+    `serialize_dtype()` and cached for the lifetime of the native data frame object.
+
+    Parameters
+    ----------
+    data
+        The narwhals data frame.
+    type_hints
+        A dictionary of column names to type hints that should be used instead of
+        inferring the column's type.
+    sample
+        If provided, the number of values to inspect (spread evenly across the column)
+        when inferring the type of `object` or unknown columns.
+    """
+    columns = data.columns
+    if type_hints:
+        for col_name in type_hints:
+            if col_name not in columns:
+                raise ValueError(
+                    f"Column `{col_name}` was supplied in `type_hints=`, "
+                    "but it was not found in the data frame."
+                )
+
+    cache = _get_type_hints_cache(data_frame_to_native(data))
+
+    ret: list[FrameDtype] = []
+    for col_name in columns:
+        if type_hints and col_name in type_hints:
+            ret.append(as_type_hint(type_hints[col_name], col_name=col_name))
+            continue
+
+        col = data[col_name]
+        key: TypeHintKey = (col_name, str(col.dtype), len(col), sample)
+        type_hint = cache.get(key)
+        if type_hint is None:
+            type_hint = serialize_dtype(col, sample=sample)
+            cache[key] = type_hint
+        ret.append(type_hint)
+
+    return ret
+
+
 # serialize_frame ----------------------------------------------------------------------
 
 RenderedDependency = dict[str, Jsonifiable]
 
 
-def serialize_frame(into_data: IntoDataFrame) -> FrameJson:
+def serialize_frame(
+    into_data: IntoDataFrame,
+    *,
+    type_hints: TypeHintsInput = None,
+    type_hints_sample: int | None = None,
+) -> FrameJson:
 
-    data = as_data_frame(into_data)
+    # The browser receives every row, so lazy frames must be collected here
+    data = collect_frame(as_nw_frame(into_data))
 
-    type_hints = [serialize_dtype(data[col_name]) for col_name in data.columns]
+    serialized_type_hints = serialize_type_hints(
+        data, type_hints=type_hints, sample=type_hints_sample
+    )
 
     # TODO-future-barret; Swich serialization to "by column", rather than "by row"
     # * This would allow for a single column to be serialized in a single operation
@@ -280,7 +549,7 @@ def serialize_frame(into_data: IntoDataFrame) -> FrameJson:
     return {
         "columns": data.columns,
         "data": data_val,
-        "typeHints": type_hints,
+        "typeHints": serialized_type_hints,
         "htmlDeps": deduped_html_deps,
     }
 
@@ -322,6 +591,32 @@ def subset_frame(
             return data[rows, col_names]
 
 
+def subset_lazy_frame(
+    data: LazyFrame[Any],
+    *,
+    rows: RowsList = None,
+    sort: ListOrTuple[ColumnSort] = (),
+) -> LazyFrame[Any]:
+    """Return a subsetted LazyFrame, based on row positions and column sort information.
+
+    The row subset and the sorting are added to the query plan; No data is collected.
+    Lazy frames do not have positional row access, so the browser's column `sort`
+    information is used to order the rows rather than the order of `rows`.
+    """
+    columns = frame_column_names(data)
+    row_index_name = _unused_column_name(columns, "__shiny_row_index__")
+
+    data = data.with_row_index(row_index_name)
+    if rows is not None:
+        data = data.filter(nw.col(row_index_name).is_in(list(rows)))
+
+    # Sort by the row index last to keep the sort stable (as in the browser)
+    by = [columns[col_sort["col"]] for col_sort in sort] + [row_index_name]
+    descending = [col_sort["desc"] for col_sort in sort] + [False]
+
+    return data.sort(by, descending=descending).drop(row_index_name)
+
+
 class ScatterValues(TypedDict):
     row_indexes: list[int]
     values: list[CellValue]
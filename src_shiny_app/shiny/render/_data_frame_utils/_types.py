@@ -32,6 +32,7 @@ __all__ = (
     "IntoExpr",
     "DataFrame",
     "DataFrameT",
+    "LazyFrame",
     "DType",
     "IntoDataFrame",
     "IntoDataFrameT",
@@ -50,9 +51,11 @@ __all__ = (
     "FrameJson",
     "RowsList",
     "ColsList",
+    "FrameDtypeSubsetType",
     "FrameDtypeSubset",
     "FrameDtypeCategories",
     "FrameDtype",
+    "TypeHintsInput",
     "StyleInfoBody",
     "StyleInfo",
     "BrowserStyleInfoBody",
@@ -66,6 +69,7 @@ __all__ = (
 # ---------------------------------------------------------------------
 
 DataFrame = nw.DataFrame
+LazyFrame = nw.LazyFrame
 Series = nw.Series
 
 # ---------------------------------------------------------------------
@@ -172,18 +176,21 @@ ColsList = Optional[ListOrTuple[Union[str, int]]]
 # ---------------------------------------------------------------------
 
 
+FrameDtypeSubsetType = Literal[
+    "string",
+    "numeric",
+    "boolean",
+    "date",
+    "datetime",
+    "duration",
+    "object",
+    "unknown",
+    "html",
+]
+
+
 class FrameDtypeSubset(TypedDict):
-    type: Literal[
-        "string",
-        "numeric",
-        "boolean",
-        "date",
-        "datetime",
-        "duration",
-        "object",
-        "unknown",
-        "html",
-    ]
+    type: FrameDtypeSubsetType
 
 
 class FrameDtypeCategories(TypedDict):
@@ -196,6 +203,10 @@ FrameDtype = Union[
     FrameDtypeCategories,
 ]
 
+# User declared column types; Keys are column names.
+# Values are a type string (e.g. `"html"`) or a full `FrameDtype` dictionary.
+TypeHintsInput = Optional[Dict[str, Union[str, FrameDtype]]]
+
 
 # ---------------------------------------------------------------------
 
@@ -9,14 +9,12 @@ import typing
 # Can use `dict` in python >= 3.9
 from typing import TYPE_CHECKING, Any, Callable, Literal, Optional, Union, cast
 
-from htmltools import Tag, TagAttrValue, TagChild
-
-from ._data_frame_utils._tbl_data import as_data_frame
-from ._data_frame_utils._types import IntoDataFrame
+from htmltools import Tag, TagAttrValue, TagChild, TagList
 
 if TYPE_CHECKING:
 
     from ..session._utils import RenderedDeps
+    from ._data_frame_utils._types import IntoDataFrame
 
 from .. import _utils
 from .. import ui as _ui
@@ -32,6 +30,7 @@ from ._try_render_plot import (
     try_render_pil,
     try_render_plotnine,
 )
+from ._ui_diff import diff_ui
 from .renderer import Jsonifiable, Renderer, ValueFn
 from .renderer._utils import (
     imgdata_to_jsonifiable,
@@ -449,7 +448,7 @@ class image(Renderer[ImgData]):
 
 
 @add_example(ex_dir="../api-examples/output_table")
-class table(Renderer[IntoDataFrame]):
+class table(Renderer["IntoDataFrame"]):
     """
     Reactively render a pandas ``DataFrame`` object (or similar) as a basic HTML
     table.
@@ -521,6 +520,9 @@ class table(Renderer[IntoDataFrame]):
         import pandas
         import pandas.io.formats.style
 
+        # narwhals is slow to import; only load it when a table is rendered
+        from ._data_frame_utils._tbl_data import as_data_frame
+
         html: str
         if isinstance(value, pandas.io.formats.style.Styler):
             html = cast(  # pyright: ignore[reportUnnecessaryCast]
@@ -568,6 +570,15 @@ class ui(Renderer[TagChild]):
     This function is used to render HTML content, but it requires that the funciton
     returns the content, using Shiny Core syntax.
 
+    Parameters
+    ----------
+    diff
+        If ``True``, after the first render, only the parts of the UI that changed are
+        sent to the browser and updated in place, instead of replacing all of the HTML.
+        Inputs and outputs in unchanged parts of the UI keep their state (e.g., an
+        input's current value, or an output's rendered content). In Shiny Core apps, the
+        container must be created with ``ui.output_ui(id, diff=True)``.
+
     Returns
     -------
     :
@@ -587,8 +598,52 @@ class ui(Renderer[TagChild]):
     * :func:`~shiny.ui.output_ui`
     """
 
+    def __init__(
+        self,
+        _fn: Optional[ValueFn[TagChild]] = None,
+        *,
+        diff: bool = False,
+    ) -> None:
+        super().__init__(_fn)
+        self.diff: bool = diff
+        # The UI last sent to the browser, when `diff=True`
+        self._prev_ui: Optional[TagList] = None
+        self._resync_value: object = None
+
     def auto_output_ui(self) -> Tag:
-        return _ui.output_ui(self.output_id)
+        return _ui.output_ui(self.output_id, diff=self.diff)
+
+    async def render(self) -> Jsonifiable:
+        if not self.diff:
+            return await super().render()
+
+        # The browser asks for the whole UI if it can't apply a patch (e.g. because the
+        # DOM was modified by other code). Reading the input also makes this output
+        # re-render when that happens. The browser names the input after the output's
+        # element, whose id includes the module namespace, so it's read through the
+        # (possibly module-scoped) session.
+        session = require_active_session(None)
+        resync_input = session.input[f"{self.output_id}__ui_diff_resync"]
+        if resync_input.is_set() and resync_input() != self._resync_value:
+            self._resync_value = resync_input()
+            self._prev_ui = None
+
+        # If rendering fails, the browser shows the error instead of the UI
+        self._prev_ui, prev_ui = None, self._prev_ui
+        value = await self.fn()
+        if value is None:
+            return None
+
+        ui = TagList(value).tagify()
+        res = session._process_ui(ui)
+        if prev_ui is not None:
+            patches = diff_ui(prev_ui, ui, max_html_size=len(res["html"]) // 2)
+            if patches is not None:
+                self._prev_ui = ui
+                return {"patches": cast(Jsonifiable, patches), "deps": res["deps"]}
+
+        self._prev_ui = ui
+        return rendered_deps_to_jsonifiable(res)
 
     async def transform(self, value: TagChild) -> Jsonifiable:
         session = require_active_session(None)
@@ -622,6 +677,14 @@ class download(Renderer[str]):
       important that the `@render.download` decorator have a `filename` argument, as the
       decorated function won't help with that.
 
+    Files on disk are sent with support for HTTP range requests, so browsers can resume
+    interrupted downloads. Yielded content is streamed to the browser as it's
+    generated; if the function is a regular (not async) generator, everything after
+    its first `yield` runs in a separate thread, so that generating a large file
+    doesn't block the app. Such a generator should therefore read the inputs, reactive
+    values, and reactive calculations it needs before its first `yield`; reading them
+    after it is not supported.
+
     Parameters
     ----------
     filename
@@ -630,6 +693,21 @@ class download(Renderer[str]):
         The media type of the download.
     encoding
         The encoding of the download.
+    resumable
+        If `True`, and the decorated function yields its content, the whole file is
+        generated before it's sent, and then sent like a file on disk, with an ETag
+        based on the hash of its content. If the function generates the same content
+        when it's called again, interrupted downloads can be resumed, and repeated
+        downloads aren't sent again if the browser still has the file.
+    cache
+        If `True`, and the decorated function yields its content, the generated file is
+        kept on disk (like with `resumable=True`), and shared by all sessions of the
+        app: when the download is requested again, with the same values of the inputs
+        that the function read (directly, or through reactive calculations), the file
+        is sent without calling the function again. Only use this if the content
+        depends on nothing but inputs (not on e.g. reactive values, the user, or the
+        time). See :attr:`~shiny.App.download_cache_dir` and
+        :attr:`~shiny.App.download_cache_size`.
     label
         (Express only) A label for the button. Defaults to "Download".
 
@@ -657,6 +735,8 @@ class download(Renderer[str]):
         filename: Optional[str | Callable[[], str]] = None,
         media_type: None | str | Callable[[], str] = None,
         encoding: str = "utf-8",
+        resumable: bool = False,
+        cache: bool = False,
         label: TagChild = "Download",
     ) -> None:
         super().__init__()
@@ -664,6 +744,8 @@ class download(Renderer[str]):
         self.filename = filename
         self.media_type = media_type
         self.encoding = encoding
+        self.resumable = resumable
+        self.cache = cache
         self.label = label
 
         if fn is not None:
@@ -714,6 +796,8 @@ class download(Renderer[str]):
                 content_type=self.media_type,
                 handler=fn,
                 encoding=self.encoding,
+                resumable=self.resumable,
+                cache=self.cache,
             )
 
         return self
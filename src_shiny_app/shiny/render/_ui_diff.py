@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+__all__ = ("UiPatch", "diff_ui")
+
+from typing import Any, Optional, Sequence
+
+from htmltools import HTML, Tag, TagList, TagNode
+
+# A single DOM operation, sent to the client as JSON. Elements are addressed by a path
+# of element-child indices from the output container (text nodes, and elements added
+# on the client by input/output bindings, are not counted).
+UiPatch = dict[str, Any]
+
+# Elements whose content is never patched, only replaced as a whole. The HTML parser
+# restructures some of them (e.g. it inserts <tbody>, and closes <p> before block
+# content), so their DOM doesn't necessarily mirror the tag tree; for others (<select>,
+# <textarea>, <script>, ...), changing their content in place has side effects that
+# replacing them doesn't.
+_OPAQUE_TAGS = frozenset(
+    {
+        "table",
+        "thead",
+        "tbody",
+        "tfoot",
+        "tr",
+        "colgroup",
+        "p",
+        "select",
+        "optgroup",
+        "option",
+        "textarea",
+        "pre",
+        "script",
+        "style",
+        "template",
+        "svg",
+        "math",
+    }
+)
+
+
+def diff_ui(
+    old: TagList, new: TagList, max_html_size: Optional[int] = None
+) -> list[UiPatch] | None:
+    """
+    Compute the DOM operations that turn the rendered `old` UI into `new`.
+
+    Both trees must be tagified. Returns `None` if the change can't be expressed as
+    patches (e.g. text content at the top level changed), or if the patches would
+    carry more than `max_html_size` characters of HTML; the whole UI should be
+    re-rendered instead.
+    """
+    ops: list[UiPatch] = []
+    if not _diff_children(_flatten(old), _flatten(new), [], ops):
+        return None
+
+    if max_html_size is not None:
+        size = sum(len(op.get("html", "")) for op in ops)
+        if size > max_html_size:
+            return None
+
+    return ops
+
+
+def _diff_children(
+    old: list[TagNode], new: list[TagNode], path: list[int], ops: list[UiPatch]
+) -> bool:
+    # Patch the children of the element at `path`. Returns False if they have to be
+    # replaced as a whole.
+    if not (_all_tags(old) and _all_tags(new)):
+        return old == new
+
+    old_tags: list[Tag] = old  # pyright: ignore[reportAssignmentType]
+    new_tags: list[Tag] = new  # pyright: ignore[reportAssignmentType]
+
+    # Skip unchanged children at the start and the end
+    n_old, n_new = len(old_tags), len(new_tags)
+    start = 0
+    while start < n_old and start < n_new and old_tags[start] == new_tags[start]:
+        start += 1
+    end = 0
+    while (
+        end < n_old - start
+        and end < n_new - start
+        and old_tags[n_old - 1 - end] == new_tags[n_new - 1 - end]
+    ):
+        end += 1
+
+    # Patch the changed range in place, pairing children by position. Then remove the
+    # extra old children (from the end, so the indices stay valid), or insert the extra
+    # new ones.
+    old_mid = old_tags[start : n_old - end]
+    new_mid = new_tags[start : n_new - end]
+    n_paired = min(len(old_mid), len(new_mid))
+    for k in range(n_paired):
+        _diff_tag(old_mid[k], new_mid[k], path + [start + k], ops)
+    for k in reversed(range(n_paired, len(old_mid))):
+        ops.append(
+            {"op": "remove", "path": path + [start + k], "tag": old_mid[k].name}
+        )
+    for k in range(n_paired, len(new_mid)):
+        ops.append(
+            {
+                "op": "insert",
+                "path": path,
+                "index": start + k,
+                "html": new_mid[k].get_html_string(),
+            }
+        )
+    return True
+
+
+def _diff_tag(old: Tag, new: Tag, path: list[int], ops: list[UiPatch]) -> None:
+    if old == new:
+        return
+
+    if not _same_node(old, new) or old.name in _OPAQUE_TAGS:
+        _replace(old, new, path, ops)
+        return
+
+    old_children = _flatten(old.children)
+    new_children = _flatten(new.children)
+
+    # Check the content first: if the element is replaced, there's no need to patch
+    # its attributes
+    child_ops: list[UiPatch] = []
+    text: Optional[str] = None
+    if _all_text(old_children) and _all_text(new_children):
+        if old_children != new_children:
+            text = "".join(new_children)  # pyright: ignore[reportArgumentType]
+    elif not _diff_children(old_children, new_children, path, child_ops):
+        _replace(old, new, path, ops)
+        return
+
+    if old.attrs != new.attrs:
+        # Input and output bindings read their element's attributes when they're bound,
+        # so replace (and rebind) elements with an id instead of updating them in place
+        if "id" in old.attrs or any(isinstance(v, HTML) for v in new.attrs.values()):
+            _replace(old, new, path, ops)
+            return
+        ops.append(
+            {
+                "op": "attrs",
+                "path": path,
+                "tag": old.name,
+                "set": {
+                    k: str(v)
+                    for k, v in new.attrs.items()
+                    if old.attrs.get(k) != v
+                },
+                "remove": [k for k in old.attrs if k not in new.attrs],
+            }
+        )
+
+    if text is not None:
+        ops.append({"op": "text", "path": path, "tag": old.name, "text": text})
+    ops.extend(child_ops)
+
+
+def _replace(old: Tag, new: Tag, path: list[int], ops: list[UiPatch]) -> None:
+    ops.append(
+        {
+            "op": "replace",
+            "path": path,
+            "tag": old.name,
+            "html": new.get_html_string(),
+        }
+    )
+
+
+def _same_node(old: Tag, new: Tag) -> bool:
+    return old.name == new.name and old.attrs.get("id") == new.attrs.get("id")
+
+
+def _flatten(children: Sequence[TagNode]) -> list[TagNode]:
+    res: list[TagNode] = []
+    for child in children:
+        if isinstance(child, TagList):
+            res.extend(_flatten(child))
+        else:
+            res.append(child)
+    return res
+
+
+def _all_tags(children: list[TagNode]) -> bool:
+    return all(isinstance(child, Tag) for child in children)
+
+
+def _all_text(children: list[TagNode]) -> bool:
+    # (`HTML` strings aren't `str`, so raw HTML content isn't treated as text)
+    return all(isinstance(child, str) for child in children)
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+__all__ = (
+    "DownloadCache",
+    "DownloadCacheEntry",
+    "encode_chunks",
+    "find_input_reads",
+    "iterate_in_thread",
+    "spool_to_file",
+)
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from .._shinyenv import is_pyodide
+
+if TYPE_CHECKING:
+    from hashlib import _Hash
+
+    from ..reactive import Calc_, Context, Value
+
+T = TypeVar("T")
+
+# When a sync iterable is iterated in a thread, items are collected until they add up to
+# about this many bytes, so that the thread isn't switched to for each small item
+THREAD_BATCH_SIZE = 64 * 1024
+
+# Generated content is written to the spool file in pieces of about this size
+SPOOL_BUFFER_SIZE = 1024 * 1024
+
+
+async def iterate_in_thread(iterable: Iterable[T]) -> AsyncIterator[T]:
+    """
+    Iterate over a sync iterable (like a generator) in a worker thread, so that slow
+    iterables don't block the event loop.
+
+    The first item is taken on the event loop, so that a generator's code up to its
+    first `yield`, where it typically reads inputs and reactive calcs, doesn't run
+    outside of it. The thread inherits the caller's context (including the current
+    session and reactive context), as with `asyncio.to_thread()`, but reactive objects
+    must not be read there.
+    """
+    it = iter(iterable)
+    for item in it:
+        yield item
+        break
+
+    if is_pyodide:
+        # No threads in Pyodide
+        for item in it:
+            yield item
+        return
+
+    while True:
+        batch = await asyncio.to_thread(_next_batch, it)
+        if not batch:
+            return
+        for item in batch:
+            yield item
+
+
+async def encode_chunks(
+    contents: Iterable[Union[bytes, str]] | AsyncIterable[Union[bytes, str]],
+    encoding: str,
+) -> AsyncIterator[bytes]:
+    """
+    Iterate over the content of a download, encoding strings. Sync iterables are
+    iterated in a thread (see `iterate_in_thread()`).
+    """
+    if isinstance(contents, AsyncIterable):
+        chunks: AsyncIterable[Union[bytes, str]] = contents
+    else:
+        chunks = iterate_in_thread(contents)
+    async for chunk in chunks:
+        if isinstance(chunk, str):
+            yield chunk.encode(encoding)
+        else:
+            yield chunk
+
+
+def _next_batch(it: Iterator[T]) -> list[T]:
+    batch: list[T] = []
+    size = 0
+    for item in it:
+        batch.append(item)
+        size += len(item) if isinstance(item, (bytes, str)) else 1
+        if size >= THREAD_BATCH_SIZE:
+            break
+    return batch
+
+
+async def spool_to_file(contents: AsyncIterable[bytes]) -> tuple[str, str]:
+    """
+    Write generated content to a temporary file.
+
+    Returns
+    -------
+    :
+        The path of the file (which the caller must delete), and an ETag for the
+        content, based on its SHA-256 hash.
+    """
+    fd, path = tempfile.mkstemp(prefix="shiny-download-")
+    hasher = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as f:
+            buffer: list[bytes] = []
+            buffer_size = 0
+            async for chunk in contents:
+                buffer.append(chunk)
+                buffer_size += len(chunk)
+                if buffer_size >= SPOOL_BUFFER_SIZE:
+                    await _run_in_thread(_write_hashed, f, hasher, b"".join(buffer))
+                    buffer, buffer_size = [], 0
+            if buffer:
+                await _run_in_thread(_write_hashed, f, hasher, b"".join(buffer))
+    except BaseException:
+        os.unlink(path)
+        raise
+
+    return path, f'"{hasher.hexdigest()}"'
+
+
+def _write_hashed(f: BinaryIO, hasher: _Hash, data: bytes) -> None:
+    hasher.update(data)
+    f.write(data)
+
+
+async def _run_in_thread(fn: Callable[..., None], *args: Any) -> None:
+    if is_pyodide:
+        # No threads in Pyodide
+        fn(*args)
+    else:
+        await asyncio.to_thread(fn, *args)
+
+
+# ======================================================================================
+# Cache of generated downloads
+# ======================================================================================
+def find_input_reads(
+    ctx: Context, inputs: Mapping[str, Value[Any]], calcs: Iterable[Calc_[Any]]
+) -> tuple[str, ...]:
+    """
+    Find the ids of the inputs that were read in a reactive context, directly or
+    through reactive calcs (which may have been calculated before).
+    """
+    # The contexts whose reads count: `ctx`, and those of the calcs that were read in
+    # one of them
+    ctx_ids = {ctx.id}
+    remaining = list(calcs)
+    found = True
+    while found:
+        found = False
+        for calc in remaining:
+            calc_ctx = calc._ctx
+            if calc_ctx is None or calc_ctx.id in ctx_ids:
+                continue
+            if not ctx_ids.isdisjoint(calc._dependents._dependents):
+                ctx_ids.add(calc_ctx.id)
+                found = True
+
+    return tuple(
+        sorted(
+            id
+            for id, value in inputs.items()
+            if not ctx_ids.isdisjoint(value._value_dependents._dependents)
+            or not ctx_ids.isdisjoint(value._is_set_dependents._dependents)
+        )
+    )
+
+
+class DownloadCacheEntry(NamedTuple):
+    path: str
+    etag: str
+    filename: str
+    content_type: Optional[str]
+    size: int
+
+
+class DownloadCache:
+    """
+    Generated downloads, stored on disk and shared by all sessions of an app.
+
+    An entry is keyed by the id of the download and the values of the inputs that its
+    handler read when it ran. Since a handler may read different inputs depending on
+    the values of others, every set of inputs a download's handler has read is
+    remembered, and lookups try each of them. When the total size of the files exceeds
+    `max_size`, the least recently used entries are deleted.
+    """
+
+    def __init__(self, directory: Optional[str | Path], max_size: int) -> None:
+        self.max_size = max_size
+        self._directory_arg = directory
+        self._directory: Optional[Path] = None
+        self._entries: OrderedDict[str, DownloadCacheEntry] = OrderedDict()
+        self._size = 0
+        self._input_ids: dict[str, set[tuple[str, ...]]] = {}
+
+    def get(
+        self, download_id: str, read_input: Callable[[str], tuple[bool, object]]
+    ) -> Optional[DownloadCacheEntry]:
+        """
+        Look up a download, given a function that returns whether an input has a value,
+        and the value.
+        """
+        for input_ids in self._input_ids.get(download_id, ()):
+            key = _cache_key(download_id, input_ids, [read_input(i) for i in input_ids])
+            entry = self._entries.get(key)
+            if entry is not None and os.path.exists(entry.path):
+                self._entries.move_to_end(key)
+                return entry
+        return None
+
+    def add(
+        self,
+        download_id: str,
+        input_ids: tuple[str, ...],
+        input_values: list[tuple[bool, object]],
+        path: str,
+        etag: str,
+        filename: str,
+        content_type: Optional[str],
+    ) -> Optional[DownloadCacheEntry]:
+        """
+        Move a generated file (from `spool_to_file()`) into the cache. Returns `None`
+        (and leaves the file where it is) if it's larger than the cache.
+        """
+        self._input_ids.setdefault(download_id, set()).add(input_ids)
+
+        size = os.path.getsize(path)
+        if size > self.max_size:
+            return None
+
+        key = _cache_key(download_id, input_ids, input_values)
+        dest = str(self._get_directory() / key)
+        shutil.move(path, dest)
+
+        prev = self._entries.pop(key, None)
+        if prev is not None:
+            self._size -= prev.size
+        entry = DownloadCacheEntry(dest, etag, filename, content_type, size)
+        self._entries[key] = entry
+        self._size += size
+
+        while self._size > self.max_size and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+            _unlink(evicted.path)
+
+        return entry
+
+    def close(self) -> None:
+        """Delete all cached files."""
+        for entry in self._entries.values():
+            _unlink(entry.path)
+        self._entries.clear()
+        self._size = 0
+        if self._directory is not None and self._directory_arg is None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+        self._directory = None
+
+    def _get_directory(self) -> Path:
+        if self._directory is None:
+            if self._directory_arg is None:
+                self._directory = Path(tempfile.mkdtemp(prefix="shiny-download-cache-"))
+            else:
+                self._directory = Path(self._directory_arg)
+                self._directory.mkdir(parents=True, exist_ok=True)
+        return self._directory
+
+
+def _cache_key(
+    download_id: str, input_ids: tuple[str, ...], input_values: list[tuple[bool, object]]
+) -> str:
+    data = json.dumps(
+        [download_id, input_ids, input_values], sort_keys=True, default=repr
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
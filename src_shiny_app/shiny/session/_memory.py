@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+__all__ = ("SessionMemoryUsage", "approx_size")
+
+import dataclasses
+import sys
+import types
+from typing import Any
+
+# Stop descending into containers after this many levels. Deeply nested values are
+# rare in Shiny apps, and this keeps the estimate cheap to compute.
+_MAX_DEPTH = 6
+
+
+@dataclasses.dataclass
+class SessionMemoryUsage:
+    """
+    Approximate memory (in bytes) retained by a session.
+
+    The sizes are estimates: shared objects are counted once per category, and objects
+    that are not containers (or known data frame / array types) are counted by their
+    shallow size.
+    """
+
+    inputs: int = 0
+    """Size of the input values."""
+    calcs: int = 0
+    """Size of the cached values of reactive calculations created by the session."""
+    outputs: int = 0
+    """Size of the reactive values held by the session's output renderers (e.g. the
+    data of a `@render.data_frame`)."""
+
+    @property
+    def total(self) -> int:
+        return self.inputs + self.calcs + self.outputs
+
+
+def approx_size(obj: object, seen: set[int] | None = None, depth: int = 0) -> int:
+    """
+    Approximate the retained size (in bytes) of an object.
+
+    Containers are traversed (up to a fixed depth). Data frames and arrays report their
+    buffer sizes. Objects in `seen` are not counted again.
+    """
+    if seen is None:
+        seen = set()
+
+    obj_id = id(obj)
+    if obj_id in seen:
+        return 0
+    seen.add(obj_id)
+
+    if isinstance(
+        obj,
+        (type, types.ModuleType, types.FunctionType, types.MethodType),
+    ):
+        return 0
+
+    # Data frames / series / arrays. Checked by attribute to avoid importing them
+    nbytes = _frame_like_size(obj)
+    if nbytes is not None:
+        return nbytes
+
+    size = sys.getsizeof(obj, 0)
+    if depth >= _MAX_DEPTH:
+        return size
+
+    if isinstance(obj, dict):
+        for key, val in obj.items():  # pyright: ignore[reportUnknownVariableType]
+            size += approx_size(key, seen, depth + 1)
+            size += approx_size(val, seen, depth + 1)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:  # pyright: ignore[reportUnknownVariableType]
+            size += approx_size(item, seen, depth + 1)
+    elif hasattr(obj, "__dict__") and not type(obj).__module__.startswith("shiny."):
+        # Don't descend into Shiny's own objects (sessions, reactives, ...); they are
+        # accounted for separately, or are shared between sessions.
+        size += approx_size(vars(obj), seen, depth + 1)
+
+    return size
+
+
+def _frame_like_size(obj: object) -> int | None:
+    # polars
+    estimated_size = getattr(obj, "estimated_size", None)
+    if callable(estimated_size) and type(obj).__module__.startswith("polars"):
+        return int(estimated_size())
+
+    # pandas
+    memory_usage = getattr(obj, "memory_usage", None)
+    if callable(memory_usage) and type(obj).__module__.startswith("pandas"):
+        usage: Any = memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+
+    # numpy (and other buffer-like arrays)
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int) and not isinstance(obj, (bytes, bytearray)):
+        return nbytes
+
+    # narwhals wrappers
+    if type(obj).__module__.startswith("narwhals"):
+        to_native = getattr(obj, "to_native", None)
+        if callable(to_native):
+            return _frame_like_size(to_native())
+
+    return None
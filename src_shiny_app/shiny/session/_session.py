@@ -11,16 +11,19 @@ import json
 import os
 import re
 import sys
+import time
 import traceback
 import typing
 import urllib.parse
 import warnings
+import weakref
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Any,
     AsyncIterable,
+    AsyncIterator,
     Awaitable,
     Callable,
     Iterable,
@@ -32,30 +35,44 @@ from typing import (
 )
 
 from htmltools import TagChild, TagList
+from starlette.background import BackgroundTask
 from starlette.requests import HTTPConnection, Request
-from starlette.responses import HTMLResponse, PlainTextResponse, StreamingResponse
+from starlette.responses import (
+    HTMLResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 from starlette.types import ASGIApp
 
 from .. import _utils, reactive, render
 from .._connection import Connection, ConnectionClosed
 from .._deprecated import warn_deprecated
 from .._docstring import add_example
-from .._fileupload import FileInfo, FileUploadManager
+from .._fileupload import (
+    FileInfo,
+    FileUploadManager,
+    UploadOffsetError,
+    iter_file_chunks,
+)
 from .._namespaces import Id, ResolvedId, Root
 from .._typing_extensions import NotRequired, TypedDict
 from .._utils import wrap_async
 from ..http_staticfiles import FileResponse
 from ..input_handler import input_handlers
-from ..reactive import Effect_, Value, effect, flush, isolate
+from ..reactive import Context, Effect_, Value, effect, flush, isolate
 from ..reactive._core import lock, on_flushed
 from ..render.renderer import Renderer, RendererT
 from ..types import (
+    MISSING_TYPE,
     Jsonifiable,
     SafeException,
     SilentCancelOutputException,
     SilentException,
     SilentOperationInProgressException,
 )
+from ._download import encode_chunks, find_input_reads, spool_to_file
+from ._memory import SessionMemoryUsage, approx_size
 from ._utils import RenderedDeps, read_thunk_opt, session_context
 
 if TYPE_CHECKING:
@@ -127,6 +144,74 @@ class DownloadInfo:
     content_type: Optional[Callable[[], str] | str]
     handler: DownloadHandler
     encoding: str
+    resumable: bool = False
+    cache: bool = False
+
+
+def _download_headers(filename: str) -> dict[str, str]:
+    content_disposition_filename = urllib.parse.quote(filename)
+    if content_disposition_filename != filename:
+        content_disposition = (
+            f"attachment; filename*=utf-8''{content_disposition_filename}"
+        )
+    else:
+        content_disposition = f'attachment; filename="{filename}"'
+    return {
+        "Content-Disposition": content_disposition,
+        "Cache-Control": "no-store",
+    }
+
+
+def _file_download_response(
+    request: Request,
+    path: str,
+    headers: dict[str, str],
+    content_type: Optional[str],
+    etag: Optional[str] = None,
+    *,
+    temporary: bool = False,
+) -> Response:
+    # Files can be revalidated (and resumed, with range requests) using their ETag; if
+    # one isn't given, FileResponse computes one from the file's mtime and size
+    headers = {**headers, "Cache-Control": "private, no-cache"}
+    if etag is not None:
+        headers["ETag"] = etag
+        if _utils.etag_matches(request.headers.get("if-none-match"), etag):
+            if temporary:
+                os.unlink(path)
+            return Response(status_code=304, headers=headers)
+    return FileResponse(
+        Path(path),
+        headers=headers,
+        media_type=content_type,
+        background=BackgroundTask(os.unlink, path) if temporary else None,
+    )
+
+
+@dataclasses.dataclass
+class MessageStats:
+    """
+    Counters of the messages sent from the server to the browser.
+
+    Sizes are measured in characters of serialized JSON.
+    """
+
+    n_messages: int = 0
+    """Number of messages sent."""
+    n_chars: int = 0
+    """Total size of all messages sent."""
+    largest_message: int = 0
+    """Size of the largest message sent."""
+    n_split_outputs: int = 0
+    """Number of output values sent in their own message (see `App.split_output_size`)."""
+    n_oversized_outputs: int = 0
+    """Number of output values not sent as they exceeded `App.max_output_size`."""
+
+    def _record_message(self, size: int) -> None:
+        self.n_messages += 1
+        self.n_chars += size
+        if size > self.largest_message:
+            self.largest_message = size
 
 
 class OutBoundMessageQueues:
@@ -156,6 +241,25 @@ class OutBoundMessageQueues:
         self.input_messages.append({"id": id, "message": message})
 
 
+def _values_message_str(
+    values: list[str],
+    input_messages: list[dict[str, Any]],
+    errors: dict[str, Any],
+) -> str:
+    """
+    Assemble a `values` message from already serialized `"<id>":<value>` entries.
+    """
+    return (
+        '{"values": {'
+        + ", ".join(values)
+        + '}, "inputMessages": '
+        + json.dumps(input_messages)
+        + ', "errors": '
+        + json.dumps(errors)
+        + "}"
+    )
+
+
 # ======================================================================================
 # Session abstract base class
 # ======================================================================================
@@ -420,6 +524,29 @@ class Session(ABC):
             The URL path for the route.
         """
 
+    @abstractmethod
+    def upload_chunks(self, id: str, index: int = 0) -> AsyncIterator[bytes]:
+        """
+        Read a file uploaded with a file input, while it's being uploaded.
+
+        If the browser said which input an upload is for when the upload started, the
+        data can be processed as it arrives, before the value of the input is set.
+        Otherwise (or once the upload is complete), the file of the input's current
+        value is read.
+
+        Parameters
+        ----------
+        id
+            The id of the :func:`~shiny.ui.input_file` input.
+        index
+            Which of the uploaded files to read (for inputs with ``multiple=True``).
+
+        Returns
+        -------
+        :
+            An async iterator of the file's contents, in chunks.
+        """
+
     @abstractmethod
     def set_message_handler(
         self,
@@ -476,6 +603,9 @@ class Session(ABC):
     @abstractmethod
     def _decrement_busy_count(self) -> None: ...
 
+    @abstractmethod
+    def _register_calc(self, calc: reactive.Calc_[Any]) -> None: ...
+
 
 # ======================================================================================
 # AppSession
@@ -540,6 +670,7 @@ class AppSession(Session):
                 print("Error parsing credentials header: " + str(e), file=sys.stderr)
 
         self._outbound_message_queues = OutBoundMessageQueues()
+        self._message_stats = MessageStats()
 
         self._file_upload_manager: FileUploadManager = FileUploadManager()
         self._on_ended_callbacks = _utils.AsyncCallbacks()
@@ -552,6 +683,12 @@ class AppSession(Session):
         self._flush_callbacks = _utils.AsyncCallbacks()
         self._flushed_callbacks = _utils.AsyncCallbacks()
 
+        # Reactive calcs created within this session, so that their cached values can be
+        # accounted for (and dropped when the session is idle).
+        self._calcs: weakref.WeakSet[reactive.Calc_[Any]] = weakref.WeakSet()
+        # Time (from `time.monotonic()`) of the last message received from the client.
+        self._last_activity: float = time.monotonic()
+
     def _register_session_end_callbacks(self) -> None:
         # This is to be called from the initialization. It registers functions
         # that are called when a session ends.
@@ -595,8 +732,13 @@ class AppSession(Session):
                     }
                 )
 
+                if self.app.session_idle_timeout is not None:
+                    idle_task = asyncio.create_task(self._watch_idle())
+                    stack.callback(idle_task.cancel)
+
                 while True:
                     message: str = await self._conn.receive()
+                    self._last_activity = time.monotonic()
                     if self._debug:
                         print("RECV: " + message, flush=True)
 
@@ -676,6 +818,78 @@ class AppSession(Session):
             finally:
                 await self._run_session_end_tasks()
 
+    async def _watch_idle(self) -> None:
+        # Apply `app.session_idle_action` once the session has not received a message
+        # for `app.session_idle_timeout` seconds. Caches are dropped once per idle
+        # period; they are recalculated on demand when the client becomes active again.
+        dropped_at: float | None = None
+        while (timeout := self.app.session_idle_timeout) is not None:
+            idle = time.monotonic() - self._last_activity
+            if idle < timeout:
+                await asyncio.sleep(timeout - idle)
+                continue
+
+            if self.app.session_idle_action == "close":
+                if self._debug:
+                    print(f"Closing idle session: {self.id}", flush=True)
+                # Shield so that the session end tasks aren't interrupted when this task
+                # is cancelled by the (now closing) session.
+                await asyncio.shield(self.close())
+                return
+
+            if dropped_at != self._last_activity:
+                dropped_at = self._last_activity
+                async with lock():
+                    n_dropped = self._drop_caches()
+                if self._debug:
+                    print(
+                        f"Dropped {n_dropped} cached values of idle session: {self.id}",
+                        flush=True,
+                    )
+            await asyncio.sleep(timeout)
+
+    def _drop_caches(self) -> int:
+        """
+        Drop the cached values of the session's reactive calcs. Returns the number of
+        values that were dropped.
+        """
+        return sum(calc._drop_cached_value() for calc in list(self._calcs))
+
+    def _register_calc(self, calc: reactive.Calc_[Any]) -> None:
+        self._calcs.add(calc)
+
+    def memory_usage(self) -> SessionMemoryUsage:
+        """
+        Approximate the memory retained by this session.
+
+        Returns
+        -------
+        :
+            The approximate size (in bytes) of the session's input values, the cached
+            values of its reactive calcs, and the reactive values held by its output
+            renderers.
+        """
+        inputs: set[int] = set()
+        calcs: set[int] = set()
+        outputs: set[int] = set()
+        usage = SessionMemoryUsage()
+
+        for value in list(self.input._map.values()):
+            usage.inputs += approx_size(value._value, inputs)
+
+        for calc in list(self._calcs):
+            usage.calcs += approx_size(calc._value, calcs)
+
+        for info in list(self.output._outputs.values()):
+            for attr in list(vars(info.renderer).values()):
+                if isinstance(attr, reactive.Value):
+                    usage.outputs += approx_size(
+                        attr._value,  # pyright: ignore[reportUnknownMemberType]
+                        outputs,
+                    )
+
+        return usage
+
     def _manage_inputs(self, data: dict[str, object]) -> None:
         for key, val in data.items():
             keys = key.split(":")
@@ -754,7 +968,9 @@ class AppSession(Session):
     def _init_message_handlers(self):
         # TODO-future; Make sure these methods work within MockSession
 
-        async def uploadInit(file_infos: list[FileInfo]) -> dict[str, Jsonifiable]:
+        async def uploadInit(
+            file_infos: list[FileInfo], input_id: Optional[str] = None
+        ) -> dict[str, Jsonifiable]:
             with session_context(self):
                 if self._debug:
                     print("Upload init: " + str(file_infos), flush=True)
@@ -764,7 +980,9 @@ class AppSession(Session):
                     if fi["type"] == "":
                         fi["type"] = _utils.guess_mime_type(fi["name"])
 
-                job_id = self._file_upload_manager.create_upload_operation(file_infos)
+                job_id = self._file_upload_manager.create_upload_operation(
+                    file_infos, input_id
+                )
                 worker_id = ""
                 return {
                     "jobId": job_id,
@@ -806,7 +1024,7 @@ class AppSession(Session):
     async def _handle_request_impl(
         self, request: Request, action: str, subpath: Optional[str]
     ) -> ASGIApp:
-        if action == "upload" and request.method == "POST":
+        if action == "upload" and request.method in ("POST", "HEAD"):
             if subpath is None or subpath == "":
                 return HTMLResponse("<h1>Bad Request</h1>", 400)
 
@@ -815,103 +1033,157 @@ class AppSession(Session):
             if not upload_op:
                 return HTMLResponse("<h1>Bad Request</h1>", 400)
 
-            # The FileUploadOperation can have multiple files; each one will
-            # have a separate POST request. Each call to  `with upload_op` will
-            # open up each file (in sequence) for writing.
-            with upload_op:
-                async for chunk in request.stream():
-                    upload_op.write_chunk(chunk)
+            file_index = request.query_params.get("file")
+            if file_index is None:
+                if request.method != "POST":
+                    return HTMLResponse("<h1>Bad Request</h1>", 400)
+                # The FileUploadOperation can have multiple files; each one will
+                # have a separate POST request, which uploads the next file.
+                await upload_op.write_file(request.stream())
+                return PlainTextResponse("OK", 200)
+
+            # A piece of a file, or a query of how much of it has been received (see
+            # the comments in _fileupload.py)
+            try:
+                index = int(file_index)
+                if request.method == "HEAD":
+                    received = upload_op.bytes_received(index)
+                else:
+                    offset = int(request.query_params.get("offset", "0"))
+                    received = await upload_op.write_file_piece(
+                        index, offset, request.stream()
+                    )
+            except UploadOffsetError as e:
+                return PlainTextResponse(
+                    str(e),
+                    409,
+                    headers={"Upload-Offset": str(upload_op.bytes_received(index))},
+                )
+            except (ValueError, IndexError):
+                return HTMLResponse("<h1>Bad Request</h1>", 400)
 
-            return PlainTextResponse("OK", 200)
+            return PlainTextResponse(
+                "OK", 200, headers={"Upload-Offset": str(received)}
+            )
 
-        elif action == "download" and request.method == "GET" and subpath:
+        elif action == "download" and request.method in ("GET", "HEAD") and subpath:
             download_id = subpath
             if download_id in self._downloads:
-                with session_context(self):
-                    with isolate():
-                        download = self._downloads[download_id]
-                        filename = read_thunk_opt(download.filename)
-                        content_type = read_thunk_opt(download.content_type)
-                        contents = download.handler()
-
-                        if filename is None:
+                download = self._downloads[download_id]
+
+                cache = self.app._get_download_cache() if download.cache else None
+                if cache is not None:
+                    entry = cache.get(download_id, self._read_input_for_cache)
+                    if entry is not None:
+                        return _file_download_response(
+                            request,
+                            entry.path,
+                            _download_headers(entry.filename),
+                            entry.content_type,
+                            entry.etag,
+                        )
+
+                # With a cache, the handler runs in a reactive context of its own,
+                # so that the inputs it reads (directly or through calcs) can be
+                # found afterwards. Otherwise, it runs isolated.
+                cache_ctx = Context() if cache is not None else None
+
+                def reactive_scope() -> typing.ContextManager[None]:
+                    return cache_ctx() if cache_ctx is not None else isolate()
+
+                try:
+                    with session_context(self):
+                        with reactive_scope():
+                            filename = read_thunk_opt(download.filename)
+                            content_type = read_thunk_opt(download.content_type)
+                            contents = download.handler()
+
+                            if filename is None:
+                                if isinstance(contents, str):
+                                    filename = os.path.basename(contents)
+                                else:
+                                    warnings.warn(
+                                        "Unable to infer a filename for the "
+                                        f"'{download_id}' download handler; please "
+                                        "use @render.download(filename=) to specify "
+                                        "one manually",
+                                        SessionWarning,
+                                        stacklevel=2,
+                                    )
+                                    filename = download_id
+
+                            if content_type is None:
+                                content_type = _utils.guess_mime_type(filename)
+                            headers = _download_headers(filename)
+
                             if isinstance(contents, str):
-                                filename = os.path.basename(contents)
-                            else:
-                                warnings.warn(
-                                    "Unable to infer a filename for the "
-                                    f"'{download_id}' download handler; please use "
-                                    "@render.download(filename=) to specify one "
-                                    "manually",
-                                    SessionWarning,
-                                    stacklevel=2,
+                                # contents is the path to a file. FileResponse
+                                # supports range requests, so interrupted downloads
+                                # can be resumed.
+                                return _file_download_response(
+                                    request, contents, headers, content_type
                                 )
-                                filename = download_id
 
-                        if content_type is None:
-                            content_type = _utils.guess_mime_type(filename)
-                        content_disposition_filename = urllib.parse.quote(filename)
-                        if content_disposition_filename != filename:
-                            content_disposition = f"attachment; filename*=utf-8''{content_disposition_filename}"
-                        else:
-                            content_disposition = f'attachment; filename="{filename}"'
-                        headers = {
-                            "Content-Disposition": content_disposition,
-                            "Cache-Control": "no-store",
-                        }
-
-                        if isinstance(contents, str):
-                            # contents is the path to a file
-                            return FileResponse(
-                                Path(contents),
-                                headers=headers,
-                                media_type=content_type,
+                    # Need to wrap the app-author-provided iterator in a callback that
+                    # installs the appropriate context mgrs. We already use these
+                    # context mgrs above, but the iterators aren't invoked until after
+                    # handle_request() returns. Sync iterators are run in a thread, so
+                    # that generating a large file doesn't block the event loop (and
+                    # all other sessions); the thread inherits the contexts.
+                    async def wrap_content() -> AsyncIterable[bytes]:
+                        with session_context(self):
+                            with reactive_scope():
+                                async for chunk in encode_chunks(
+                                    contents, download.encoding
+                                ):
+                                    yield chunk
+
+                    wrapped_contents = wrap_content()
+
+                    if download.resumable or cache is not None:
+                        # Generate the whole file first, so that it can be sent with a
+                        # content-hash ETag, and with support for range requests. As
+                        # long as the handler generates the same content again, an
+                        # interrupted download can then be resumed, and a repeated one
+                        # is answered with a 304.
+                        path, etag = await spool_to_file(wrapped_contents)
+                        if cache_ctx is not None and cache is not None:
+                            input_ids = find_input_reads(
+                                cache_ctx, self.input._map, self._calcs
                             )
-
-                        wrapped_contents: AsyncIterable[bytes]
-
-                        if isinstance(contents, AsyncIterable):
-                            # Need to wrap the app-author-provided iterator in a
-                            # callback that installs the appropriate context mgrs.
-                            # We already use this context mgrs further up in the
-                            # implementation of handle_request(), but the iterators
-                            # aren't invoked until after handle_request() returns.
-                            async def wrap_content_async() -> AsyncIterable[bytes]:
-                                with session_context(self):
-                                    with isolate():
-                                        async for chunk in contents:
-                                            if isinstance(chunk, str):
-                                                yield chunk.encode(download.encoding)
-                                            else:
-                                                yield chunk
-
-                            wrapped_contents = wrap_content_async()
-
-                        else:  # isinstance(contents, Iterable):
-
-                            async def wrap_content_sync() -> AsyncIterable[bytes]:
-                                with session_context(self):
-                                    with isolate():
-                                        for chunk in contents:
-                                            if isinstance(chunk, str):
-                                                yield chunk.encode(download.encoding)
-                                            else:
-                                                yield chunk
-
-                            wrapped_contents = wrap_content_sync()
-
-                        # In streaming downloads, we send a 200 response, but if an
-                        # error occurs in the middle of it, the client needs to know.
-                        # With chunked encoding, the client will know if an error occurs
-                        # if it does not receive a terminating (empty) chunk.
-                        headers["Transfer-Encoding"] = "chunked"
-
-                        return StreamingResponse(
-                            wrapped_contents,
-                            200,
-                            headers=headers,
-                            media_type=content_type,  # type: ignore
+                            entry = cache.add(
+                                download_id,
+                                input_ids,
+                                [self._read_input_for_cache(id) for id in input_ids],
+                                path,
+                                etag,
+                                filename,
+                                content_type,
+                            )
+                            if entry is not None:
+                                return _file_download_response(
+                                    request, entry.path, headers, content_type, etag
+                                )
+                        return _file_download_response(
+                            request, path, headers, content_type, etag, temporary=True
                         )
+                finally:
+                    if cache_ctx is not None:
+                        # Stop depending on the inputs and calcs that were read
+                        cache_ctx.invalidate()
+
+                # In streaming downloads, we send a 200 response, but if an error
+                # occurs in the middle of it, the client needs to know. With chunked
+                # encoding, the client will know if an error occurs if it does not
+                # receive a terminating (empty) chunk.
+                headers["Transfer-Encoding"] = "chunked"
+
+                return StreamingResponse(
+                    wrapped_contents,
+                    200,
+                    headers=headers,
+                    media_type=content_type,  # type: ignore
+                )
 
         elif action == "dynamic_route" and request.method == "GET" and subpath:
             name = subpath
@@ -955,7 +1227,11 @@ class AppSession(Session):
         await self._send_message({"custom": {type: message}})
 
     async def _send_message(self, message: dict[str, object]) -> None:
-        message_str = json.dumps(message)
+        await self._send_message_str(json.dumps(message))
+
+    async def _send_message_str(self, message_str: str) -> None:
+        self._message_stats._record_message(len(message_str))
+        self.app.message_stats._record_message(len(message_str))
         if self._debug:
             print(
                 "SEND: "
@@ -1009,22 +1285,66 @@ class AppSession(Session):
             await self._flush_callbacks.invoke()
 
         try:
-            omq = self._outbound_message_queues
-
-            message: dict[str, object] = {
-                "values": omq.values,
-                "inputMessages": omq.input_messages,
-                "errors": omq.errors,
-            }
-
             try:
-                await self._send_message(message)
+                await self._send_outbound_message_queues(self._outbound_message_queues)
             finally:
                 self._outbound_message_queues.reset()
         finally:
             with session_context(self):
                 await self._flushed_callbacks.invoke()
 
+    async def _send_outbound_message_queues(self, omq: OutBoundMessageQueues) -> None:
+        """
+        Send the queued output values, input messages, and errors.
+
+        Each output value is serialized once. Values larger than
+        `App.split_output_size` are sent in their own message after the message
+        containing all other values, so that a single large output (e.g. a large data
+        frame or a hi-DPI plot) does not hold back smaller outputs. Values larger than
+        `App.max_output_size` are replaced by an output error.
+        """
+        max_size = self.app.max_output_size
+        split_size = self.app.split_output_size
+
+        small_values: list[str] = []
+        large_values: list[str] = []
+        errors = omq.errors
+        for id, value in omq.values.items():
+            value_str = json.dumps(value)
+            value_size = len(value_str)
+
+            if max_size is not None and value_size > max_size:
+                self._message_stats.n_oversized_outputs += 1
+                self.app.message_stats.n_oversized_outputs += 1
+                if errors is omq.errors:
+                    errors = dict(omq.errors)
+                errors[id] = {
+                    "message": (
+                        f"Output value is too large to send ({value_size} characters; "
+                        f"the limit is {max_size})."
+                    ),
+                    "call": None,
+                    "type": None,
+                }
+                continue
+
+            entry = json.dumps(id) + ":" + value_str
+            if split_size is not None and value_size > split_size:
+                large_values.append(entry)
+            else:
+                small_values.append(entry)
+
+        await self._send_message_str(
+            _values_message_str(small_values, omq.input_messages, errors)
+        )
+
+        for entry in large_values:
+            self._message_stats.n_split_outputs += 1
+            self.app.message_stats.n_split_outputs += 1
+            # Let other pending (small) messages be sent before the next large value
+            await asyncio.sleep(0)
+            await self._send_message_str(_values_message_str([entry], [], {}))
+
     def _increment_busy_count(self) -> None:
         self._busy_count += 1
         if self._busy_count == 1:
@@ -1087,6 +1407,25 @@ class AppSession(Session):
         nonce = _utils.rand_hex(8)
         return f"session/{urllib.parse.quote(self.id)}/dynamic_route/{urllib.parse.quote(name)}?nonce={urllib.parse.quote(nonce)}"
 
+    def _read_input_for_cache(self, id: str) -> tuple[bool, object]:
+        # Whether an input has a value, and the value, without taking a dependency on it
+        value = self.input._map.get(id)
+        if value is None or isinstance(value._value, MISSING_TYPE):
+            return (False, None)
+        return (True, value._value)
+
+    async def upload_chunks(self, id: str, index: int = 0) -> AsyncIterator[bytes]:
+        upload_op = self._file_upload_manager.get_input_operation(id)
+        if upload_op is not None:
+            async for chunk in upload_op.iter_chunks(index):
+                yield chunk
+            return
+
+        with isolate():
+            file_infos: list[FileInfo] = self.input[ResolvedId(id)]()
+        async for chunk in iter_file_chunks(file_infos[index]["datapath"]):
+            yield chunk
+
     def set_message_handler(
         self,
         name: str,
@@ -1115,8 +1454,7 @@ class AppSession(Session):
         deps: list[dict[str, Any]] = []
         for dep in res["dependencies"]:
             self.app._register_web_dependency(dep)
-            dep_dict = dep.as_dict(lib_prefix=self.app.lib_prefix)
-            deps.append(dep_dict)
+            deps.append(self.app._dependency_dict(dep))
 
         return {"deps": deps, "html": res["html"]}
 
@@ -1221,6 +1559,9 @@ class SessionProxy(Session):
     def _decrement_busy_count(self) -> None:
         self._parent._decrement_busy_count()
 
+    def _register_calc(self, calc: reactive.Calc_[Any]) -> None:
+        self._parent._register_calc(calc)
+
     def set_message_handler(
         self,
         name: str,
@@ -1265,6 +1606,9 @@ class SessionProxy(Session):
     def dynamic_route(self, name: str, handler: DynamicRouteHandler) -> str:
         return self._parent.dynamic_route(self.ns(name), handler)
 
+    def upload_chunks(self, id: str, index: int = 0) -> AsyncIterator[bytes]:
+        return self._parent.upload_chunks(self.ns(id), index)
+
     async def _unhandled_error(self, e: Exception) -> None:
         await self._parent._unhandled_error(e)
 
@@ -3,6 +3,8 @@ Tools for creating user interfaces including: custom components, HTML components
 layout helpers, page-level containers, and more.
 """
 
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+
 from htmltools import (
     HTML,
     Tag,
@@ -31,6 +33,8 @@ from htmltools import (
     tags,
 )
 
+from .._lazy import lazy_attrs as _lazy_attrs
+
 # The css module is for internal use, so we won't re-export it.
 from . import css  # noqa: F401  # pyright: ignore[reportUnusedImport]
 
@@ -66,7 +70,6 @@ from ._card import (
     card_footer,
     card_header,
 )
-from ._chat import Chat, chat_ui
 from ._download_button import download_button, download_link
 from ._include_helpers import include_css, include_js
 from ._input_action_button import input_action_button, input_action_link
@@ -76,14 +79,11 @@ from ._input_check_radio import (
     input_radio_buttons,
     input_switch,
 )
-from ._input_dark_mode import input_dark_mode, update_dark_mode
 from ._input_date import input_date, input_date_range
-from ._input_file import input_file
 from ._input_numeric import input_numeric
 from ._input_password import input_password
 from ._input_select import input_select, input_selectize
 from ._input_slider import AnimationOptions, SliderStepArg, SliderValueArg, input_slider
-from ._input_task_button import bind_task_button, input_task_button
 from ._input_text import input_text, input_text_area
 from ._input_update import (
     update_action_button,
@@ -105,11 +105,8 @@ from ._input_update import (
     update_text_area,
     update_tooltip,
 )
-from ._insert import insert_ui, remove_ui
 from ._layout import layout_column_wrap
 from ._layout_columns import layout_columns
-from ._markdown import markdown
-from ._modal import modal, modal_button, modal_remove, modal_show
 from ._navs import (
     nav_control,
     nav_menu,
@@ -125,7 +122,6 @@ from ._navs import (
     navset_tab,
     navset_underline,
 )
-from ._notification import notification_remove, notification_show
 from ._output import (
     output_code,
     output_image,
@@ -146,8 +142,6 @@ from ._page import (
     page_sidebar,
 )
 from ._plot_output_opts import brush_opts, click_opts, dblclick_opts, hover_opts
-from ._popover import popover
-from ._progress import Progress
 from ._sidebar import (
     Sidebar,
     layout_sidebar,
@@ -157,16 +151,64 @@ from ._sidebar import (
 from ._theme import Theme
 from ._tooltip import tooltip
 from ._utils import js_eval
-from ._valuebox import (
-    ShowcaseLayout,
-    ValueBoxTheme,
-    showcase_bottom,
-    showcase_left_center,
-    showcase_top_right,
-    value_box,
-    value_box_theme,
-)
-from .dataframe import output_data_frame
+
+if _TYPE_CHECKING:
+    from ._chat import Chat, chat_ui
+    from ._input_dark_mode import input_dark_mode, update_dark_mode
+    from ._input_file import input_file
+    from ._input_task_button import bind_task_button, input_task_button
+    from ._insert import insert_ui, remove_ui
+    from ._markdown import markdown
+    from ._modal import modal, modal_button, modal_remove, modal_show
+    from ._notification import notification_remove, notification_show
+    from ._popover import popover
+    from ._progress import Progress
+    from ._valuebox import (
+        ShowcaseLayout,
+        ValueBoxTheme,
+        showcase_bottom,
+        showcase_left_center,
+        showcase_top_right,
+        value_box,
+        value_box_theme,
+    )
+    from .dataframe import output_data_frame
+else:
+    # Components that most apps don't use are imported when they're first accessed,
+    # to keep `import shiny` fast
+    __getattr__, __dir__ = _lazy_attrs(
+        __name__,
+        globals(),
+        {
+            "Chat": "._chat",
+            "chat_ui": "._chat",
+            "input_dark_mode": "._input_dark_mode",
+            "update_dark_mode": "._input_dark_mode",
+            "input_file": "._input_file",
+            "bind_task_button": "._input_task_button",
+            "input_task_button": "._input_task_button",
+            "insert_ui": "._insert",
+            "remove_ui": "._insert",
+            "markdown": "._markdown",
+            "modal": "._modal",
+            "modal_button": "._modal",
+            "modal_remove": "._modal",
+            "modal_show": "._modal",
+            "notification_remove": "._notification",
+            "notification_show": "._notification",
+            "popover": "._popover",
+            "Progress": "._progress",
+            "ShowcaseLayout": "._valuebox",
+            "ValueBoxTheme": "._valuebox",
+            "showcase_bottom": "._valuebox",
+            "showcase_left_center": "._valuebox",
+            "showcase_top_right": "._valuebox",
+            "value_box": "._valuebox",
+            "value_box_theme": "._valuebox",
+            "output_data_frame": ".dataframe",
+            "dataframe": ".dataframe",
+        },
+    )
 
 __all__ = (
     # _bootstrap
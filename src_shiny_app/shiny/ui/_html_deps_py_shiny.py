@@ -61,6 +61,15 @@ def page_output_dependency() -> HTMLDependency:
     )
 
 
+def ui_diff_dependency() -> HTMLDependency:
+    return HTMLDependency(
+        "shiny-ui-diff-output",
+        __version__,
+        source={"package": "shiny", "subdir": "www/py-shiny/ui-diff"},
+        script={"src": "ui-diff.js", "type": "module"},
+    )
+
+
 def spin_dependency() -> HTMLDependency:
     return HTMLDependency(
         "shiny-spin",
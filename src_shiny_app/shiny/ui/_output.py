@@ -17,6 +17,7 @@ from htmltools import Tag, TagAttrValue, TagFunction, css, div, tags
 from .._docstring import add_example, no_example
 from .._namespaces import resolve_id
 from ..types import MISSING, MISSING_TYPE
+from ._html_deps_py_shiny import ui_diff_dependency
 from ._plot_output_opts import (
     BrushOpts,
     ClickOpts,
@@ -380,6 +381,8 @@ def output_ui(
     container: Optional[TagFunction] = None,
     fill: bool = False,
     fillable: bool = False,
+    *,
+    diff: bool = False,
     **kwargs: TagAttrValue,
 ) -> Tag:
     """
@@ -399,6 +402,9 @@ def output_ui(
     fillable
         Whether or not the UI output area should be considered a fillable (i.e.,
         flexbox) container.
+    diff
+        Whether the output is updated in place. This must match the ``diff`` argument
+        of the corresponding :class:`~shiny.render.ui`.
     **kwargs
         Attributes to be applied to the output container.
 
@@ -415,7 +421,15 @@ def output_ui(
 
     if not container:
         container = tags.span if inline else tags.div
-    res = container({"class": "shiny-html-output"}, id=resolve_id(id), **kwargs)
+    if diff:
+        res = container(
+            {"class": "shiny-html-diff-output"},
+            ui_diff_dependency(),
+            id=resolve_id(id),
+            **kwargs,
+        )
+    else:
+        res = container({"class": "shiny-html-output"}, id=resolve_id(id), **kwargs)
     if fill:
         res = as_fill_item(res)
     if fillable:
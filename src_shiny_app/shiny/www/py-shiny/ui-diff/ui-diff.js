@@ -0,0 +1,114 @@
+// Output binding for `@render.ui(diff=True)`. The first value (and any value after an
+// error) is the whole UI, like a regular UI output; later values are lists of patches
+// that update the DOM in place, so unchanged inputs and outputs are left alone.
+var RENDERED = Symbol("shinyUiDiffRendered");
+function markRendered(nodes) {
+  for (const node of nodes) {
+    if (node.nodeType !== Node.ELEMENT_NODE)
+      continue;
+    node[RENDERED] = true;
+    for (const child of node.querySelectorAll("*"))
+      child[RENDERED] = true;
+  }
+}
+function parseHtml(html) {
+  const nodes = $.parseHTML(html, document, true) || [];
+  markRendered(nodes);
+  return nodes;
+}
+function renderedChildren(el) {
+  return Array.from(el.children).filter((child) => child[RENDERED]);
+}
+function findNode(el, path, tag) {
+  let node = el;
+  for (const i of path) {
+    node = renderedChildren(node)[i];
+    if (!node)
+      return null;
+  }
+  if (tag !== void 0 && node.nodeName.toLowerCase() !== tag)
+    return null;
+  return node;
+}
+var UiDiffOutputBinding = class extends Shiny.OutputBinding {
+  find(scope) {
+    return $(scope).find(".shiny-html-diff-output");
+  }
+  onValueError(el, err) {
+    Shiny.unbindAll(el);
+    this.renderError(el, err);
+  }
+  async renderValue(el, data) {
+    if (data === null || data.patches === void 0) {
+      await this._renderAll(el, data);
+      return;
+    }
+    await Shiny.renderDependenciesAsync(data.deps);
+    for (const patch of data.patches) {
+      if (!this._applyPatch(el, patch)) {
+        // The DOM was changed by something else; ask the server for the whole UI
+        Shiny.setInputValue(el.id + "__ui_diff_resync", Date.now(), {
+          priority: "event"
+        });
+        return;
+      }
+    }
+    Shiny.initializeInputs(el);
+    await Shiny.bindAll(el);
+  }
+  async _renderAll(el, data) {
+    Shiny.unbindAll(el);
+    $(el).empty();
+    if (data !== null) {
+      await Shiny.renderDependenciesAsync(data.deps);
+      $(el).append(parseHtml(data.html));
+    }
+    Shiny.initializeInputs(el);
+    await Shiny.bindAll(el);
+  }
+  _applyPatch(el, patch) {
+    if (patch.op === "insert") {
+      const parent = findNode(el, patch.path);
+      if (!parent)
+        return false;
+      const before = renderedChildren(parent)[patch.index];
+      const nodes = parseHtml(patch.html);
+      if (before)
+        $(before).before(nodes);
+      else
+        $(parent).append(nodes);
+      return true;
+    }
+    const node = findNode(el, patch.path, patch.tag);
+    if (!node || node === el)
+      return false;
+    switch (patch.op) {
+      case "attrs":
+        for (const [name, value] of Object.entries(patch.set))
+          node.setAttribute(name, value);
+        for (const name of patch.remove)
+          node.removeAttribute(name);
+        return true;
+      case "text":
+        node.textContent = patch.text;
+        return true;
+      case "replace":
+        Shiny.unbindAll(node, true);
+        $(node).replaceWith(parseHtml(patch.html));
+        return true;
+      case "remove":
+        Shiny.unbindAll(node, true);
+        $(node).remove();
+        return true;
+      default:
+        return false;
+    }
+  }
+};
+Shiny.outputBindings.register(
+  new UiDiffOutputBinding(),
+  "shinyUiDiffOutputBinding"
+);
+export {
+  UiDiffOutputBinding
+};
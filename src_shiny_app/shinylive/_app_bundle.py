@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import re
+import urllib.parse
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from ._app_json import FileContentJson
+    from ._manifest import ExportManifest
+
+# The compressed app files, next to app.json
+APP_BUNDLE_FILE = "app.json.gz"
+# Large binary files are left out of the bundle and written to this directory, next to
+# app.json, so the browser can fetch them as they are (without base64 encoding), in
+# parallel with the bundle
+LAZY_FILES_DIR = "app-files"
+LAZY_FILE_MIN_SIZE = 64 * 1024
+# A bundle up to this size (compressed) is put in index.html, which saves a request
+INLINE_BUNDLE_MAX_SIZE = 32 * 1024
+
+# The part of the export template's index.html that loads app.json and runs the app
+_RUN_EXPORTED_APP_RE = re.compile(
+    r"""import\s*\{\s*runExportedApp\s*\}\s*from\s*(["'])(?P<src>[^"']+)\1\s*;?\s*"""
+    r"""runExportedApp\(\s*(?P<options>\{.*?\})\s*\)\s*;?""",
+    re.DOTALL,
+)
+
+# Loads the bundle and the large files, and runs the app like runExportedApp() does.
+# Browsers without DecompressionStream, or a failure, fall back to app.json.
+_LOADER_JS = """import { runApp, runExportedApp } from %(src)s;
+      const options = %(options)s;
+      const inlineBundle = %(inline_bundle)s;
+      const lazyFiles = %(lazy_files)s;
+      const appModes = %(app_modes)s;
+
+      async function fetchBytes(url) {
+        const response = await fetch(url);
+        if (!response.ok) {
+          throw new Error(`HTTP error loading ${url}: ${response.status}`);
+        }
+        return new Uint8Array(await response.arrayBuffer());
+      }
+
+      async function gunzip(data) {
+        // Hosts that send .gz files with "Content-Encoding: gzip" have already had
+        // them decompressed by the browser
+        if (data[0] !== 0x1f || data[1] !== 0x8b) return data;
+        const stream = new Blob([data])
+          .stream()
+          .pipeThrough(new DecompressionStream("gzip"));
+        return new Uint8Array(await new Response(stream).arrayBuffer());
+      }
+
+      async function loadAppFiles() {
+        const lazy = Promise.all(
+          lazyFiles.map(async ({ name, url }) => ({
+            name,
+            type: "binary",
+            content: await fetchBytes(url),
+          }))
+        );
+        const data =
+          inlineBundle !== null
+            ? Uint8Array.from(atob(inlineBundle), (c) => c.charCodeAt(0))
+            : await fetchBytes(%(bundle_url)s);
+        const files = JSON.parse(new TextDecoder().decode(await gunzip(data)));
+        return files.concat(await lazy);
+      }
+
+      if (typeof DecompressionStream === "undefined") {
+        runExportedApp(options);
+      } else {
+        loadAppFiles().then(
+          (appFiles) => {
+            const appRoot = document.getElementById(options.id);
+            const urlParams = new URLSearchParams(window.location.search);
+            let appMode = urlParams.get("_shinylive-mode") ?? "viewer";
+            if (!appModes.includes(appMode)) appMode = "viewer";
+            runApp(appRoot, appMode, { startFiles: appFiles }, options.appEngine);
+          },
+          (e) => {
+            console.warn("[shinylive] Loading the compressed app failed:", e);
+            runExportedApp(options);
+          }
+        );
+      }"""
+
+# The app modes that runExportedApp() accepts
+_APP_MODES = [
+    "examples-editor-terminal-viewer",
+    "editor-terminal-viewer",
+    "editor-terminal",
+    "editor-viewer",
+    "editor-cell",
+    "viewer",
+]
+
+
+class AppBundle(NamedTuple):
+    # The gzipped JSON of the app files, except the lazy ones
+    data: bytes
+    # The names and contents of the large binary files
+    lazy_files: list[tuple[str, bytes]]
+    # Whether the data goes in index.html instead of APP_BUNDLE_FILE
+    inline: bool
+
+
+def make_app_bundle(files: list[FileContentJson]) -> AppBundle:
+    """
+    Compress the files of an app, with large binary files split out (see
+    `LAZY_FILE_MIN_SIZE`).
+    """
+    bundle_files: list[FileContentJson] = []
+    lazy_files: list[tuple[str, bytes]] = []
+    for file in files:
+        if file["type"] == "binary":
+            content = base64.b64decode(file["content"])
+            if len(content) >= LAZY_FILE_MIN_SIZE:
+                lazy_files.append((file["name"], content))
+                continue
+        bundle_files.append(file)
+
+    # mtime=0 so that the same files always give the same bundle
+    data = gzip.compress(
+        json.dumps(bundle_files).encode("utf-8"), compresslevel=9, mtime=0
+    )
+    return AppBundle(data, lazy_files, len(data) <= INLINE_BUNDLE_MAX_SIZE)
+
+
+def add_bundle_loader(html: str, bundle: AppBundle) -> Optional[str]:
+    """
+    Change an app's index.html to load the app from its bundle instead of app.json.
+    Returns `None` if the page doesn't load the app the way the export template does.
+    """
+    m = _RUN_EXPORTED_APP_RE.search(html)
+    if m is None:
+        return None
+
+    lazy_files = [
+        {"name": name, "url": f"./{LAZY_FILES_DIR}/{urllib.parse.quote(name)}"}
+        for name, _ in bundle.lazy_files
+    ]
+    inline_bundle = (
+        base64.b64encode(bundle.data).decode("ascii") if bundle.inline else None
+    )
+    loader = _LOADER_JS % {
+        "src": json.dumps(m.group("src")),
+        "options": m.group("options"),
+        "inline_bundle": json.dumps(inline_bundle),
+        "lazy_files": _script_json(lazy_files),
+        "app_modes": json.dumps(_APP_MODES),
+        "bundle_url": json.dumps(f"./{APP_BUNDLE_FILE}"),
+    }
+    return html[: m.start()] + loader + html[m.end() :]
+
+
+def write_app_bundle(
+    bundle: AppBundle, app_destdir: Path, manifest: ExportManifest | None = None
+) -> None:
+    """Write the bundle (unless it's inline) and the lazy files of an app."""
+    outputs: list[tuple[Path, bytes]] = [
+        (app_destdir / LAZY_FILES_DIR / name, content)
+        for name, content in bundle.lazy_files
+    ]
+    if not bundle.inline:
+        outputs.insert(0, (app_destdir / APP_BUNDLE_FILE, bundle.data))
+
+    for dest_file, content in outputs:
+        if manifest is not None:
+            manifest.write(dest_file, content)
+        else:
+            dest_file.parent.mkdir(parents=True, exist_ok=True)
+            dest_file.write_bytes(content)
+
+
+def _script_json(value: object) -> str:
+    # JSON that can't end the <script> element it's in
+    return json.dumps(value).replace("</", "<\\/")
@@ -5,9 +5,15 @@ import json
 import os
 import shutil
 from pathlib import Path
-from typing import Literal, TypedDict
+from typing import TYPE_CHECKING, Literal, TypedDict
 
 from . import _utils
+from ._app_bundle import add_bundle_loader, make_app_bundle, write_app_bundle
+from ._fingerprint import rewrite_assets_refs
+from ._snapshot import add_snapshot_overlay
+
+if TYPE_CHECKING:
+    from ._manifest import ExportManifest
 
 
 # This is the same as the FileContentJson type in TypeScript.
@@ -100,9 +106,26 @@ def write_app_json(
     destdir: Path,
     html_source_dir: Path,
     template_params: dict[str, object] | None = None,
+    manifest: ExportManifest | None = None,
+    assets_dirname: str = "shinylive",
+    compress: bool = False,
+    snapshot: bool = False,
 ) -> None:
     """
     Write index.html, edit/index.html, and app.json for an application in the destdir.
+
+    If a `manifest` is provided, files are written through it, so files that haven't
+    changed since the last export aren't rewritten. `assets_dirname` is the name of the
+    directory in destdir with the Shinylive assets, if they've been moved to a
+    fingerprinted directory (see `copy_fingerprinted_assets()`).
+
+    If `compress` is true, the app files are also written to a gzipped bundle, with
+    large binary files written separately, and index.html loads the app from those (see
+    `make_app_bundle()`). app.json is still written, for browsers that can't decompress
+    the bundle.
+
+    If `snapshot` is true, index.html shows the app's snapshot (see `write_snapshot()`)
+    until the app is running.
     """
     app_destdir = destdir / app_info["subdir"]
 
@@ -124,6 +147,9 @@ def write_app_json(
         "APP_ENGINE": "python",
     }
 
+    bundle = make_app_bundle(app_info["files"]) if compress else None
+    bundle_loaded = False
+
     template_files = list(html_source_dir.glob("**/*"))
     template_files = [f for f in template_files if f.is_file()]
 
@@ -132,16 +158,49 @@ def write_app_json(
         dest_file.parent.mkdir(parents=True, exist_ok=True)
 
         if template_file.suffix == ".html":
-            _utils.copy_file_and_substitute(
-                src=template_file,
-                dest=dest_file,
-                data=replacements,
-            )
+            content = _utils.render_file(template_file, replacements)
+            if assets_dirname != "shinylive":
+                content = rewrite_assets_refs(content, assets_dirname)
+            if bundle is not None and dest_file == app_destdir / "index.html":
+                bundle_content = add_bundle_loader(content, bundle)
+                if bundle_content is None:
+                    print(
+                        f"Warning: {template_file} doesn't load the app with"
+                        " runExportedApp(), so it will load app.json instead of the"
+                        " compressed bundle."
+                    )
+                else:
+                    content = bundle_content
+                    bundle_loaded = True
+            if snapshot and dest_file == app_destdir / "index.html":
+                content = add_snapshot_overlay(content)
+            if manifest is not None:
+                manifest.write(dest_file, content)
+            else:
+                with open(dest_file, "w") as f:
+                    f.write(content)
+        elif manifest is not None:
+            manifest.copy(template_file, dest_file)
         else:
             shutil.copyfile(template_file, dest_file)
 
+    if bundle is not None and bundle_loaded:
+        write_app_bundle(bundle, app_destdir, manifest)
+        print(
+            f"Compressed app files: {len(bundle.data)} bytes"
+            + (" (in index.html)" if bundle.inline else "")
+            + "".join(
+                f", {name}: {len(data)} bytes" for name, data in bundle.lazy_files
+            )
+        )
+
     app_json_output_file = app_destdir / "app.json"
 
     print("Writing " + str(app_json_output_file), end="")
-    json.dump(app_info["files"], open(app_json_output_file, "w"))
+    if manifest is not None:
+        if not manifest.write(app_json_output_file, json.dumps(app_info["files"])):
+            print(": unchanged")
+            return
+    else:
+        json.dump(app_info["files"], open(app_json_output_file, "w"))
     print(":", app_json_output_file.stat().st_size, "bytes")
@@ -4,12 +4,11 @@ import os
 import re
 import shutil
 import sys
-import time
 import urllib.request
 from pathlib import Path
 from typing import Optional
 
-from ._utils import tar_safe_extractall
+from ._download import download_and_extract
 from ._version import SHINYLIVE_ASSETS_VERSION
 
 
@@ -18,7 +17,15 @@ def download_shinylive(
     version: str = SHINYLIVE_ASSETS_VERSION,
     url: Optional[str] = None,
     status: bool = True,
+    sha256: Optional[str] = None,
 ) -> None:
+    """
+    Download the Shinylive assets bundle and extract it into `destdir`.
+
+    The bundle is extracted while it's downloaded, and only moved into place once it
+    has been downloaded completely and verified (against `sha256`, if given). An
+    interrupted download is resumed, both during the download and by the next call.
+    """
     if destdir is None:
         # Note that this is the cache directory, which is the parent of the assets
         # directory. The tarball will have the assets directory as the top-level subdir.
@@ -28,42 +35,15 @@ def download_shinylive(
         url = shinylive_bundle_url(version)
 
     destdir = Path(destdir)
-    tmp_name = None
-
-    try:
-        print(f"Downloading {url}...", file=sys.stderr)
-
-        start_time = time.time()
-        last_update_time = start_time
-
-        def reporthook(count: int, block_size: int, total_size: int):
-            if not status:
-                return
-
-            nonlocal last_update_time
-            current_time = time.time()
-
-            if current_time - last_update_time < 1:
-                return
-
-            duration = current_time - start_time
-            progress_size = int(count * block_size)
-            speed = int(progress_size / (1024 * duration))
-            percent = min(int(count * block_size * 100 / total_size), 100)
-            sys.stderr.write(
-                f"\r{percent}%, {speed} KB/s, {progress_size / (1024 * 1024):.1f}/{total_size / (1024 * 1024):.1f} MB"
-            )
-            sys.stderr.flush()
-            last_update_time = current_time
-
-        tmp_name, _ = urllib.request.urlretrieve(url, reporthook=reporthook)
-        sys.stderr.write("\n")
-
-        print(f"Unzipping to {destdir}/", file=sys.stderr)
-        tar_safe_extractall(tmp_name, destdir)
-    finally:
-        if tmp_name is not None:
-            Path(tmp_name).unlink(missing_ok=True)
+
+    digest = download_and_extract(
+        url,
+        destdir,
+        name=f"shinylive-{version}.tar.gz",
+        sha256=sha256,
+        status=status,
+    )
+    print(f"Extracted to {destdir}/ (SHA-256: {digest})", file=sys.stderr)
 
 
 def shinylive_bundle_url(version: str = SHINYLIVE_ASSETS_VERSION) -> str:
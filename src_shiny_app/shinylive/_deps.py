@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import ast
 import copy
+import filecmp
 import functools
 import json
 import os
 import re
 import sys
+import zipfile
 from pathlib import Path
 from textwrap import dedent
-from typing import Callable, Iterable, Literal, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Iterable, Literal, Optional, Tuple
 
 # Even though TypedDict is available in Python 3.8, because it's used with NotRequired,
 # they should both come from the same typing module.
@@ -27,6 +29,9 @@ from ._assets import (
 )
 from ._version import SHINYLIVE_ASSETS_VERSION
 
+if TYPE_CHECKING:
+    from ._manifest import ExportManifest
+
 # Files in Pyodide that should always be included.
 BASE_PYODIDE_FILES = {
     "pyodide.asm.js",
@@ -53,6 +58,7 @@ class PyodidePackageInfo(TypedDict):
     depends: list[str]
     imports: list[str]
     unvendored_tests: NotRequired[bool]
+    package_type: NotRequired[str]
 
 
 # The package information structure used by Pyodide's pyodide-lock.json.
@@ -395,6 +401,266 @@ def base_package_deps() -> list[PyodidePackageInfo]:
     return pkg_infos
 
 
+# =============================================================================
+# Tree shaking: only include the dependencies that packages actually import
+# =============================================================================
+def find_used_package_deps(
+    app_contents: list[FileContentJson],
+    verbose_print: Callable[..., None] = lambda *args: None,
+) -> list[PyodidePackageInfo]:
+    """
+    Like `find_package_deps()` combined with `base_package_deps()`, but a dependency of
+    a package is only followed if the package's code imports it (or refers to it by
+    name in a string, as with `importlib.import_module()` or matplotlib backends).
+
+    Packages declare dependencies for features that an app may never use; for example,
+    shinywidgets depends on ipywidgets, which depends on ipython. Imports that are only
+    for type checking, or that are in a `try` block that handles `ImportError`, don't
+    count. Packages that are imported by the app, or listed in its requirements.txt,
+    are always included, and so are the dependencies of packages whose code can't be
+    inspected. The result is a subset of the packages that `find_package_deps()` and
+    `base_package_deps()` would return.
+    """
+
+    imports: set[str] = _find_import_app_contents(app_contents)
+    imports = imports.union(_find_requirements_app_contents(app_contents))
+
+    verbose_print("Imports detected in app:\n ", ", ".join(sorted(imports)))
+
+    pyodide_lock = _pyodide_lock_data()
+    roots = [*sorted(BASE_PYODIDE_PACKAGE_NAMES), *sorted(imports)]
+
+    # Declared dependencies aren't always complete, so packages can also use packages
+    # that they import without declaring them, as long as something else declares them.
+    all_dep_keys = _dep_names_to_dep_keys(_find_recursive_deps(roots))
+
+    dep_keys: list[str] = []
+    queue = sorted(_dep_names_to_dep_keys(roots))
+    while queue:
+        dep_key = queue.pop(0)
+        if dep_key in dep_keys:
+            continue
+        dep_keys.append(dep_key)
+
+        pkg_info = pyodide_lock["packages"][dep_key]
+        used = _used_dep_keys(pkg_info, all_dep_keys)
+        unused = sorted(
+            dep_name
+            for dep_name in pkg_info["depends"]
+            if dep_name_to_dep_key(dep_name) not in used
+        )
+        if unused:
+            verbose_print(f"  {dep_key}: not importing {', '.join(unused)}")
+        queue.extend(sorted(used))
+
+    return [copy.deepcopy(pyodide_lock["packages"][dep_key]) for dep_key in dep_keys]
+
+
+def write_pruned_pyodide_lock(
+    pyodide_dir: str | Path, manifest: ExportManifest | None = None
+) -> None:
+    """
+    Write a copy of pyodide-lock.json to `pyodide_dir`, in which the dependencies of
+    each package only include packages whose files are in `pyodide_dir` (see
+    `pruned_pyodide_lock_json()`).
+
+    Since this is based on the files that are present, it's also correct when multiple
+    apps are exported to the same directory.
+
+    If a `manifest` is provided, the file is written through it.
+    """
+    pyodide_dir = Path(pyodide_dir)
+    content = pruned_pyodide_lock_json(
+        file_name
+        for file_name in _pyodide_lock_file_names()
+        if (pyodide_dir / file_name).exists()
+    )
+
+    lock_file = pyodide_dir / "pyodide-lock.json"
+    if manifest is not None:
+        manifest.write(lock_file, content)
+    else:
+        # Replace the file instead of writing to it, in case it's a hard link to the
+        # original (see ExportManifest)
+        tmp_file = lock_file.with_name(".pyodide-lock.json.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_file, lock_file)
+
+
+def pruned_pyodide_lock_json(file_names: Iterable[str]) -> str:
+    """
+    Return the contents of a pyodide-lock.json in which the dependencies of each
+    package only include the packages whose files are in `file_names`.
+
+    Pyodide loads all of the dependencies listed for a package when it's loaded, so
+    this is needed when dependencies have been left out by `find_used_package_deps()`.
+    """
+    file_names = set(file_names)
+    pyodide_lock = copy.deepcopy(_pyodide_lock_data())
+
+    present = {
+        dep_key
+        for dep_key, pkg_info in pyodide_lock["packages"].items()
+        if pkg_info["file_name"] in file_names
+    }
+    for pkg_info in pyodide_lock["packages"].values():
+        pkg_info["depends"] = [
+            dep_name
+            for dep_name in pkg_info["depends"]
+            if dep_name_to_dep_key(dep_name) in present
+        ]
+
+    return json.dumps(pyodide_lock)
+
+
+def _pyodide_lock_file_names() -> list[str]:
+    return [
+        pkg_info["file_name"] for pkg_info in _pyodide_lock_data()["packages"].values()
+    ]
+
+
+def pyodide_lock_is_pruned(pyodide_dir: str | Path) -> bool:
+    """
+    Whether the pyodide-lock.json in `pyodide_dir` was written by
+    `write_pruned_pyodide_lock()` (that is, whether it differs from the original).
+    """
+    lock_file = Path(pyodide_dir) / "pyodide-lock.json"
+    if not lock_file.exists():
+        return False
+    return not filecmp.cmp(lock_file, pyodide_lock_json_file(), shallow=False)
+
+
+def _used_dep_keys(
+    pkg_info: PyodidePackageInfo, candidate_keys: set[str]
+) -> set[str]:
+    """
+    Return the keys of the dependencies of a package that its Python code uses: its
+    declared dependencies that it imports, and packages in `candidate_keys` that it
+    imports without declaring them.
+    """
+    pyodide_lock = _pyodide_lock_data()
+    declared = _dep_names_to_dep_keys(pkg_info["depends"])
+
+    wheel_file = (
+        Path(shinylive_assets_dir()) / "shinylive" / "pyodide" / pkg_info["file_name"]
+    )
+    # Other kinds of packages (like the .zip files of stdlib modules) can't be
+    # inspected, so all of their dependencies are kept.
+    if wheel_file.suffix != ".whl" or not wheel_file.exists():
+        return declared
+
+    imported: set[str] = set()
+    named: set[str] = set()
+    with zipfile.ZipFile(wheel_file) as zf:
+        py_files = [name for name in zf.namelist() if name.endswith(".py")]
+        if len(py_files) == 0:
+            return declared
+        for name in py_files:
+            source = zf.read(name).decode("utf-8", errors="replace")
+            imported.update(_find_used_imports(source, named))
+    imported.update(named)
+
+    used: set[str] = set()
+    for dep_key in declared.union(candidate_keys):
+        if dep_key == dep_name_to_dep_key(pkg_info["name"]):
+            continue
+        dep_info = pyodide_lock["packages"][dep_key]
+        # The "imports" in pyodide-lock.json aren't always right (for example,
+        # "matplotlib-inline" instead of "matplotlib_inline"), so also try the name.
+        modules = {*dep_info["imports"], dep_info["name"].replace("-", "_")}
+        if not modules.isdisjoint(imported):
+            used.add(dep_key)
+        elif dep_key in declared and (
+            # Shared libraries are used by compiled extension modules
+            dep_info.get("package_type") == "shared_library"
+            or len(dep_info["imports"]) == 0
+        ):
+            used.add(dep_key)
+
+    return used
+
+
+def _dep_names_to_dep_keys(dep_names: Iterable[str]) -> set[str]:
+    pyodide_lock = _pyodide_lock_data()
+    dep_keys = (dep_name_to_dep_key(dep_name) for dep_name in dep_names)
+    return {
+        key for key in dep_keys if key is not None and key in pyodide_lock["packages"]
+    }
+
+
+def _find_used_imports(source: str, named: set[str]) -> set[str]:
+    """
+    Find the top-level names of the modules that Python code may import, skipping
+    imports that are only for type checking, or that are optional (in a `try` block
+    that handles `ImportError`).
+
+    Modules that are named in string constants (like `"numpy"`, `"numpy.linalg"`, or
+    `"module://matplotlib_pyodide.wasm_backend"`) are added to `named`.
+    """
+    try:
+        mod = ast.parse(source)
+    except SyntaxError:
+        return set()
+
+    imports: set[str] = set()
+
+    def visit(node: ast.AST) -> None:
+        if isinstance(node, ast.Import):
+            for name in node.names:
+                imports.add(name.name.split(".")[0])
+            return
+        if isinstance(node, ast.ImportFrom):
+            if node.module is not None and node.level == 0:
+                imports.add(node.module.split(".")[0])
+            return
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            m = _MODULE_STRING_RE.match(node.value)
+            if m:
+                named.add(m.group(1))
+            return
+        if isinstance(node, ast.If) and _is_type_checking_test(node.test):
+            for child in node.orelse:
+                visit(child)
+            return
+        if isinstance(node, ast.Try) and any(
+            _handles_import_error(handler) for handler in node.handlers
+        ):
+            for child in [*node.handlers, *node.orelse, *node.finalbody]:
+                visit(child)
+            return
+        for child in ast.iter_child_nodes(node):
+            visit(child)
+
+    visit(mod)
+    return imports
+
+
+_MODULE_STRING_RE = re.compile(r"(?:module://)?([A-Za-z_]\w*)(?:[.:]|$)")
+
+
+def _is_type_checking_test(test: ast.expr) -> bool:
+    # `if TYPE_CHECKING:` or `if typing.TYPE_CHECKING:`
+    if isinstance(test, ast.Name):
+        return test.id == "TYPE_CHECKING"
+    if isinstance(test, ast.Attribute):
+        return test.attr == "TYPE_CHECKING"
+    return False
+
+
+def _handles_import_error(handler: ast.ExceptHandler) -> bool:
+    # Only `except ImportError` (or ModuleNotFoundError, alone or in a tuple) marks the
+    # imports as optional. A broad `except:` or `except Exception` is usually error
+    # handling around code that needs its imports.
+    if handler.type is None:
+        return False
+    types = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+    return any(
+        isinstance(t, ast.Name) and t.id in ("ImportError", "ModuleNotFoundError")
+        for t in types
+    )
+
+
 # =============================================================================
 # Internal functions
 # =============================================================================
@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import os
+import queue
+import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from pathlib import Path
+from typing import Optional, Union
+
+from ._utils import tar_safe_extract_stream
+
+# The size of the pieces that are read from the network
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+# How many pieces can be downloaded ahead of extraction
+DOWNLOAD_QUEUE_SIZE = 64
+# How many times an interrupted download is resumed before giving up, and how long to
+# wait (in seconds) before the first retry; the wait doubles for each retry
+DOWNLOAD_RETRIES = 5
+DOWNLOAD_RETRY_WAIT = 1.0
+# Timeout (in seconds) for connecting and for each read
+DOWNLOAD_TIMEOUT = 60
+
+# Errors that mean that the connection failed, and the download can be resumed
+_NETWORK_ERRORS = (urllib.error.URLError, http.client.HTTPException, OSError)
+# Errors that mean that the downloaded file is corrupt
+_CORRUPT_ERRORS = (tarfile.TarError, gzip.BadGzipFile, EOFError, zlib.error)
+
+
+class DownloadError(RuntimeError):
+    pass
+
+
+def download_and_extract(
+    url: str,
+    destdir: Path,
+    *,
+    name: str,
+    sha256: Optional[str] = None,
+    retries: int = DOWNLOAD_RETRIES,
+    status: bool = True,
+) -> str:
+    """
+    Download a .tar.gz file and extract it into `destdir`.
+
+    The file is extracted while it's downloaded (in another thread), and its contents
+    only appear in `destdir` once it has been downloaded completely and verified: the
+    gzip checksum and the size must be right, and so must the SHA-256 hash, if `sha256`
+    is given.
+
+    The downloaded data is also saved in a hidden file in `destdir` (named after
+    `name`). If the download is interrupted, it's resumed from where it stopped, with
+    HTTP range requests, up to `retries` times; and if it fails, the next call resumes
+    it. If a resumed download turns out to be corrupt, it's restarted from scratch.
+
+    Returns
+    -------
+    :
+        The SHA-256 hash of the downloaded file.
+    """
+    destdir.mkdir(parents=True, exist_ok=True)
+    part_file = destdir / f".{name}.part"
+    part_info_file = destdir / f".{name}.part.json"
+
+    restarted = False
+    while True:
+        tmp_dir = Path(tempfile.mkdtemp(dir=destdir, prefix=f".{name}-"))
+        downloader = _Downloader(url, part_file, part_info_file, retries, status)
+        try:
+            downloader.start()
+            try:
+                _extract(downloader.stream, tmp_dir)
+            finally:
+                downloader.stop()
+
+            digest = downloader.sha256.hexdigest()
+            if sha256 is not None and digest != sha256.lower():
+                raise DownloadError(
+                    f"The SHA-256 hash of {url} is {digest}, but {sha256} was expected."
+                )
+
+        except _NetworkFailure:
+            # Keep the partial download, so the next attempt can resume it
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        except (DownloadError, *_CORRUPT_ERRORS) as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            part_file.unlink(missing_ok=True)
+            part_info_file.unlink(missing_ok=True)
+            if not restarted and (
+                downloader.resumed_from > 0 or isinstance(e, _ResumeFailure)
+            ):
+                print(f"\nThe download failed ({e}); starting over.", file=sys.stderr)
+                restarted = True
+                continue
+            if isinstance(e, DownloadError):
+                raise
+            raise DownloadError(
+                f"The file downloaded from {url} is corrupt: {e}"
+            ) from e
+
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        break
+
+    _install(tmp_dir, destdir)
+    part_file.unlink(missing_ok=True)
+    part_info_file.unlink(missing_ok=True)
+    return digest
+
+
+def _extract(stream: io.RawIOBase, destdir: Path) -> None:
+    # Decompressing with GzipFile (instead of tarfile's own decompression) means that
+    # the gzip checksum is verified at the end.
+    with gzip.GzipFile(fileobj=io.BufferedReader(stream, DOWNLOAD_CHUNK_SIZE)) as gz:
+        tar_safe_extract_stream(gz, destdir)
+        # Read the rest of the file (the end of the tar file, and the checksum)
+        while gz.read(DOWNLOAD_CHUNK_SIZE):
+            pass
+
+
+def _install(tmp_dir: Path, destdir: Path) -> None:
+    # Move the extracted files into place; existing ones are moved out of the way first,
+    # and deleted after.
+    old_dir = tmp_dir / ".old"
+    old_dir.mkdir()
+    for entry in sorted(tmp_dir.iterdir()):
+        if entry == old_dir:
+            continue
+        target = destdir / entry.name
+        if target.is_symlink():
+            target.unlink()
+        elif target.exists():
+            os.replace(target, old_dir / entry.name)
+        os.replace(entry, target)
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+class _NetworkFailure(DownloadError):
+    pass
+
+
+class _ResumeFailure(DownloadError):
+    pass
+
+
+class _Downloader(threading.Thread):
+    """
+    A thread that downloads a file, appends it to `part_file`, and passes the data to
+    `stream`. If `part_file` has data from an earlier download of the same URL, the
+    download is resumed, and that data is passed to `stream` first.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        part_file: Path,
+        part_info_file: Path,
+        retries: int,
+        status: bool,
+    ):
+        super().__init__(daemon=True)
+        self.url = url
+        self.part_file = part_file
+        self.part_info_file = part_info_file
+        self.retries = retries
+        self.status = status
+
+        self.sha256 = hashlib.sha256()
+        self.resumed_from = 0
+        self.stream = _QueueStream()
+        self._stopped = threading.Event()
+
+        self._size = 0
+        self._total_size: Optional[int] = None
+        # The ETag or Last-Modified date of the file, to make sure that a download is
+        # only resumed if the file hasn't changed
+        self._validator: Optional[str] = None
+        self._start_time = time.time()
+        self._last_status_time = self._start_time
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+    def run(self) -> None:
+        try:
+            self._download()
+            self._put(None)
+        except BaseException as e:
+            self._put(e)
+
+    def _download(self) -> None:
+        resp: Optional[http.client.HTTPResponse] = None
+        f: Optional[io.BufferedWriter] = None
+        retries = self.retries
+        try:
+            while True:
+                try:
+                    if resp is None:
+                        resp = self._reopen() if f is not None else self._open_initial()
+                    if f is None:
+                        mode = "ab" if self.resumed_from > 0 else "wb"
+                        f = open(self.part_file, mode)
+                    self._copy(resp, f)
+                    if self._stopped.is_set():
+                        return
+                    if self._total_size is not None and self._size < self._total_size:
+                        raise http.client.IncompleteRead(b"")
+                    break
+                except _NETWORK_ERRORS as e:
+                    if resp is not None:
+                        resp.close()
+                        resp = None
+                    if isinstance(e, urllib.error.HTTPError) and e.code < 500:
+                        raise
+                    if retries == 0 or self._stopped.is_set():
+                        raise _NetworkFailure(f"Downloading {self.url} failed: {e}")
+                    wait = DOWNLOAD_RETRY_WAIT * 2 ** (self.retries - retries)
+                    retries -= 1
+                    self._print_status(
+                        f"\nDownload interrupted ({e}); retrying in {wait:.0f}s",
+                        force=True,
+                    )
+                    time.sleep(wait)
+        finally:
+            if resp is not None:
+                resp.close()
+            if f is not None:
+                f.close()
+
+        if self.status:
+            sys.stderr.write("\n")
+
+    def _open_initial(self) -> http.client.HTTPResponse:
+        offset = 0
+        try:
+            with open(self.part_info_file, "r", encoding="utf-8") as f:
+                info = json.load(f)
+            if info["url"] == self.url and info["validator"] is not None:
+                self._validator = info["validator"]
+                offset = self.part_file.stat().st_size
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        resp = None
+        if offset > 0:
+            try:
+                resp = self._open(offset)
+            except urllib.error.HTTPError as e:
+                # 416 (Range Not Satisfiable): the partial file is too long
+                if e.code != 416:
+                    raise
+            if resp is not None and resp.status == 206:
+                print(f"Resuming download of {self.url}", file=sys.stderr)
+                self.resumed_from = offset
+                with open(self.part_file, "rb") as f:
+                    while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+                        self._add(chunk)
+                return resp
+
+        # Download the whole file
+        if resp is None:
+            resp = self._open(0)
+        print(f"Downloading {self.url}...", file=sys.stderr)
+        self._validator = resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+        with open(self.part_info_file, "w", encoding="utf-8") as f:
+            json.dump({"url": self.url, "validator": self._validator}, f)
+        return resp
+
+    def _reopen(self) -> http.client.HTTPResponse:
+        # Continue an interrupted download
+        resp = self._open(self._size)
+        if resp.status != 206:
+            resp.close()
+            raise _ResumeFailure(
+                f"Can't resume the download of {self.url}: the server doesn't "
+                "support it, or the file changed."
+            )
+        return resp
+
+    def _open(self, offset: int) -> http.client.HTTPResponse:
+        req = urllib.request.Request(self.url)
+        if offset > 0:
+            req.add_header("Range", f"bytes={offset}-")
+            if self._validator is not None:
+                req.add_header("If-Range", self._validator)
+        resp = urllib.request.urlopen(req, timeout=DOWNLOAD_TIMEOUT)
+
+        if resp.status == 206:
+            # Content-Range: bytes <first>-<last>/<total>
+            content_range = resp.headers.get("Content-Range", "")
+            range_, _, total = content_range.partition("/")
+            if not range_.startswith(f"bytes {offset}-"):
+                resp.close()
+                raise DownloadError(f"Unexpected Content-Range: {content_range}")
+            if total.isdigit():
+                self._total_size = int(total)
+        else:
+            length = resp.headers.get("Content-Length")
+            if length is not None and length.isdigit():
+                self._total_size = int(length)
+        return resp
+
+    def _copy(self, resp: http.client.HTTPResponse, f: io.BufferedWriter) -> None:
+        while chunk := resp.read(DOWNLOAD_CHUNK_SIZE):
+            if self._stopped.is_set():
+                return
+            f.write(chunk)
+            # The data must be on disk before it's used, so that a resumed download
+            # never skips data
+            f.flush()
+            self._add(chunk)
+            self._print_status()
+
+    def _add(self, chunk: bytes) -> None:
+        self._size += len(chunk)
+        self.sha256.update(chunk)
+        self._put(chunk)
+
+    def _put(self, item: Union[bytes, BaseException, None]) -> None:
+        # Wait for the extraction to catch up, unless it has stopped
+        while not self._stopped.is_set():
+            try:
+                self.stream.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _print_status(self, message: Optional[str] = None, force: bool = False) -> None:
+        if not self.status:
+            return
+        current_time = time.time()
+        if not force and current_time - self._last_status_time < 1:
+            return
+        self._last_status_time = current_time
+
+        if message is not None:
+            sys.stderr.write(message + "\n")
+            return
+
+        duration = current_time - self._start_time
+        speed = int((self._size - self.resumed_from) / (1024 * duration))
+        line = f"{speed} KB/s, {self._size / (1024 * 1024):.1f}"
+        if self._total_size:
+            percent = min(int(self._size * 100 / self._total_size), 100)
+            line = f"{percent}%, {line}/{self._total_size / (1024 * 1024):.1f}"
+        sys.stderr.write(f"\r{line} MB")
+        sys.stderr.flush()
+
+
+class _QueueStream(io.RawIOBase):
+    """A readable stream of the pieces of data put in its queue."""
+
+    def __init__(self):
+        super().__init__()
+        self.queue: queue.Queue[Union[bytes, BaseException, None]] = queue.Queue(
+            DOWNLOAD_QUEUE_SIZE
+        )
+        self._buffer = b""
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b: bytearray | memoryview) -> int:  # pyright: ignore
+        if not self._buffer and not self._eof:
+            item = self.queue.get()
+            if isinstance(item, BaseException):
+                raise item
+            if item is None:
+                self._eof = True
+            else:
+                self._buffer = item
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
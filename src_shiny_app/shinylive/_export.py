@@ -7,6 +7,13 @@ from pathlib import Path
 from . import _deps, _utils
 from ._app_json import AppInfo, read_app_files, write_app_json
 from ._assets import shinylive_assets_dir
+from ._fingerprint import (
+    copy_fingerprinted_assets,
+    write_cache_headers,
+    write_serviceworker,
+)
+from ._manifest import ExportManifest
+from ._snapshot import write_snapshot
 
 
 def export(
@@ -18,6 +25,13 @@ def export(
     full_shinylive: bool = False,
     template_dir: str | Path | None = None,
     template_params: dict[str, object] | None = None,
+    snapshot: bool = False,
+    tree_shake: bool = False,
+    size_budget: int | None = None,
+    incremental: bool = False,
+    hard_link: bool = False,
+    fingerprint: bool = False,
+    compress: bool = False,
 ):
     def verbose_print(*args: object) -> None:
         if verbose:
@@ -37,6 +51,11 @@ def export(
             f"subdir {subdir} is absolute, but only relative paths are allowed."
         )
 
+    if full_shinylive and tree_shake:
+        raise ValueError("full_shinylive and tree_shake can't both be used.")
+    if hard_link and not incremental:
+        raise ValueError("hard_link can only be used with incremental.")
+
     if template_dir is None:
         template_dir = Path(shinylive_assets_dir()) / "export_template"
     else:
@@ -48,10 +67,34 @@ def export(
         print(f"Creating {destdir}/", file=sys.stderr)
         destdir.mkdir()
 
-    copy_fn = _utils.create_copy_fn(overwrite=False, verbose_print=verbose_print)
+    # An incremental export copies and writes the files that changed since the previous
+    # export to destdir (and overwrites files that were changed by something else).
+    manifest = None
+    if incremental:
+        manifest = ExportManifest(
+            destdir, hard_link=hard_link, verbose_print=verbose_print
+        )
+        copy_fn = manifest.copy
+    else:
+        copy_fn = _utils.create_copy_fn(overwrite=False, verbose_print=verbose_print)
 
     assets_dir = Path(shinylive_assets_dir())
 
+    # Packages may be left out by tree shaking (now or by a previous export to the same
+    # directory), in which case Pyodide must not try to load them as dependencies, and a
+    # pruned copy of pyodide-lock.json is written instead of the original. (With
+    # fingerprinting, the assets directory only has this export's packages.)
+    pyodide_destdir = destdir / "shinylive" / "pyodide"
+    prune_lock = tree_shake or (
+        not fingerprint and _deps.pyodide_lock_is_pruned(pyodide_destdir)
+    )
+
+    # With fingerprinting, the files in shinylive/ are copied to a directory named by a
+    # hash of their contents instead, once they're all known; these are their paths
+    # relative to shinylive/, and their sources. A shinylive/ directory from an earlier
+    # export without fingerprinting is left as it is, for the apps that use it.
+    fingerprinted_files: list[tuple[str, Path]] = []
+
     # =========================================================================
     # Copy the base dependencies for shinylive/ distribution. This does not include the
     # Python package files.
@@ -66,9 +109,20 @@ def export(
         asset_type=("base", "python"),
     )
     for file in base_files:
+        if prune_lock and Path(file) == Path("shinylive/pyodide/pyodide-lock.json"):
+            continue
+        if fingerprint and file == "shinylive-sw.js":
+            # Written below
+            continue
         src_path = assets_dir / file
         dest_path = destdir / Path(file)
 
+        if fingerprint and Path(file).parts[0] == "shinylive":
+            fingerprinted_files.append(
+                (Path(file).relative_to("shinylive").as_posix(), src_path)
+            )
+            continue
+
         if not dest_path.parent.exists():
             os.makedirs(dest_path.parent)
 
@@ -98,6 +152,10 @@ def export(
     else:
         deps = _deps.base_package_deps() + _deps.find_package_deps(app_info["files"])
 
+        all_package_files = [dep["file_name"] for dep in deps]
+        if tree_shake:
+            deps = _deps.find_used_package_deps(app_info["files"], verbose_print)
+
         package_files: list[str] = [dep["file_name"] for dep in deps]
 
         print(
@@ -106,14 +164,72 @@ def export(
         )
         verbose_print(" ", ", ".join(package_files))
 
+        if tree_shake:
+            _print_size_report(
+                assets_dir / "shinylive" / "pyodide",
+                package_files,
+                all_package_files,
+            )
+
+    if size_budget is not None:
+        total_size = _total_size(assets_dir / "shinylive" / "pyodide", package_files)
+        if total_size > size_budget:
+            raise RuntimeError(
+                f"The Pyodide packages for the app take {_format_size(total_size)}, "
+                f"which is more than the size budget of {_format_size(size_budget)}."
+            )
+
     for filename in package_files:
         src_path = assets_dir / "shinylive" / "pyodide" / filename
         dest_path = destdir / "shinylive" / "pyodide" / filename
+        if fingerprint:
+            fingerprinted_files.append((f"pyodide/{filename}", src_path))
+            continue
         if not dest_path.parent.exists():
             os.makedirs(dest_path.parent)
 
         copy_fn(src_path, dest_path)
 
+    if prune_lock and not fingerprint:
+        _deps.write_pruned_pyodide_lock(pyodide_destdir, manifest)
+
+    assets_dirname = "shinylive"
+    if fingerprint:
+        generated: dict[str, str] = {}
+        if prune_lock:
+            generated["pyodide/pyodide-lock.json"] = _deps.pruned_pyodide_lock_json(
+                Path(rel_path).name for rel_path, _ in fingerprinted_files
+            )
+        assets_dirname = copy_fingerprinted_assets(
+            fingerprinted_files,
+            destdir,
+            copy_fn,
+            generated=generated,
+            manifest=manifest,
+            verbose_print=verbose_print,
+        )
+        print(f"Fingerprinted assets: {destdir}/{assets_dirname}/", file=sys.stderr)
+        write_serviceworker(
+            assets_dir / "shinylive-sw.js",
+            destdir / "shinylive-sw.js",
+            manifest,
+            verbose_print=verbose_print,
+        )
+
+    # =========================================================================
+    # Run the app here, and write a static snapshot of its initial state, to be shown
+    # on the page while Pyodide starts in the browser.
+    # =========================================================================
+    snapshot_written = False
+    if snapshot:
+        print("Running the app to create a snapshot of its outputs", file=sys.stderr)
+        snapshot_written = write_snapshot(
+            appdir.resolve(),
+            destdir / subdir,
+            manifest,
+            verbose_print=verbose_print,
+        )
+
     # =========================================================================
     # For each app, write the index.html, edit/index.html, and app.json in
     # destdir/subdir.
@@ -123,10 +239,64 @@ def export(
         destdir,
         html_source_dir=template_dir,
         template_params=template_params if template_params is not None else {},
+        manifest=manifest,
+        assets_dirname=assets_dirname,
+        compress=compress,
+        snapshot=snapshot_written,
     )
 
+    if fingerprint:
+        write_cache_headers(destdir, manifest)
+
+    if manifest is not None:
+        manifest.save()
+        print(
+            f"Wrote {manifest.n_written} changed files, "
+            f"skipped {manifest.n_skipped} unchanged files",
+            file=sys.stderr,
+        )
+
     print(
         "\nRun the following to serve the app:\n"
         f"  python3 -m http.server --directory {destdir} --bind localhost 8008",
         file=sys.stderr,
     )
+
+
+def _print_size_report(
+    pyodide_dir: Path, package_files: list[str], all_package_files: list[str]
+) -> None:
+    """
+    Print the sizes of the Pyodide packages that are included, largest first, and of
+    the packages that were left out by tree shaking.
+    """
+    package_files = sorted(
+        set(package_files), key=lambda f: (pyodide_dir / f).stat().st_size, reverse=True
+    )
+    omitted_files = sorted(set(all_package_files).difference(package_files))
+
+    print(
+        f"Pyodide packages: {len(package_files)} files, "
+        f"{_format_size(_total_size(pyodide_dir, package_files))}",
+        file=sys.stderr,
+    )
+    for file in package_files:
+        size = (pyodide_dir / file).stat().st_size
+        print(f"  {_format_size(size):>9}  {file}", file=sys.stderr)
+    if omitted_files:
+        print(
+            f"Left out by tree shaking: {len(omitted_files)} files, "
+            f"{_format_size(_total_size(pyodide_dir, omitted_files))}",
+            file=sys.stderr,
+        )
+        print(" ", ", ".join(omitted_files), file=sys.stderr)
+
+
+def _total_size(pyodide_dir: Path, package_files: list[str]) -> int:
+    return sum((pyodide_dir / file).stat().st_size for file in set(package_files))
+
+
+def _format_size(size: int) -> str:
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
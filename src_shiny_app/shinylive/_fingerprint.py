@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from ._app_bundle import APP_BUNDLE_FILE, LAZY_FILES_DIR
+from ._manifest import hash_file
+
+if TYPE_CHECKING:
+    from ._manifest import ExportManifest
+
+# Fingerprinted asset directories are named like shinylive-0123456789abcdef/
+FINGERPRINT_LENGTH = 16
+FINGERPRINTED_DIR_RE = re.compile(r"^shinylive-[0-9a-f]{%d}$" % FINGERPRINT_LENGTH)
+
+# The file, in the format used by Netlify and Cloudflare Pages, that tells static hosts
+# which HTTP headers to send
+CACHE_HEADERS_FILE = "_headers"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# The service worker caches responses for files in shinylive/; with this changed to a
+# prefix match, it also caches files in fingerprinted directories.
+_SW_CACHE_CHECK = 'request.url.startsWith(baseUrl + "/shinylive/")'
+_SW_CACHE_CHECK_FINGERPRINTED = 'request.url.startsWith(baseUrl + "/shinylive")'
+
+
+def copy_fingerprinted_assets(
+    files: list[tuple[str, Path]],
+    destdir: Path,
+    copy_fn: Callable[[Path, Path], None],
+    *,
+    generated: dict[str, str] | None = None,
+    manifest: ExportManifest | None = None,
+    verbose_print: Callable[..., None] = lambda *args: None,
+) -> str:
+    """
+    Copy Shinylive assets to a directory in `destdir` whose name is a hash of their
+    contents, like `destdir/shinylive-0123456789abcdef/`, and return the name of that
+    directory.
+
+    `files` are the paths of the assets relative to `shinylive/`, and their sources;
+    `generated` maps more paths to their contents. The hash is worked out from the
+    sources (with the hashes recorded in `manifest`, if it's given, for sources that
+    haven't changed), so the files are copied straight into the directory, and if it's
+    already there (from a previous export with the same assets), `copy_fn` finds them
+    unchanged.
+
+    Since any change to the assets results in a new directory, files in it never
+    change, so they can be cached forever. All references between the assets are
+    relative, so they don't need to be changed.
+    """
+    hash_source = manifest.hash_source if manifest is not None else hash_file
+    generated = generated or {}
+
+    file_hashes = [(rel_path, hash_source(src)) for rel_path, src in files]
+    file_hashes.extend(
+        (rel_path, hashlib.sha256(content.encode("utf-8")).hexdigest())
+        for rel_path, content in generated.items()
+    )
+    hasher = hashlib.sha256()
+    for rel_path, sha256 in sorted(file_hashes):
+        hasher.update(rel_path.encode("utf-8") + b"\0")
+        hasher.update(sha256.encode("ascii") + b"\0")
+
+    dirname = "shinylive-" + hasher.hexdigest()[:FINGERPRINT_LENGTH]
+    fingerprinted_dir = destdir / dirname
+    if fingerprinted_dir.exists():
+        verbose_print(f"Reusing {fingerprinted_dir}/")
+
+    for rel_path, src in files:
+        dest = fingerprinted_dir / rel_path
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        copy_fn(src, dest)
+    for rel_path, content in generated.items():
+        dest = fingerprinted_dir / rel_path
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        _write_file(dest, content, manifest)
+
+    return dirname
+
+
+def rewrite_assets_refs(html: str, assets_dirname: str) -> str:
+    """
+    Rewrite references to files in shinylive/ (like `"./shinylive/shinylive.js"` or
+    `"../shinylive/shinylive.css"`) in an HTML page to point to `assets_dirname`.
+    """
+    return re.sub(
+        r"""(["'(])((?:\.{1,2}/)*)shinylive/""",
+        lambda m: f"{m.group(1)}{m.group(2)}{assets_dirname}/",
+        html,
+    )
+
+
+def write_serviceworker(
+    src: Path,
+    dest: Path,
+    manifest: ExportManifest | None = None,
+    verbose_print: Callable[..., None] = lambda *args: None,
+) -> None:
+    """
+    Write a copy of shinylive-sw.js that also caches files from fingerprinted
+    directories.
+    """
+    content = src.read_text(encoding="utf-8")
+    if _SW_CACHE_CHECK in content:
+        content = content.replace(_SW_CACHE_CHECK, _SW_CACHE_CHECK_FINGERPRINTED)
+    else:
+        verbose_print(
+            f"Didn't find the cache check in {src}; files in fingerprinted"
+            " directories won't be cached by the service worker."
+        )
+    _write_file(dest, content, manifest)
+
+
+def write_cache_headers(destdir: Path, manifest: ExportManifest | None = None) -> None:
+    """
+    Write the `_headers` file for destdir, which tells the static host to let browsers
+    and CDNs cache files in fingerprinted directories forever, and to always revalidate
+    the service worker and the files of the apps (which refer to the fingerprinted
+    directories).
+
+    The file is written from what's in destdir, so it includes the apps and
+    fingerprinted directories of previous exports to destdir.
+    """
+    rules: list[tuple[str, str]] = []
+    for entry in sorted(os.listdir(destdir)):
+        if FINGERPRINTED_DIR_RE.match(entry) and (destdir / entry).is_dir():
+            rules.append((f"/{entry}/*", IMMUTABLE_CACHE_CONTROL))
+
+    rules.append(("/shinylive-sw.js", REVALIDATE_CACHE_CONTROL))
+
+    for root, dirs, files in os.walk(destdir):
+        dirs[:] = sorted(
+            d for d in dirs if not FINGERPRINTED_DIR_RE.match(d) and d != "shinylive"
+        )
+        if "app.json" not in files:
+            continue
+        rel_root = Path(root).relative_to(destdir).as_posix()
+        prefix = "/" if rel_root == "." else f"/{rel_root}/"
+        for path in ("", "index.html", "app.json", "edit/", "edit/index.html"):
+            rules.append((prefix + path, REVALIDATE_CACHE_CONTROL))
+        if APP_BUNDLE_FILE in files:
+            rules.append((prefix + APP_BUNDLE_FILE, REVALIDATE_CACHE_CONTROL))
+        for name in ("snapshot", LAZY_FILES_DIR):
+            if name in dirs:
+                rules.append((prefix + name + "/*", REVALIDATE_CACHE_CONTROL))
+
+    content = "".join(
+        f"{path}\n  Cache-Control: {cache_control}\n" for path, cache_control in rules
+    )
+    _write_file(destdir / CACHE_HEADERS_FILE, content, manifest)
+
+
+def _write_file(path: Path, content: str, manifest: ExportManifest | None) -> None:
+    if manifest is not None:
+        manifest.write(path, content)
+        return
+    # Replace the file instead of writing to it, in case it's a hard link (see
+    # ExportManifest)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, path)
+
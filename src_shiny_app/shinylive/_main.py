@@ -131,6 +131,54 @@ After writing the output files, you can serve them locally with the following co
     default=None,
     help="Path to the directory containing the mustache templates for the exported shinylive files.",
 )
+@click.option(
+    "--snapshot",
+    is_flag=True,
+    default=False,
+    help="Run the app (which requires Shiny and the app's packages to be installed) and include a static snapshot of its initial outputs, which is shown while the app starts in the browser.",
+    show_default=True,
+)
+@click.option(
+    "--tree-shake",
+    is_flag=True,
+    default=False,
+    help="Only include the dependencies of Pyodide packages that the packages' code actually imports, instead of all of their declared dependencies, and print the sizes of the included packages. Packages listed in the app's requirements.txt are always included.",
+    show_default=True,
+)
+@click.option(
+    "--size-budget",
+    type=float,
+    default=None,
+    help="The maximum total size, in MB, of the Pyodide packages for the app. If they are larger, the export fails.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Only copy and write the files that changed since the previous export to DESTDIR, based on a manifest of content hashes that is kept in DESTDIR. Files that were changed by something else are overwritten.",
+    show_default=True,
+)
+@click.option(
+    "--hard-link",
+    is_flag=True,
+    default=False,
+    help="With --incremental, hard link Shinylive assets into DESTDIR instead of copying them, when possible. The linked files share their contents with the local copy of the assets, so they must not be edited in place.",
+    show_default=True,
+)
+@click.option(
+    "--fingerprint",
+    is_flag=True,
+    default=False,
+    help="Put the Shinylive assets in a directory named by a hash of their contents (like shinylive-0123456789abcdef/), so they can be cached forever, and write a _headers file with the Cache-Control headers that static hosts like Netlify and Cloudflare Pages should send.",
+    show_default=True,
+)
+@click.option(
+    "--compress",
+    is_flag=True,
+    default=False,
+    help="Also write the app's files as a gzipped bundle, with large binary files (like data files) written separately, and load the app from those. A small bundle is put in index.html. app.json is still written, for browsers that can't decompress the bundle.",
+    show_default=True,
+)
 @click.option(
     "--verbose",
     is_flag=True,
@@ -146,6 +194,13 @@ def export(
     full_shinylive: bool,
     template_dir: str | None,
     template_params: str | None,
+    snapshot: bool,
+    tree_shake: bool,
+    size_budget: float | None,
+    incremental: bool,
+    hard_link: bool,
+    fingerprint: bool,
+    compress: bool,
 ) -> None:
     template_params_dict = None
     if template_params is not None:
@@ -163,6 +218,13 @@ def export(
         full_shinylive=full_shinylive,
         template_dir=template_dir,
         template_params=template_params_dict,
+        snapshot=snapshot,
+        tree_shake=tree_shake,
+        size_budget=None if size_budget is None else int(size_budget * 1024 * 1024),
+        incremental=incremental,
+        hard_link=hard_link,
+        fingerprint=fingerprint,
+        compress=compress,
     )
 
 
@@ -232,16 +294,23 @@ def assets_info(
     default=True,
     help="Enable/disable status output during download.",
 )
+@click.option(
+    "--sha256",
+    type=str,
+    default=None,
+    help="The expected SHA-256 hash of the assets bundle. If the downloaded bundle has a different hash, it isn't installed.",
+)
 def download(
     version: str,
     dir: Optional[str | Path],
     url: Optional[str],
     status: bool,
+    sha256: Optional[str],
 ) -> None:
     if version is None:  # pyright: ignore[reportUnnecessaryComparison]
         version = SHINYLIVE_ASSETS_VERSION
     _assets.download_shinylive(
-        destdir=upgrade_dir(dir), version=version, url=url, status=status
+        destdir=upgrade_dir(dir), version=version, url=url, status=status, sha256=sha256
     )
 
 
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional
+
+# Sits in the export directory, next to index.html
+MANIFEST_FILE = ".shinylive-manifest.json"
+
+# Files are hashed in pieces of this size
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class ExportManifest:
+    """
+    Content hashes of the files written by `shinylive export`, which are kept in the
+    export directory so that later exports to it only copy or write files that changed.
+
+    For each file, the manifest records its SHA-256 hash, and its size and modification
+    time when it was written; a file whose size or modification time differs has been
+    changed by something else, and is rewritten. For copied files, the size and
+    modification time of the source are also recorded, so unchanged sources don't need
+    to be read again.
+    """
+
+    def __init__(
+        self,
+        destdir: str | Path,
+        *,
+        hard_link: bool = False,
+        verbose_print: Callable[..., None] = lambda *args: None,
+    ):
+        self.destdir = Path(destdir)
+        self.hard_link = hard_link
+        self.verbose_print = verbose_print
+        self.n_written = 0
+        self.n_skipped = 0
+
+        self._entries: dict[str, dict[str, object]] = {}
+        try:
+            with open(self.destdir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)["files"]
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing (the first export), or unreadable: every file is written
+            pass
+
+        # The hashes of the sources of copied files, by their path, size and
+        # modification time
+        self._source_hashes: dict[tuple[object, ...], str] = {
+            tuple(entry["source"]): entry["sha256"]  # pyright: ignore
+            for entry in self._entries.values()
+            if isinstance(entry.get("source"), list)
+        }
+
+    def copy(self, src: str | Path, dest: str | Path) -> None:
+        """
+        Copy (or hard link) a file into the export directory, if it changed.
+        """
+        dest = Path(dest)
+        key = self._key(dest)
+        entry = self._entries.get(key)
+        src_st = os.stat(src)
+        source = [str(src), src_st.st_size, src_st.st_mtime_ns]
+
+        if entry is not None and self._is_unchanged(dest, entry):
+            if entry.get("source") == source:
+                self._skip(dest)
+                return
+            sha256 = hash_file(src)
+            if entry["sha256"] == sha256:
+                entry["source"] = source
+                self._skip(dest)
+                return
+        else:
+            sha256 = hash_file(src)
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(dest)
+        try:
+            linked = False
+            if self.hard_link:
+                try:
+                    os.link(src, tmp_path)
+                    linked = True
+                except OSError:
+                    # E.g. on a different file system
+                    pass
+            if not linked:
+                shutil.copy2(src, tmp_path)
+            # Replacing the file (instead of writing to it) means that files hard linked
+            # by a previous export are never modified.
+            os.replace(tmp_path, dest)
+        except BaseException:
+            _unlink(tmp_path)
+            raise
+
+        self.verbose_print(f"{'Linked' if linked else 'Copied'} {dest}")
+        self._record(dest, sha256, source)
+
+    def hash_source(self, src: str | Path) -> str:
+        """
+        Return the SHA-256 hash of a file to be copied. If a file was copied from it by
+        a previous export, and it hasn't changed since, it isn't read again.
+        """
+        src_st = os.stat(src)
+        source = (str(src), src_st.st_size, src_st.st_mtime_ns)
+        sha256 = self._source_hashes.get(source)
+        if sha256 is None:
+            sha256 = self._source_hashes[source] = hash_file(src)
+        return sha256
+
+    def write(self, dest: str | Path, content: str | bytes) -> bool:
+        """
+        Write a file in the export directory, if its content changed. Returns whether
+        the file was written.
+        """
+        dest = Path(dest)
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        entry = self._entries.get(self._key(dest))
+        if (
+            entry is not None
+            and entry["sha256"] == sha256
+            and self._is_unchanged(dest, entry)
+        ):
+            self._skip(dest)
+            return False
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(dest)
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, dest)
+        except BaseException:
+            _unlink(tmp_path)
+            raise
+
+        self.verbose_print(f"Wrote {dest}")
+        self._record(dest, sha256, None)
+        return True
+
+    def save(self) -> None:
+        """Write the manifest to the export directory."""
+        content = json.dumps({"version": 1, "files": self._entries}, indent=1)
+        tmp_path = self._tmp_path(self.destdir / MANIFEST_FILE)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, self.destdir / MANIFEST_FILE)
+
+    def _key(self, dest: Path) -> str:
+        return dest.relative_to(self.destdir).as_posix()
+
+    def _is_unchanged(self, dest: Path, entry: dict[str, object]) -> bool:
+        try:
+            st = os.stat(dest)
+        except OSError:
+            return False
+        return st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]
+
+    def _record(self, dest: Path, sha256: str, source: Optional[list[object]]) -> None:
+        self.n_written += 1
+        st = os.stat(dest)
+        entry: dict[str, object] = {
+            "sha256": sha256,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+        if source is not None:
+            entry["source"] = source
+        self._entries[self._key(dest)] = entry
+
+    def _skip(self, dest: Path) -> None:
+        self.n_skipped += 1
+        self.verbose_print(f"Skipping unchanged {dest}")
+
+    @staticmethod
+    def _tmp_path(dest: Path) -> str:
+        fd, tmp_path = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.")
+        os.close(fd)
+        # os.link() and shutil.copy2() need the path to be free
+        os.unlink(tmp_path)
+        return tmp_path
+
+
+def hash_file(path: str | Path) -> str:
+    """Return the SHA-256 hash of a file, as a hex string."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(HASH_BLOCK_SIZE):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,498 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import html
+import json
+import os
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from ._manifest import ExportManifest
+
+# Name of the directory (in the app's export directory) with the snapshot page
+SNAPSHOT_DIR = "snapshot"
+
+# Size (in pixels) of outputs whose size is determined by the browser, like plots
+SNAPSHOT_WIDTH = 800
+SNAPSHOT_HEIGHT = 400
+
+# Seconds to wait for the first outputs of the app
+SNAPSHOT_TIMEOUT = 60
+
+# Shown on top of the exported app until the app is running in the browser. The live
+# app is rendered by shinylive in an iframe inside of #root; the snapshot is removed
+# once Shiny in that iframe is connected and idle, after having rendered outputs.
+SNAPSHOT_OVERLAY = """
+<iframe
+  id="shinylive-snapshot"
+  src="snapshot/index.html"
+  title="App preview"
+  style="position: fixed; inset: 0; width: 100vw; height: 100vh; border: 0;
+    background: white; z-index: 10000"
+></iframe>
+<script>
+  (function () {
+    const snapshot = document.getElementById("shinylive-snapshot");
+    const started = Date.now();
+    const timer = setInterval(function () {
+      let ready = Date.now() - started > 120000;
+      for (const iframe of document.querySelectorAll("#root iframe")) {
+        try {
+          const win = iframe.contentWindow;
+          const app = win.Shiny && win.Shiny.shinyapp;
+          ready =
+            ready ||
+            (app &&
+              app.isConnected() &&
+              Object.keys(app.$values || {}).length > 0 &&
+              !win.document.documentElement.classList.contains("shiny-busy"));
+        } catch (e) {}
+      }
+      if (ready) {
+        clearInterval(timer);
+        snapshot.remove();
+      }
+    }, 200);
+  })();
+</script>
+"""
+
+_LOADING_BADGE = """
+<div style="position: fixed; top: 0.5rem; right: 0.5rem; padding: 0.25rem 0.75rem;
+  border-radius: 1rem; background: rgba(0, 0, 0, 0.6); color: white;
+  font: 0.8rem sans-serif; z-index: 10000">Loading&hellip;</div>
+"""
+
+
+def write_snapshot(
+    appdir: Path,
+    app_destdir: Path,
+    manifest: ExportManifest | None = None,
+    verbose_print: Callable[..., None] = lambda *args: None,
+) -> bool:
+    """
+    Run a Shiny app at build time, and write a static page with its initial state (with
+    the outputs rendered for the default values of the inputs) to the snapshot/
+    directory of the exported app. The page has no scripts; it's shown while Pyodide
+    starts in the browser.
+
+    If a `manifest` is provided, files are written through it, so files that haven't
+    changed since the last export aren't rewritten.
+
+    Returns `False` (after printing a warning) if the app can't be run here, e.g.
+    because Shiny or one of the packages the app uses isn't installed.
+    """
+    try:
+        page, values, files = asyncio.run(_capture_app(appdir))
+    except Exception as e:
+        print(
+            f"Warning: Unable to create a snapshot of the app: {type(e).__name__}: {e}",
+            file=sys.stderr,
+        )
+        return False
+
+    page = _fill_outputs(page, values, files)
+    page = _strip_scripts(page)
+    page = page.replace("</body>", _LOADING_BADGE + "</body>", 1)
+    files["index.html"] = page.encode("utf-8")
+
+    snapshot_dir = app_destdir / SNAPSHOT_DIR
+    for url, content in files.items():
+        dest = snapshot_dir / url
+        if manifest is not None:
+            manifest.write(dest, content)
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dest.write_bytes(content)
+    verbose_print(f"Wrote snapshot of {len(values)} outputs to {snapshot_dir}/")
+
+    return True
+
+
+def add_snapshot_overlay(index_html: str) -> str:
+    """
+    Add the snapshot (written by `write_snapshot()`) to the content of an exported
+    app's page.
+    """
+    return index_html.replace("</body>", SNAPSHOT_OVERLAY + "</body>", 1)
+
+
+# =============================================================================
+# Running the app
+# =============================================================================
+async def _capture_app(
+    appdir: Path,
+) -> tuple[str, dict[str, Any], dict[str, bytes]]:
+    # Returns the HTML of the app's page, the values of the first outputs, and the
+    # stylesheets of the page (by URL)
+    prev_cwd = os.getcwd()
+    sys.path.insert(0, str(appdir))
+    # Apps in shinylive run in their directory
+    os.chdir(appdir)
+    try:
+        app = _load_app(appdir)
+
+        status, body = await _http_get(app, "/")
+        if status != 200:
+            raise RuntimeError(f"The app's page returned status {status}")
+        page = body.decode("utf-8")
+
+        parser = _PageParser()
+        parser.feed(page)
+        values = await asyncio.wait_for(
+            _run_session(app, parser.inputs, parser.outputs), SNAPSHOT_TIMEOUT
+        )
+
+        files: dict[str, bytes] = {}
+        for url in parser.stylesheets:
+            if re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:|^/", url):
+                # Absolute URLs work as they are
+                continue
+            status, content = await _http_get(app, "/" + url)
+            if status == 200:
+                files[url] = content
+    finally:
+        os.chdir(prev_cwd)
+        sys.path.remove(str(appdir))
+
+    return page, values, files
+
+
+def _load_app(appdir: Path) -> Any:
+    from shiny._utils import import_module_from_path
+    from shiny.express import is_express_app, wrap_express_app
+
+    app_path = (appdir / "app.py").resolve()
+    if is_express_app(str(app_path), None):
+        return wrap_express_app(app_path)
+    return import_module_from_path("shinylive_snapshot_app", app_path).app
+
+
+async def _http_get(app: Any, path: str) -> tuple[int, bytes]:
+    messages: list[dict[str, Any]] = []
+    request_sent = False
+
+    async def receive() -> dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Wait (until the response is done) instead of disconnecting
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "server": ("localhost", 80),
+        "client": ("localhost", 0),
+    }
+    await app(scope, receive, send)
+
+    status = next(m["status"] for m in messages if m["type"] == "http.response.start")
+    body = b"".join(
+        m.get("body", b"") for m in messages if m["type"] == "http.response.body"
+    )
+    return status, body
+
+
+async def _run_session(
+    app: Any, inputs: dict[str, object], outputs: dict[str, str]
+) -> dict[str, Any]:
+    incoming: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+    outgoing: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    data: dict[str, object] = {
+        ".clientdata_url_protocol": "http:",
+        ".clientdata_url_hostname": "localhost",
+        ".clientdata_url_port": "",
+        ".clientdata_url_pathname": "/",
+        ".clientdata_url_search": "",
+        ".clientdata_url_hash_initial": "",
+        ".clientdata_url_hash": "",
+        ".clientdata_pixelratio": 1,
+        ".clientdata_singletons": "",
+        ".clientdata_allowDataUriScheme": True,
+        **inputs,
+    }
+    for id, kind in outputs.items():
+        data[f".clientdata_output_{id}_hidden"] = False
+        if kind in ("plot", "image"):
+            data[f".clientdata_output_{id}_width"] = SNAPSHOT_WIDTH
+            data[f".clientdata_output_{id}_height"] = SNAPSHOT_HEIGHT
+
+    await incoming.put({"type": "websocket.connect"})
+    init_message = json.dumps({"method": "init", "data": data})
+    await incoming.put({"type": "websocket.receive", "text": init_message})
+
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "ws",
+        "path": "/websocket/",
+        "raw_path": b"/websocket/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "server": ("localhost", 80),
+        "client": ("localhost", 0),
+        "subprotocols": [],
+    }
+    task = asyncio.create_task(app(scope, incoming.get, outgoing.put))
+
+    values: dict[str, Any] = {}
+    try:
+        # The values of a flush are sent after the server tells that it's idle
+        idle = False
+        while True:
+            message = await outgoing.get()
+            if message["type"] == "websocket.close":
+                raise RuntimeError("The app closed the session")
+            if message["type"] != "websocket.send":
+                continue
+            msg = json.loads(message["text"])
+            if msg.get("busy") == "idle":
+                idle = True
+            if "values" in msg:
+                values.update(msg["values"])
+                if idle:
+                    break
+
+        # Large values are sent in messages of their own, right after the others
+        while True:
+            try:
+                message = await asyncio.wait_for(outgoing.get(), 0.5)
+            except asyncio.TimeoutError:
+                break
+            if message["type"] == "websocket.send":
+                values.update(json.loads(message["text"]).get("values", {}))
+    finally:
+        await incoming.put({"type": "websocket.disconnect", "code": 1000})
+        try:
+            await asyncio.wait_for(task, 5)
+        except Exception:
+            pass
+
+    return values
+
+
+# =============================================================================
+# The app's page
+# =============================================================================
+class _PageParser(HTMLParser):
+    """
+    Collect the default values of the inputs on a page (as the browser would send them
+    when the session starts), the ids and kinds of the outputs, and the stylesheets.
+    Only Shiny's built-in inputs are recognized.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.inputs: dict[str, object] = {}
+        self.outputs: dict[str, str] = {}
+        self.stylesheets: list[str] = []
+        # The id of the enclosing radio button or checkbox group
+        self._group: Optional[tuple[str, str]] = None
+        self._group_depth = 0
+        # The id of the enclosing date input
+        self._date_id: Optional[str] = None
+        self._select: Optional[tuple[str, bool, list[str], list[str]]] = None
+        self._option_value: Optional[str] = None
+        self._textarea: Optional[str] = None
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        a = {k: (v if v is not None else "") for k, v in attrs}
+        id = a.get("id")
+        classes = a.get("class", "").split()
+
+        if self._group is not None:
+            self._group_depth += 1
+
+        if tag == "link" and a.get("rel") == "stylesheet" and a.get("href"):
+            self.stylesheets.append(a["href"])
+
+        for cls in classes:
+            m = re.fullmatch(r"shiny-(.+)-output", cls)
+            if m and id:
+                self.outputs[id] = m.group(1)
+
+        if id and "shiny-input-radiogroup" in classes:
+            self._group = (id, "radio")
+            self._group_depth = 0
+        elif id and "shiny-input-checkboxgroup" in classes:
+            self._group = (id, "checkbox")
+            self._group_depth = 0
+            self.inputs[id] = []
+        elif id and "shiny-date-input" in classes:
+            self._date_id = id
+        elif tag == "input":
+            self._handle_input(a, classes)
+        elif tag == "select" and id:
+            self._select = (id, "multiple" in a, [], [])
+        elif tag == "option" and self._select is not None:
+            self._option_value = a.get("value")
+            self._text = []
+            if "selected" in a:
+                self._select[3].append("")  # placeholder, filled in on end tag
+        elif tag == "textarea" and id:
+            self._textarea = id
+            self._text = []
+        elif tag == "button" and id and "action-button" in classes:
+            self.inputs[f"{id}:shiny.action"] = 0
+
+    def _handle_input(self, a: dict[str, str], classes: list[str]) -> None:
+        id = a.get("id")
+        type = a.get("type", "text")
+
+        if self._group is not None and type in ("radio", "checkbox"):
+            group_id, _ = self._group
+            if "checked" in a:
+                if type == "radio":
+                    self.inputs[group_id] = a.get("value", "")
+                else:
+                    values = self.inputs.setdefault(group_id, [])
+                    assert isinstance(values, list)
+                    values.append(a.get("value", ""))
+            return
+
+        if self._date_id is not None and "data-initial-date" in a:
+            value = a["data-initial-date"]
+            self.inputs[f"{self._date_id}:shiny.date"] = value or None
+            self._date_id = None
+            return
+
+        if not id:
+            return
+        if "js-range-slider" in classes:
+            self.inputs[id] = _slider_value(a)
+        elif type == "checkbox":
+            self.inputs[id] = "checked" in a
+        elif type == "number":
+            self.inputs[f"{id}:shiny.number"] = _number(a.get("value", ""))
+        elif type in ("text", "password", "email", "url", "search", "tel"):
+            self.inputs[id] = a.get("value", "")
+
+    def handle_data(self, data: str) -> None:
+        self._text.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._group is not None:
+            if self._group_depth == 0:
+                self._group = None
+            else:
+                self._group_depth -= 1
+
+        if tag == "option" and self._select is not None:
+            value = self._option_value
+            if value is None:
+                value = "".join(self._text).strip()
+            _, _, options, selected = self._select
+            options.append(value)
+            if selected and selected[-1] == "":
+                selected[-1] = value
+            self._option_value = None
+        elif tag == "select" and self._select is not None:
+            id, multiple, options, selected = self._select
+            if multiple:
+                self.inputs[id] = selected
+            elif selected:
+                self.inputs[id] = selected[-1]
+            elif options:
+                self.inputs[id] = options[0]
+            self._select = None
+        elif tag == "textarea" and self._textarea is not None:
+            self.inputs[self._textarea] = "".join(self._text)
+            self._textarea = None
+
+
+def _number(x: str) -> Optional[float]:
+    try:
+        value = float(x)
+    except ValueError:
+        return None
+    return int(value) if value.is_integer() else value
+
+
+def _slider_value(a: dict[str, str]) -> object:
+    start = _number(a.get("data-from", ""))
+    if "data-to" in a and a.get("data-type") == "double":
+        return [start, _number(a["data-to"])]
+    return start
+
+
+# =============================================================================
+# The snapshot page
+# =============================================================================
+def _fill_outputs(page: str, values: dict[str, Any], files: dict[str, bytes]) -> str:
+    # Images are added to `files`
+    for id, value in values.items():
+        content = _output_html(id, value, files)
+        if content is None:
+            continue
+        id_attr = re.escape(html.escape(id))
+        tag = re.search(r'<[a-zA-Z][^>]*\sid="' + id_attr + r'"[^>]*>', page)
+        if tag is None:
+            continue
+        page = page[: tag.end()] + content + page[tag.end() :]
+    return page
+
+
+def _output_html(id: str, value: Any, files: dict[str, bytes]) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        # Text outputs
+        return html.escape(value)
+    if not isinstance(value, dict):
+        return None
+
+    if isinstance(value.get("src"), str):
+        # Plot and image outputs
+        src: str = value["src"]
+        m = re.match(r"data:image/([a-z+]+);base64,(.*)", src, re.DOTALL)
+        if m:
+            ext = "svg" if m.group(1) == "svg+xml" else m.group(1)
+            filename = f"output-{re.sub(r'[^a-zA-Z0-9_-]', '_', id)}.{ext}"
+            files[filename] = base64.b64decode(m.group(2))
+            src = filename
+        style = ""
+        for dim in ("width", "height"):
+            if dim in value:
+                size = value[dim]
+                if isinstance(size, (int, float)):
+                    size = f"{size}px"
+                style += f"{dim}: {size};"
+        return (
+            f'<img src="{html.escape(src)}" style="{html.escape(style)}"'
+            f' alt="{html.escape(str(value.get("alt") or ""))}">'
+        )
+
+    if isinstance(value.get("html"), str):
+        # UI outputs
+        return value["html"]
+
+    return None
+
+
+def _strip_scripts(page: str) -> str:
+    return re.sub(
+        r"<script\b[^>]*>.*?</script\s*>", "", page, flags=re.DOTALL | re.IGNORECASE
+    )
@@ -6,7 +6,7 @@ import os
 import shutil
 import sys
 from pathlib import Path
-from typing import Callable
+from typing import IO, Callable
 
 import chevron
 
@@ -66,11 +66,14 @@ def copy_file_and_substitute(
     dest: str | Path,
     data: dict[str, object],
 ) -> None:
+    out_content = render_file(src, data)
+    with open(dest, "w") as fout:
+        fout.write(out_content)
+
+
+def render_file(src: str | Path, data: dict[str, object]) -> str:
     with open(src, "r", encoding="utf-8") as fin:
-        in_content = fin.read()
-        out_content = chevron.render(in_content, data)
-        with open(dest, "w") as fout:
-            fout.write(out_content)
+        return chevron.render(fin.read(), data)
 
 
 def create_copy_fn(
@@ -127,5 +130,29 @@ def tar_safe_extractall(file: str | Path, destdir: str | Path) -> None:
             tar.extractall(destdir)  # pyright: ignore[reportDeprecated]
 
 
+# Like tar_safe_extractall(), for a stream (which can only be read once, in order)
+def tar_safe_extract_stream(fileobj: IO[bytes], destdir: str | Path) -> None:
+    import tarfile
+
+    destdir = Path(destdir).resolve()
+
+    with tarfile.open(fileobj=fileobj, mode="r|") as tar:
+        for member in tar:
+            if sys.version_info >= (3, 12):
+                tar.extract(member, destdir, filter="data")
+            else:
+                member_path = (destdir / member.name).resolve()
+                if not is_relative_to(member_path, destdir):
+                    raise RuntimeError("Attempted path traversal in tar file.")
+                if member.issym() or member.islnk():
+                    # Symbolic links are relative to their directory, and hard links to
+                    # the root of the archive
+                    link_base = member_path.parent if member.issym() else destdir
+                    link_path = (link_base / member.linkname).resolve()
+                    if not is_relative_to(link_path, destdir):
+                        raise RuntimeError("Attempted path traversal in tar file.")
+                tar.extract(member, destdir)
+
+
 def print_as_json(x: object) -> None:
     print(json.dumps(x, indent=None))
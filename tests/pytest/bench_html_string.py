@@ -0,0 +1,222 @@
+"""
+Benchmark `Tag.get_html_string()` against the string-concatenating serializer it
+replaced, on large nested tag trees.
+
+Run with `python tests/pytest/bench_html_string.py`. The legacy serializer and the
+trees are also used by `test_html_string.py` to check that the output is unchanged.
+"""
+
+from __future__ import annotations
+
+import re
+import statistics
+import sys
+import time
+
+from htmltools import HTML, MetadataNode, ReprHtml, Tag, TagList, Tagifiable, tags
+from htmltools._core import _NO_ESCAPE_TAG_NAMES, _VOID_TAG_NAMES
+from htmltools._util import HTML_ATTRS_ESCAPE_TABLE, HTML_ESCAPE_TABLE
+
+# ------------------------------------------------------------------------------
+# The serializer before it wrote into a single buffer
+# ------------------------------------------------------------------------------
+
+
+def legacy_html_escape(text: str, attr: bool = False) -> str:
+    table = HTML_ATTRS_ESCAPE_TABLE if attr else HTML_ESCAPE_TABLE
+    if not re.search("|".join(table), text):
+        return text
+    for key, value in table.items():
+        text = text.replace(key, value)
+    return text
+
+
+def _legacy_normalize_text(txt: str | HTML) -> str:
+    if isinstance(txt, HTML):
+        return txt.as_string()
+    else:
+        return legacy_html_escape(txt, attr=False)
+
+
+def legacy_tag_html_string(x: Tag, indent: int = 0, eol: str = "\n") -> str:
+    indent_str = "  " * indent
+    html_ = indent_str + "<" + x.name
+
+    for key, val in x.attrs.items():
+        if not isinstance(val, HTML):
+            val = legacy_html_escape(val, attr=True)
+        html_ += f' {key}="{val}"'
+
+    children = [c for c in x.children if not isinstance(c, MetadataNode)]
+
+    if len(children) == 0 and x.name in _VOID_TAG_NAMES:
+        return html_ + "/>"
+
+    html_ += ">"
+    close = "</" + x.name + ">"
+    if len(children) == 0:
+        return html_ + close
+
+    if len(children) == 1 and isinstance(children[0], (str, HTML)):
+        if x.name in _NO_ESCAPE_TAG_NAMES:
+            return html_ + str(children[0]) + close
+        else:
+            return html_ + _legacy_normalize_text(children[0]) + close
+
+    if x.add_ws:
+        html_ += eol
+
+    html_ += legacy_tag_list_html_string(
+        x.children,
+        indent=indent + 1,
+        eol=eol,
+        add_ws=x.add_ws,
+        _escape_strings=(x.name not in _NO_ESCAPE_TAG_NAMES),
+    )
+
+    if x.add_ws:
+        html_ += eol + indent_str
+
+    return html_ + close
+
+
+def legacy_tag_list_html_string(
+    x: TagList,
+    indent: int = 0,
+    eol: str = "\n",
+    *,
+    add_ws: bool = True,
+    _escape_strings: bool = True,
+) -> str:
+    html_ = ""
+    first_child = True
+    prev_was_add_ws = add_ws
+
+    for child in x:
+        if isinstance(child, MetadataNode):
+            continue
+
+        prev_or_current_add_ws = prev_was_add_ws or (
+            (isinstance(child, Tag) and child.add_ws)
+        )
+
+        if first_child:
+            first_child = False
+        elif prev_or_current_add_ws:
+            html_ += eol
+
+        if isinstance(child, Tag):
+            if prev_or_current_add_ws:
+                html_ += _legacy_child_html_string(child, indent, eol)
+            else:
+                html_ += _legacy_child_html_string(child, 0, "")
+
+            prev_was_add_ws = child.add_ws
+
+        elif isinstance(child, ReprHtml):
+            if prev_was_add_ws:
+                html_ += "  " * indent
+
+            html_ += child._repr_html_()  # pyright: ignore[reportPrivateUsage]
+
+            prev_was_add_ws = False
+
+        elif isinstance(child, Tagifiable):
+            raise RuntimeError("Encountered a non-tagified object.")
+
+        else:
+            if prev_was_add_ws:
+                html_ += "  " * indent
+
+            if _escape_strings:
+                html_ += _legacy_normalize_text(child)
+            else:
+                html_ += child
+
+            prev_was_add_ws = False
+
+    return html_
+
+
+def _legacy_child_html_string(x: Tag, indent: int, eol: str) -> str:
+    # Tag subclasses may customize get_html_string()
+    if type(x).get_html_string is not Tag.get_html_string:
+        return x.get_html_string(indent, eol)
+    return legacy_tag_html_string(x, indent, eol)
+
+
+# ------------------------------------------------------------------------------
+# Trees
+# ------------------------------------------------------------------------------
+
+
+def make_tree(n_nodes: int, depth: int) -> Tag:
+    """
+    A tree of about `n_nodes` tags, `depth` levels deep, with a mix of block and inline
+    tags, void tags, attributes and text that need escaping, raw HTML, and scripts.
+    """
+    n_levels = max(1, depth)
+    per_level = max(1, n_nodes // n_levels)
+
+    def leaves(level: int) -> list[Tag]:
+        items: list[Tag] = []
+        for i in range(per_level // 4):
+            items.append(
+                tags.p(
+                    f"Item {level}.{i} & <more>",
+                    tags.span("inline ", tags.b("bold"), class_="s"),
+                    tags.br(),
+                    HTML("<i>raw</i>"),
+                    id=f"p-{level}-{i}",
+                    title='say "hi" & <bye>',
+                )
+            )
+        return items
+
+    node: Tag = tags.div(tags.script("if (a < b && c > d) {}"), *leaves(0))
+    for level in range(1, n_levels):
+        node = tags.div(
+            tags.h3(f"Level {level}"),
+            tags.input(type="checkbox", checked=""),
+            *leaves(level),
+            node,
+            TagList("text", tags.a("link", href="?a=1&b=2")),
+            class_=f"level-{level}",
+        )
+    return node
+
+
+def count_nodes(x: Tag) -> int:
+    return 1 + sum(count_nodes(c) for c in x.children if isinstance(c, Tag))
+
+
+# ------------------------------------------------------------------------------
+# Benchmark
+# ------------------------------------------------------------------------------
+
+
+def _time_ms(fn: object, runs: int) -> float:
+    assert callable(fn)
+    times: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(times)
+
+
+def main(runs: int = 20) -> None:
+    for n_nodes, depth in [(10_000, 10), (10_000, 100)]:
+        tree = make_tree(n_nodes, depth)
+        new = _time_ms(tree.get_html_string, runs)
+        old = _time_ms(lambda: legacy_tag_html_string(tree), runs)
+        if tree.get_html_string() != legacy_tag_html_string(tree):
+            raise RuntimeError("HTML output differs from the legacy serializer")
+        print(
+            f"{count_nodes(tree):>6} nodes, {depth:>3} levels deep: "
+            f"{old:7.1f} ms -> {new:7.1f} ms ({old / new:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
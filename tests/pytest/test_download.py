@@ -0,0 +1,32 @@
+import asyncio
+import threading
+
+from shiny.session._download import THREAD_BATCH_SIZE, encode_chunks
+
+
+def test_sync_generator_starts_on_event_loop():
+    threads: list[threading.Thread] = []
+
+    def gen():
+        # Reads of inputs and calcs go here, before the first yield
+        threads.append(threading.current_thread())
+        yield "a"
+        threads.append(threading.current_thread())
+        yield b"b" * THREAD_BATCH_SIZE
+        threads.append(threading.current_thread())
+        yield "c"
+
+    async def collect() -> list[bytes]:
+        return [chunk async for chunk in encode_chunks(gen(), "utf-8")]
+
+    assert asyncio.run(collect()) == [b"a", b"b" * THREAD_BATCH_SIZE, b"c"]
+    assert threads[0] is threading.main_thread()
+    assert threads[1] is not threading.main_thread()
+    assert threads[2] is not threading.main_thread()
+
+
+def test_empty_sync_generator():
+    async def collect() -> list[bytes]:
+        return [chunk async for chunk in encode_chunks(iter([]), "utf-8")]
+
+    assert asyncio.run(collect()) == []
@@ -0,0 +1,27 @@
+from bench_html_string import legacy_tag_html_string, make_tree
+
+from htmltools import HTML, Tag, TagList, tags
+
+
+def test_html_string_matches_legacy_serializer():
+    for depth in (10, 100):
+        tree = make_tree(10_000, depth)
+        assert tree.get_html_string() == legacy_tag_html_string(tree)
+        assert tree.get_html_string(2, "\r\n") == legacy_tag_html_string(
+            tree, 2, "\r\n"
+        )
+        assert TagList(tree, "tail").get_html_string() == (
+            legacy_tag_html_string(tree) + "\n" + "tail"
+        )
+
+
+def test_html_string_custom_subclass():
+    class Custom(Tag):
+        def get_html_string(self, indent: int = 0, eol: str = "\n") -> str:
+            return "  " * indent + "<custom/>"
+
+    x = tags.div(
+        tags.p("a"), Custom("div"), tags.span(Custom("div")), HTML("<b>b</b>"), "c"
+    )
+    assert x.get_html_string() == legacy_tag_html_string(x)
+    assert "  <custom/>" in x.get_html_string()
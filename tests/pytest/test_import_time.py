@@ -0,0 +1,74 @@
+"""
+Cold-start import checks for `shiny`, using `python -X importtime`.
+
+Run as a script (`python tests/pytest/test_import_time.py [module]`) to print the
+slowest imports of a module.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+# Packages that are only needed by less common features, and must not be imported by
+# `import shiny` (see shiny._lazy)
+DEFERRED_PACKAGES = ("narwhals", "click", "uvicorn")
+
+# Cumulative import time budgets, in milliseconds. They're generous, to allow for slow
+# machines; the point is to catch large regressions.
+IMPORT_TIME_BUDGET_MS = {
+    "shiny": 750,
+    "shiny.express": 900,
+}
+
+# Each module is imported this many times, in new processes, and the fastest time
+# is used
+N_RUNS = 3
+
+
+def import_times(module: str) -> dict[str, int]:
+    """
+    Import `module` in a new Python process, and return the cumulative import time (in
+    microseconds) of every module it imported.
+    """
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in res.stderr.splitlines():
+        # Lines look like "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", list(IMPORT_TIME_BUDGET_MS))
+def test_deferred_packages_not_imported(module: str):
+    imported = {name.split(".")[0] for name in import_times(module)}
+    assert not imported.intersection(DEFERRED_PACKAGES)
+
+
+@pytest.mark.parametrize("module", list(IMPORT_TIME_BUDGET_MS))
+def test_import_time_budget(module: str):
+    time_ms = min(import_times(module)[module] for _ in range(N_RUNS)) / 1000
+    assert time_ms <= IMPORT_TIME_BUDGET_MS[module], (
+        f"`import {module}` took {time_ms:.0f} ms, over its budget of "
+        f"{IMPORT_TIME_BUDGET_MS[module]} ms"
+    )
+
+
+if __name__ == "__main__":
+    module = sys.argv[1] if len(sys.argv) > 1 else "shiny"
+    times = import_times(module)
+    print(f"import {module}: {times[module] / 1000:.0f} ms\n")
+    for name, us in sorted(times.items(), key=lambda x: -x[1])[:30]:
+        print(f"{us / 1000:8.1f} ms  {name}")
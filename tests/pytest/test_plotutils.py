@@ -0,0 +1,51 @@
+from typing import cast
+
+import numpy as np
+import pandas as pd
+
+from shiny.plotutils import brushed_points_index
+from shiny.types import BrushInfo
+
+
+def make_brush(xmin: float, xmax: float, ymin: float, ymax: float) -> BrushInfo:
+    # Only the fields that brushed_points_index() uses
+    brush = {
+        "xmin": xmin,
+        "xmax": xmax,
+        "ymin": ymin,
+        "ymax": ymax,
+        "mapping": {"x": "x", "y": "y"},
+        "log": {"x": None, "y": None},
+        "direction": "xy",
+    }
+    return cast(BrushInfo, brush)
+
+
+def test_spatial_index_includes_points_on_cell_edges():
+    # 21 x 21 points on multiples of 0.1 in [0, 2]: the grid has 10 x 10 cells of
+    # width 0.2, so every other point sits on a cell edge
+    vals = np.linspace(0, 2, 21)
+    x, y = np.meshgrid(vals, vals)
+    df = pd.DataFrame({"x": x.ravel(), "y": y.ravel()})
+
+    for lo in vals:
+        for hi in vals[vals >= lo]:
+            brush = make_brush(lo, hi, lo, hi)
+            expected = brushed_points_index(df, brush)
+            actual = brushed_points_index(df, brush, spatial_index=True)
+            assert len(expected) > 0
+            np.testing.assert_array_equal(actual, expected)
+
+
+def test_spatial_index_point_on_brush_edge():
+    # 400 points in [0, 2] give a grid of 10 x 10 cells of width 0.2. The point at
+    # x=1.0 is on a cell edge, where `1.0 // 0.2 == 4` but `1.0 / 0.2 == 5`
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"x": rng.uniform(0, 2, 400), "y": rng.uniform(0, 2, 400)})
+    df.loc[0, ["x", "y"]] = [0.0, 0.0]
+    df.loc[1, ["x", "y"]] = [2.0, 2.0]
+    df.loc[2, ["x", "y"]] = [1.0, 1.0]
+
+    brush = make_brush(1.0, 1.0, 1.0, 1.0)
+    assert list(brushed_points_index(df, brush)) == [2]
+    assert list(brushed_points_index(df, brush, spatial_index=True)) == [2]
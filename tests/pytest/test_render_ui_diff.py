@@ -0,0 +1,140 @@
+import asyncio
+from typing import Any
+
+from htmltools import HTML, TagList, div, span, tags
+
+from shiny import App, reactive, render, ui
+from shiny._connection import MockConnection
+from shiny.render._ui_diff import diff_ui
+from shiny.session import session_context
+from shiny.session._session import AppSession
+
+
+def diff(old: Any, new: Any, **kwargs: Any) -> Any:
+    return diff_ui(TagList(old).tagify(), TagList(new).tagify(), **kwargs)
+
+
+def test_diff_ui_unchanged():
+    assert diff(div(span("a"), class_="x"), div(span("a"), class_="x")) == []
+
+
+def test_diff_ui_attrs():
+    assert diff(
+        div(span("a"), class_="x", title="t"),
+        div(span("a"), class_="y", role="note"),
+    ) == [
+        {
+            "op": "attrs",
+            "path": [0],
+            "tag": "div",
+            "set": {"class": "y", "role": "note"},
+            "remove": ["title"],
+        }
+    ]
+
+
+def test_diff_ui_text():
+    assert diff(div(span("a"), span("b")), div(span("a"), span("c"))) == [
+        {"op": "text", "path": [0, 1], "tag": "span", "text": "c"}
+    ]
+
+
+def test_diff_ui_insert_and_remove():
+    assert diff(div(span("a"), span("c")), div(span("a"), span("b"), span("c"))) == [
+        {"op": "insert", "path": [0], "index": 1, "html": "<span>b</span>"}
+    ]
+    # Removed from the end, so the paths of the earlier removals stay valid
+    assert diff(div(span("a"), span("b"), span("c"), span("d")), div(span("a"))) == [
+        {"op": "remove", "path": [0, 3], "tag": "span"},
+        {"op": "remove", "path": [0, 2], "tag": "span"},
+        {"op": "remove", "path": [0, 1], "tag": "span"},
+    ]
+
+
+def test_diff_ui_replaces_other_tags():
+    assert diff(div(span("a")), div(tags.b("a"))) == [
+        {"op": "replace", "path": [0, 0], "tag": "span", "html": "<b>a</b>"}
+    ]
+
+
+def test_diff_ui_opaque_tags():
+    # Table content is never patched in place
+    old = tags.table(tags.tr(tags.td("a")))
+    new = tags.table(tags.tr(tags.td("b")))
+    assert diff(div(old), div(new)) == [
+        {"op": "replace", "path": [0, 0], "tag": "table", "html": str(new)}
+    ]
+
+
+def test_diff_ui_elements_with_id():
+    # Content changes are patched...
+    assert diff(div(span("a"), id="x"), div(span("b"), id="x")) == [
+        {"op": "text", "path": [0, 0], "tag": "span", "text": "b"}
+    ]
+    # ...but attribute changes replace the element, so bindings see the new values
+    new = div(span("a"), id="x", class_="y")
+    assert diff(div(span("a"), id="x"), new) == [
+        {"op": "replace", "path": [0], "tag": "div", "html": str(new)}
+    ]
+    # So does a different id
+    new = div(span("a"), id="y")
+    assert diff(div(span("a"), id="x"), new) == [
+        {"op": "replace", "path": [0], "tag": "div", "html": str(new)}
+    ]
+
+
+def test_diff_ui_raw_html():
+    # Raw HTML isn't text, so the element containing it is replaced
+    new = div(span("a"), div(HTML("<b>b</b>")))
+    assert diff(div(span("a"), div(HTML("<b>a</b>"))), new) == [
+        {"op": "replace", "path": [0, 1], "tag": "div", "html": "<div><b>b</b></div>"}
+    ]
+
+
+def test_diff_ui_top_level_text():
+    assert diff("a", "b") is None
+    assert diff([div("a"), "b"], [div("b"), "b"]) is None
+
+
+def test_diff_ui_max_html_size():
+    old = div(span("a"), span("b"))
+    new = div(span("a"), span("b"), span("c" * 100))
+    assert diff(old, new) is not None
+    assert diff(old, new, max_html_size=200) is not None
+    assert diff(old, new, max_html_size=100) is None
+
+
+def test_ui_diff_resync_in_module():
+    asyncio.run(_test_ui_diff_resync_in_module())
+
+
+async def _test_ui_diff_resync_in_module():
+    session = AppSession(App(ui.page_fluid(), None), "1", MockConnection())
+    mod_session = session.make_scope("mod")
+    n = reactive.Value(1)
+
+    @render.ui(diff=True)
+    def out():
+        return div(div("Count:"), div(str(n())))
+
+    out._set_output_metadata(output_id="out")
+
+    async def render_out():
+        with session_context(mod_session), reactive.isolate():
+            return await out.render()
+
+    assert "html" in await render_out()
+    n.set(2)
+    assert "patches" in await render_out()
+
+    # The browser sends the resync input with the id of the output's element, which
+    # includes the module namespace
+    session._manage_inputs({"mod-out__ui_diff_resync": 1})
+    n.set(3)
+    res = await render_out()
+    assert "patches" not in res
+    assert "3" in res["html"]
+
+    # After a resync, updates are patches again
+    n.set(4)
+    assert "patches" in await render_out()
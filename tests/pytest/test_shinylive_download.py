@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import socket
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pytest
+
+from shinylive import _download
+from shinylive._download import DownloadError, download_and_extract
+
+
+def make_tar_gz() -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for name, content in [
+            ("assets/big.bin", os.urandom(1024 * 1024)),
+            ("assets/small.txt", b"hello"),
+        ]:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buf.getvalue()
+
+
+class StandInServer(ThreadingHTTPServer):
+    """A local stand-in for the asset server, which can drop connections."""
+
+    daemon_threads = True
+
+    def __init__(self, data: bytes):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.data = data
+        self.etag = '"v1"'
+        self.support_range = True
+        # The next this many responses are cut off after `drop_after` bytes
+        self.n_drops = 0
+        self.drop_after = 300 * 1024
+        # The Range headers of the requests
+        self.ranges: list[Optional[str]] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/assets.tar.gz"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandInServer
+
+    def do_GET(self) -> None:
+        srv = self.server
+        range_ = self.headers.get("Range")
+        srv.ranges.append(range_)
+
+        start = 0
+        if (
+            srv.support_range
+            and range_ is not None
+            and self.headers.get("If-Range") in (None, srv.etag)
+        ):
+            start = int(range_[len("bytes=") : -len("-")])
+        body = srv.data[start:]
+
+        self.send_response(206 if start > 0 else 200)
+        if start > 0:
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(srv.data) - 1}/{len(srv.data)}"
+            )
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", srv.etag)
+        if srv.support_range:
+            self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+        if srv.n_drops > 0:
+            srv.n_drops -= 1
+            self.wfile.write(body[: srv.drop_after])
+            self.wfile.flush()
+            self.connection.shutdown(socket.SHUT_RDWR)
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def data() -> bytes:
+    return make_tar_gz()
+
+
+@pytest.fixture
+def server(data: bytes) -> Iterator[StandInServer]:
+    srv = StandInServer(data)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_retry_wait(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_download, "DOWNLOAD_RETRY_WAIT", 0)
+
+
+def download(
+    server: StandInServer, destdir: Path, sha256: Optional[str] = None, retries: int = 5
+) -> str:
+    return download_and_extract(
+        server.url, destdir, name="assets", sha256=sha256, retries=retries, status=False
+    )
+
+
+def assert_extracted(destdir: Path, data: bytes) -> None:
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tar:
+        for member in tar.getmembers():
+            f = tar.extractfile(member)
+            assert f is not None
+            assert (destdir / member.name).read_bytes() == f.read()
+    # Only the extracted files are left
+    assert sorted(p.name for p in destdir.iterdir()) == ["assets"]
+
+
+def test_download(server: StandInServer, data: bytes, tmp_path: Path):
+    sha256 = hashlib.sha256(data).hexdigest()
+    assert download(server, tmp_path, sha256=sha256) == sha256
+    assert_extracted(tmp_path, data)
+    assert server.ranges == [None]
+
+
+def test_download_resumes_dropped_connections(
+    server: StandInServer, data: bytes, tmp_path: Path
+):
+    server.n_drops = 2
+    download(server, tmp_path, sha256=hashlib.sha256(data).hexdigest())
+    assert_extracted(tmp_path, data)
+    assert server.ranges == [
+        None,
+        f"bytes={server.drop_after}-",
+        f"bytes={2 * server.drop_after}-",
+    ]
+
+
+def test_failed_download_is_resumed_by_next_call(
+    server: StandInServer, data: bytes, tmp_path: Path
+):
+    server.n_drops = 3
+    with pytest.raises(DownloadError):
+        download(server, tmp_path, retries=1)
+    # Nothing is installed, but the partial download is kept
+    assert not (tmp_path / "assets").exists()
+    assert (tmp_path / ".assets.part").stat().st_size == 2 * server.drop_after
+
+    server.n_drops = 0
+    server.ranges.clear()
+    download(server, tmp_path, sha256=hashlib.sha256(data).hexdigest())
+    assert_extracted(tmp_path, data)
+    assert server.ranges == [f"bytes={2 * server.drop_after}-"]
+
+
+def test_download_restarts_without_range_support(
+    server: StandInServer, data: bytes, tmp_path: Path
+):
+    server.support_range = False
+    server.n_drops = 1
+    download(server, tmp_path, sha256=hashlib.sha256(data).hexdigest())
+    assert_extracted(tmp_path, data)
+    # The resume request gets the whole file, so the download starts over
+    assert server.ranges == [None, f"bytes={server.drop_after}-", None]
+
+
+def test_download_restarts_when_file_changed(
+    server: StandInServer, data: bytes, tmp_path: Path
+):
+    server.n_drops = 1
+    with pytest.raises(DownloadError):
+        download(server, tmp_path, retries=0)
+
+    # The file changed on the server, so the If-Range check fails
+    server.etag = '"v2"'
+    server.ranges.clear()
+    download(server, tmp_path, sha256=hashlib.sha256(data).hexdigest())
+    assert_extracted(tmp_path, data)
+    assert server.ranges == [f"bytes={server.drop_after}-"]
+
+
+def test_download_wrong_hash(server: StandInServer, tmp_path: Path):
+    with pytest.raises(DownloadError, match="SHA-256"):
+        download(server, tmp_path, sha256="0" * 64)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_download_corrupt_body(server: StandInServer, data: bytes, tmp_path: Path):
+    corrupt = bytearray(data)
+    corrupt[len(data) // 2] ^= 0xFF
+    server.data = bytes(corrupt)
+    with pytest.raises(DownloadError, match="corrupt"):
+        download(server, tmp_path)
+    assert list(tmp_path.iterdir()) == []